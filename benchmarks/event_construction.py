@@ -0,0 +1,102 @@
+"""Measures the construction of point events from labels label by label
+through Dataset.forEachChannel, as done by earlier versions of Engine.run,
+against grouping the labels by epoch through Dataset.forEachEpoch, as done by
+Engine.run now. Engine.run is measured as a whole as well, i.e. including
+storing the labels and tags of the events in the dataset. The labels are
+spread uniformly over two channels of a recording of 24 hours in epochs of 30
+seconds at 500 Hz.
+
+Usage: python benchmarks/event_construction.py [numberOfLabels ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from unittest.mock import MagicMock
+from sleepy.gui.tagging.model.event import PointEvent
+from sleepy.processing.dataset import Dataset
+from sleepy.processing.engine import Engine
+
+NUMBER_OF_EPOCHS = 2880
+NUMBER_OF_CHANNELS = 2
+EPOCH_LENGTH = 15000
+
+def createDataset(numberOfLabels):
+    """Creates a dataset whose labels are sorted points. The data of all
+    epochs is a single read-only buffer, such that no memory is allocated.
+    """
+
+    random = np.random.RandomState(0)
+
+    dataset = Dataset(None, "")
+
+    dataset.data = np.broadcast_to(np.zeros(EPOCH_LENGTH), (NUMBER_OF_EPOCHS, NUMBER_OF_CHANNELS, EPOCH_LENGTH))
+    dataset.filteredData = dataset.data
+    dataset.epochs = np.stack([
+        np.arange(NUMBER_OF_EPOCHS) * EPOCH_LENGTH,
+        np.arange(NUMBER_OF_EPOCHS) * EPOCH_LENGTH + EPOCH_LENGTH - 1
+    ], axis = 1)
+    dataset.samplingRate = 500
+
+    dataset.labels = np.array([
+        np.sort(random.randint(0, NUMBER_OF_EPOCHS * EPOCH_LENGTH, numberOfLabels // NUMBER_OF_CHANNELS))
+            for _ in range(NUMBER_OF_CHANNELS)
+    ])
+
+    return dataset
+
+def measurePerLabel(numberOfLabels, settings):
+
+    dataset = createDataset(numberOfLabels)
+
+    start = time.perf_counter()
+
+    dataset.forEachChannel(dataset.labels, lambda label, dataSource: PointEvent(*label, dataSource, settings))
+
+    return time.perf_counter() - start
+
+def measurePerEpoch(numberOfLabels, settings):
+
+    dataset = createDataset(numberOfLabels)
+
+    start = time.perf_counter()
+
+    dataset.forEachEpoch(dataset.labels, lambda labels, dataSource: [
+        PointEvent(point, dataSource, settings) for point in labels[:,0]
+    ])
+
+    return time.perf_counter() - start
+
+def measureEngine(numberOfLabels, settings):
+
+    dataset = createDataset(numberOfLabels)
+
+    start = time.perf_counter()
+
+    Engine.run(None, None, dataset, settings)
+
+    return time.perf_counter() - start
+
+def main():
+
+    counts = [ int(argument) for argument in sys.argv[1:] ] or [10000, 100000, 1000000]
+
+    settings = MagicMock()
+
+    print("{:>10}  {:>12}  {:>12}  {:>12}".format("Labels", "Per label", "Per epoch", "Engine.run"))
+
+    for numberOfLabels in counts:
+
+        print("{:>10}  {:>10.3f} s  {:>10.3f} s  {:>10.3f} s".format(
+            numberOfLabels,
+            measurePerLabel(numberOfLabels, settings),
+            measurePerEpoch(numberOfLabels, settings),
+            measureEngine(numberOfLabels, settings)
+        ))
+
+if __name__ == '__main__':
+    main()
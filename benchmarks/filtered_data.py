@@ -0,0 +1,121 @@
+"""Compares saving the filtered data in the .mat file, as done by earlier
+versions, with regenerating it from the filter stored in the provenance. The
+recording is filtered with the bandpass filter and saved both ways. Then the
+file size and the time to open the file and access the filtered data in a
+fresh interpreter are measured, with the data loaded into memory by
+MatDataset and memory-mapped by MappedMatDataset. The memory-mapped dataset
+is opened twice, such that the second time reads the filtered data from its
+cache.
+
+Usage: python benchmarks/filtered_data.py [numberOfEpochs]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def child(className, path):
+    """Opens the recording, reads a few samples of every channel of every
+    epoch of the filtered data and prints the elapsed time.
+    """
+
+    import time
+
+    from sleepy.processing.mat.core import MatDataset
+    from sleepy.processing.mat.cache import MappedMatDataset
+
+    DatasetClass = { 'MatDataset' : MatDataset, 'MappedMatDataset' : MappedMatDataset }[className]
+
+    start = time.perf_counter()
+
+    dataset = DatasetClass(DatasetClass.load(path), path)
+
+    for epoch in dataset.filteredData:
+        epoch[:,:100].sum()
+
+    print(time.perf_counter() - start)
+
+def writeRecordings(directory, numberOfEpochs):
+    """Writes a recording of 6 channels with epochs of 30 seconds at 500 Hz,
+    filters it and saves it once with and once without the filtered data.
+    """
+
+    import numpy as np
+    from scipy.io import savemat
+    from sleepy.processing.engine import Engine
+    from sleepy.processing.filters import BandPassFilter
+    from sleepy.processing.mat.core import MatDataset
+
+    random = np.random.RandomState(0)
+
+    trial = np.empty(numberOfEpochs, dtype = object)
+
+    for epoch in range(numberOfEpochs):
+        trial[epoch] = np.cumsum(random.normal(size = (6, 15000)), axis = 1)
+
+    dataset = MatDataset({
+        'trial' : trial,
+        'sampleinfo' : np.array([ [epoch * 15000 + 1, (epoch + 1) * 15000] for epoch in range(numberOfEpochs) ]),
+        'fsample' : 500.
+    }, None)
+
+    Engine.run(None, BandPassFilter().setParameters(), dataset)
+
+    dataset.saveToDisk(os.path.join(directory, 'regenerated.mat'))
+
+    savemat(os.path.join(directory, 'stored.mat'), { 'data' : dict(dataset.raw, sleepy_filteredData = dataset.filteredData) })
+
+def execute(*arguments):
+    """Executes this script with the given arguments in a fresh interpreter.
+    """
+
+    environment = dict(os.environ, PYTHONPATH = ROOT_DIR)
+
+    return subprocess.check_output(
+        [sys.executable, '-W', 'ignore', __file__] + list(arguments),
+        env = environment
+    ).decode()
+
+def main():
+
+    numberOfEpochs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    directory = tempfile.mkdtemp()
+
+    try:
+
+        execute('--write', directory, str(numberOfEpochs))
+
+        print("Epochs:                {}".format(numberOfEpochs))
+
+        for name in ['stored', 'regenerated']:
+
+            path = os.path.join(directory, name + '.mat')
+
+            print("{}: file size {:.1f} MB".format(name.capitalize(), os.path.getsize(path) / 1024 ** 2))
+
+            for title, className in [
+                ("MatDataset", 'MatDataset'),
+                ("Mapped, building cache", 'MappedMatDataset'),
+                ("Mapped, cached", 'MappedMatDataset')
+            ]:
+
+                openTime = float(execute('--child', className, path))
+
+                print("    {:<25}open {:.3f} s".format(title + ':', openTime))
+
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) > 1 and sys.argv[1] == '--write':
+        writeRecordings(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,86 @@
+"""Measures the import time of the GUI as started by sleepygui.py, i.e. the
+import of sleepy.gui.core, and the time to open the preprocessing dialog in
+fresh interpreters and lists the heavy modules that have been imported.
+
+Usage: python benchmarks/gui_startup.py [repetitions]
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['tensorflow', 'keras', 'numba', 'dill', 'sklearn', 'pywt']
+
+CHILD_SCRIPT = """
+import sys
+import time
+from unittest.mock import MagicMock
+
+start = time.perf_counter()
+
+from sleepy.gui.core import Gui
+
+imported = time.perf_counter()
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from sleepy.gui.processing.core import Preprocessing
+from sleepy.gui.processing.view import PreprocessingView
+from sleepy.gui.processing.supported import SUPPORTED_ALGORITHMS, SUPPORTED_FILTERS
+
+application = QApplication([])
+
+opening = time.perf_counter()
+
+parent = MagicMock()
+parent.supportedAlgorithms = SUPPORTED_ALGORITHMS
+parent.supportedFilters = SUPPORTED_FILTERS
+
+preprocessing = Preprocessing(parent)
+preprocessing.view = PreprocessingView(QWidget(), preprocessing)
+
+opened = time.perf_counter()
+
+print(imported - start, opened - opening)
+print(','.join(module for module in {} if module in sys.modules))
+""".format(HEAVY_MODULES)
+
+def main():
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    environment = dict(os.environ, PYTHONPATH = ROOT_DIR, QT_QPA_PLATFORM = 'offscreen')
+
+    importTimes, dialogTimes, totalTimes = [], [], []
+
+    for _ in range(repetitions):
+
+        start = time.perf_counter()
+
+        output = subprocess.check_output(
+            [sys.executable, '-W', 'ignore', '-c', CHILD_SCRIPT],
+            env = environment
+        ).decode().splitlines()
+
+        totalTimes.append(time.perf_counter() - start)
+        importTime, dialogTime = map(float, output[0].split())
+
+        importTimes.append(importTime)
+        dialogTimes.append(dialogTime)
+
+        heavyModules = [ module for module in output[1].split(',') if module ]
+
+    importTimes.sort()
+    dialogTimes.sort()
+    totalTimes.sort()
+
+    print("Repetitions:           {}".format(repetitions))
+    print("Import (median):       {:.3f} s".format(importTimes[repetitions // 2]))
+    print("Dialog (median):       {:.3f} s".format(dialogTimes[repetitions // 2]))
+    print("Total (median):        {:.3f} s".format(totalTimes[repetitions // 2]))
+    print("Heavy modules:         {}".format(', '.join(heavyModules) or 'none'))
+
+if __name__ == '__main__':
+    main()
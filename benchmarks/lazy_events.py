@@ -0,0 +1,122 @@
+"""Measures opening a recording in the tagging UI, i.e. running Engine.run
+without an algorithm on stored labels and creating a navigator per channel,
+with all events created beforehand against creating them lazily on
+navigation. Reports the time to open, the memory allocated by the open
+navigators and the time to navigate through the first 1000 events. The labels
+are spread uniformly over two channels of a recording of 24 hours in epochs of
+30 seconds at 500 Hz.
+
+Usage: python benchmarks/lazy_events.py [numberOfLabels ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from unittest.mock import MagicMock
+from sleepy.gui.tagging.model import Navigator
+from sleepy.processing.dataset import Dataset
+from sleepy.processing.engine import Engine
+
+NUMBER_OF_EPOCHS = 2880
+NUMBER_OF_CHANNELS = 2
+EPOCH_LENGTH = 15000
+
+def createDataset(numberOfLabels):
+    """Creates a dataset whose labels are sorted points. The data of all
+    epochs is a single read-only buffer, such that no memory is allocated.
+    """
+
+    random = np.random.RandomState(0)
+
+    dataset = Dataset(None, "")
+
+    dataset.data = np.broadcast_to(np.zeros(EPOCH_LENGTH), (NUMBER_OF_EPOCHS, NUMBER_OF_CHANNELS, EPOCH_LENGTH))
+    dataset.filteredData = dataset.data
+    dataset.epochs = np.stack([
+        np.arange(NUMBER_OF_EPOCHS) * EPOCH_LENGTH,
+        np.arange(NUMBER_OF_EPOCHS) * EPOCH_LENGTH + EPOCH_LENGTH - 1
+    ], axis = 1)
+    dataset.samplingRate = 500
+
+    dataset.labels = np.array([
+        np.sort(random.randint(0, NUMBER_OF_EPOCHS * EPOCH_LENGTH, numberOfLabels // NUMBER_OF_CHANNELS))
+            for _ in range(NUMBER_OF_CHANNELS)
+    ])
+
+    return dataset
+
+def openNavigators(dataset, settings, lazy):
+
+    events = Engine.run(None, None, dataset, settings, lazy = lazy)
+
+    return [ Navigator(channelEvents) for channelEvents in events ]
+
+def measure(numberOfLabels, settings, lazy):
+    """Opens the dataset and navigates through the first events of the first
+    channel. The memory is measured in a second run, since tracing the
+    allocations slows down the first.
+
+    :returns: The time to open, the memory allocated in MB and the time to
+    navigate.
+    """
+
+    dataset = createDataset(numberOfLabels)
+
+    start = time.perf_counter()
+
+    navigators = openNavigators(dataset, settings, lazy)
+
+    opened = time.perf_counter()
+
+    for _ in range(1000):
+
+        navigators[0].selectNext()
+
+        navigators[0].selectedEvent.absoluteLimits
+
+    navigated = time.perf_counter()
+
+    del navigators
+
+    dataset = createDataset(numberOfLabels)
+
+    tracemalloc.start()
+
+    navigators = openNavigators(dataset, settings, lazy)
+
+    allocated = tracemalloc.get_traced_memory()[0] / 1024 ** 2
+
+    tracemalloc.stop()
+
+    return opened - start, allocated, navigated - opened
+
+def main():
+
+    counts = [ int(argument) for argument in sys.argv[1:] ] or [10000, 100000, 1000000]
+
+    settings = MagicMock()
+    settings.intervalMin = settings.intervalMax = 2
+
+    print("{:>10}  {:>8}  {:>10}  {:>10}  {:>14}".format("Labels", "Events", "Open", "Memory", "1000 x next"))
+
+    for numberOfLabels in counts:
+
+        for title, lazy in [("created", False), ("lazy", True)]:
+
+            openTime, allocated, navigateTime = measure(numberOfLabels, settings, lazy)
+
+            print("{:>10}  {:>8}  {:>8.3f} s  {:>7.1f} MB  {:>12.3f} s".format(
+                numberOfLabels,
+                title,
+                openTime,
+                allocated,
+                navigateTime
+            ))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Measures the time to open a recording and the memory when the data of every
+epoch is accessed, with the trials loaded into memory by MatDataset and
+memory-mapped by MappedMatDataset, in fresh interpreters. The memory-mapped
+dataset is measured once while its cache is built and once with the cache.
+Pages of a memory-mapped file count towards the RSS but are shared with the
+page cache and reclaimable, hence the anonymous memory is reported as well.
+
+Usage: python benchmarks/mat_loading.py [numberOfEpochs]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def child(className, path):
+    """Opens the recording, reads a few samples of every channel of every
+    epoch and prints the time to open it, the peak RSS and the anonymous RSS.
+    """
+
+    import resource
+    import time
+
+    from sleepy.processing.mat.core import MatDataset
+    from sleepy.processing.mat.cache import MappedMatDataset
+
+    start = time.perf_counter()
+
+    if className == 'None':
+
+        # Only the imports, as a reference for the peak RSS
+        print(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, getAnonymousRSS())
+
+        return
+
+    DatasetClass = { 'MatDataset' : MatDataset, 'MappedMatDataset' : MappedMatDataset }[className]
+
+    dataset = DatasetClass(DatasetClass.load(path), path)
+
+    opened = time.perf_counter()
+
+    for _ in range(10):
+        for epoch in dataset.data:
+            epoch[:,:100].sum()
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peakRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(opened - start, peakRSS, getAnonymousRSS())
+
+def getAnonymousRSS():
+    """Returns the resident memory in MB that is not backed by a file.
+    """
+
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('RssAnon:'):
+                return int(line.split()[1]) / 1024
+
+    return float('nan')
+
+def writeRecording(path, numberOfEpochs):
+    """Writes a recording of 6 channels with epochs of 30 seconds at 500 Hz.
+    """
+
+    import numpy as np
+    from scipy.io import savemat
+
+    random = np.random.RandomState(0)
+
+    trial = np.empty(numberOfEpochs, dtype = object)
+
+    for epoch in range(numberOfEpochs):
+        trial[epoch] = random.normal(size = (6, 15000))
+
+    savemat(path, { 'data' : {
+        'trial' : trial,
+        'sampleinfo' : np.array([ [epoch * 15000 + 1, (epoch + 1) * 15000] for epoch in range(numberOfEpochs) ]),
+        'fsample' : 500.
+    }})
+
+def execute(*arguments):
+    """Executes this script with the given arguments in a fresh interpreter.
+    Since the peak RSS is inherited by a forked child, the main process must
+    not allocate the recording itself.
+    """
+
+    environment = dict(os.environ, PYTHONPATH = ROOT_DIR)
+
+    return subprocess.check_output(
+        [sys.executable, '-W', 'ignore', __file__] + list(arguments),
+        env = environment
+    ).decode()
+
+def measure(className, path):
+
+    output = execute('--child', className, path)
+
+    return map(float, output.split())
+
+def main():
+
+    numberOfEpochs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    directory = tempfile.mkdtemp()
+
+    try:
+
+        path = os.path.join(directory, 'recording.mat')
+
+        execute('--write', path, str(numberOfEpochs))
+
+        print("Epochs:                {}".format(numberOfEpochs))
+        print("File size:             {:.1f} MB".format(os.path.getsize(path) / 1024 ** 2))
+
+        for title, className in [
+            ("Imports only", 'None'),
+            ("MatDataset", 'MatDataset'),
+            ("Mapped, building cache", 'MappedMatDataset'),
+            ("Mapped, cached", 'MappedMatDataset')
+        ]:
+
+            openTime, peakRSS, anonymousRSS = measure(className, path)
+
+            print("{:<25}open {:.3f} s, peak RSS {:.1f} MB, anonymous {:.1f} MB".format(title + ':', openTime, peakRSS, anonymousRSS))
+
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) > 1 and sys.argv[1] == '--write':
+        writeRecording(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,104 @@
+"""Measures the startup time and the peak memory of the RandomForest detector
+in a fresh interpreter and verifies that TensorFlow is never imported.
+
+Usage: python benchmarks/randomforest_startup.py [numberOfEpochs]
+
+If the trained model randomforest.sav is not available, a small random forest
+is trained on random waves, such that the pipeline can be measured anyway.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['tensorflow', 'keras', 'numba', 'PyQt5', 'matplotlib']
+
+def child(numberOfEpochs):
+    """Runs the detector and prints import time, compute time, peak RSS and
+    the heavy modules that have been imported.
+    """
+
+    import resource
+
+    start = time.perf_counter()
+
+    import numpy as np
+    from sleepy.processing.algorithms.RandomForest import RandomForest
+    from sleepy.processing.signal import Signal
+
+    imported = time.perf_counter()
+
+    random = np.random.RandomState(0)
+
+    # Smooth signals of slow oscillations, 30 seconds at 100 Hz per epoch
+    seconds = np.arange(3000) / 100
+
+    signals = [
+        Signal(sum(np.sin(2 * np.pi * frequency * seconds + random.uniform(0, 2 * np.pi)) for frequency in [0.7, 1.3, 2.9]), 100)
+            for _ in range(numberOfEpochs)
+    ]
+
+    algorithm = RandomForest()
+
+    modelPath = os.path.join(ROOT_DIR, 'sleepy', 'processing', 'algorithms', 'RandomForest', 'randomforest.sav')
+
+    if os.path.exists(modelPath):
+        algorithm.getModel()
+    else:
+        from sklearn.ensemble import RandomForestClassifier
+
+        features = algorithm.calc_fs(np.cumsum(random.normal(size = (200, 126)), axis = 1))
+
+        algorithm.RF_model = RandomForestClassifier(n_estimators = 10).fit(features, random.randint(0, 2, size = 200))
+
+    loaded = time.perf_counter()
+
+    algorithm.computeAll(signals)
+
+    computed = time.perf_counter()
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peakRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(imported - start, loaded - imported, computed - loaded, peakRSS)
+    print(','.join(module for module in HEAVY_MODULES if module in sys.modules))
+
+def main():
+
+    numberOfEpochs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    environment = dict(os.environ, PYTHONPATH = ROOT_DIR)
+
+    start = time.perf_counter()
+
+    output = subprocess.check_output(
+        [sys.executable, __file__, '--child', str(numberOfEpochs)],
+        env = environment
+    ).decode().splitlines()
+
+    total = time.perf_counter() - start
+
+    importTime, loadTime, computeTime, peakRSS = map(float, output[0].split())
+
+    heavyModules = [ module for module in output[1].split(',') if module ]
+
+    print("Epochs:                {}".format(numberOfEpochs))
+    print("Total (incl. startup): {:.3f} s".format(total))
+    print("Import:                {:.3f} s".format(importTime))
+    print("Model:                 {:.3f} s".format(loadTime))
+    print("Compute:               {:.3f} s".format(computeTime))
+    print("Peak RSS:              {:.1f} MB".format(peakRSS))
+    print("Heavy modules:         {}".format(', '.join(heavyModules) or 'none'))
+
+    if 'tensorflow' in heavyModules or 'keras' in heavyModules:
+        sys.exit("TensorFlow has been imported.")
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(int(sys.argv[2]))
+    else:
+        main()
@@ -1,12 +1,18 @@
 
 from sleepy.gui.processing.view import PreprocessingView
+from sleepy.processing.registry import ProcessorEntry
 from sleepy.gui.exceptions import UserCancel
 from sleepy.gui.tagging.model import Navigator
-from sleepy.processing.engine import Engine
+from sleepy.processing.engine import Engine, CancellationToken, ComputationCancelled
+from sleepy.gui.processing.worker import EngineWorker
 from sleepy.gui.tagging.model.event.user import UserPointEvent
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 from PyQt5.QtCore import QSettings
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import numpy as np
+import os
+from functools import partial
 
 class Preprocessing:
     """Application starting a preprocessing screen from which the user can
@@ -14,9 +20,14 @@ class Preprocessing:
     to produce a list of navigators and returns them to the caller.
     """
 
+    # Process pool of algorithms computing all signals at once, shared by all
+    # preprocessing screens, such that its workers keep their models loaded
+    executor = None
+
     def __init__(self, parent):
-        """Configures the application by setting a default path, creating the
-        :class:`QDialog` and rendering filters and algorithms.
+        """Configures the application by setting a default path and collecting
+        the supported filters and algorithms. These are instantiated and
+        rendered once they are selected.
 
         :param parent: The parent application.
 
@@ -26,10 +37,12 @@ class Preprocessing:
 
         self.path = ""
         self.parent = parent
-        self.algorithms = self.__renderAlgorithms()
-        self.filters = self.__renderFilters()
+        self.algorithms = [None] + list(self.parent.supportedAlgorithms)
+        self.filters = [None] + list(self.parent.supportedFilters)
         self.algorithm = None
         self.filter = None
+        self.cache = None
+        self.token = None
 
     def compute(self):
         """Compute events with the given settings but do not create navigators
@@ -49,7 +62,8 @@ class Preprocessing:
     def load(self):
         """Load navigators from events computed with the given settings. Calls
         the accept method of the view to accept the dialog and return to the
-        calling method (Preprocessing.run).
+        calling method (Preprocessing.run). The cached computation is consumed,
+        since the navigators change its events and dataset.
         """
 
         try:
@@ -57,8 +71,13 @@ class Preprocessing:
         except UserCancel:
             return
 
+        self.cache = None
+
         self.dataset = dataset
 
+        if getattr(dataset, 'filteredDataError', None) is not None:
+            self.view.showFilteredDataError(dataset.filteredDataError)
+
         channels = range(len(events))
 
         self.navigators = [
@@ -68,15 +87,22 @@ class Preprocessing:
 
         self.view.accept()
 
+    def cancel(self):
+        """Cancels the running computation, if any.
+        """
+
+        if self.token is not None:
+            self.token.cancel()
+
     def onAlgorithmChange(self, index):
         """Called on change of algorithm selection. Sets the algorithm with
-        the corresponding index and tries to set the algorithm's parameters
-        to the view.
+        the corresponding index, instantiating it on its first selection, and
+        tries to set the algorithm's parameters to the view.
 
         :param index: Index of the algorithm to select.
         """
 
-        self.algorithm = self.algorithms[index]
+        self.algorithm = self.__select(self.algorithms, index)
 
         try:
 
@@ -88,13 +114,13 @@ class Preprocessing:
 
     def onFilterChange(self, index):
         """Called on change of filter selection. Sets the filter with
-        the corresponding index and tries to set the filter's parameters
-        to the view.
+        the corresponding index, instantiating it on its first selection, and
+        tries to set the filter's parameters to the view.
 
         :param index: Index of the filter to select.
         """
 
-        self.filter = self.filters[index]
+        self.filter = self.__select(self.filters, index)
 
         try:
 
@@ -175,35 +201,166 @@ class Preprocessing:
         return navigator
 
     def __computeEvents(self):
+        """Returns the events given algorithm and filter together with the
+        dataset they were computed on. The result of the latest computation is
+        cached together with the path, the modification times of the file and
+        its sidecar and the selected processors and their parameters. If none of these changed,
+        e.g. when loading after computing, the cached result is returned
+        instead of loading and computing again.
+        """
+
+        key = self.__getCacheKey()
+
+        if self.cache is not None and self.cache[0] == key:
+            return self.cache[1]
+
+        result = self.__loadAndCompute()
+
+        self.cache = (key, result)
+
+        return result
+
+    def __getCacheKey(self):
+        """Identifies a computation by the path of the dataset, the modification
+        times of the file and of its sidecar, if the dataset class stores one,
+        and the type and parameters of filter and algorithm.
+        """
+
+        DatasetClass = self.parent.supportedDatasets.get(self.__getFileExtension())
+
+        getSidecarPath = getattr(DatasetClass, 'getSidecarPath', None)
+
+        sidecarPath = getSidecarPath(self.path) if getSidecarPath is not None else None
+
+        return (
+            self.path,
+            Preprocessing.__getModificationTime(self.path),
+            Preprocessing.__getModificationTime(sidecarPath),
+            self.__getProcessorKey(self.filter),
+            self.__getProcessorKey(self.algorithm)
+        )
+
+    def __getModificationTime(path):
+        """Returns the modification time of the file at the given path or None
+        if it does not exist.
+        """
+
+        if path is None or not os.path.exists(path):
+            return None
+
+        return os.stat(path).st_mtime_ns
+
+    def __getProcessorKey(self, processor):
+        """Identifies a processor by its type and the values of its parameters.
+        """
+
+        if processor is None:
+            return None
+
+        parameters = getattr(processor, 'parameters', {})
+
+        return (type(processor), tuple(sorted(parameters.items())))
+
+    def __loadAndCompute(self):
+        """Loads the dataset and computes the events in a background thread,
+        while the view displays the progress and offers to cancel the
+        computation.
+
+        :raises UserCancel: The user cancelled the computation.
+        """
+
+        DatasetClass = self.__getDatasetClass()
+
+        self.token = CancellationToken()
+
+        worker = EngineWorker(partial(self.__runEngine, DatasetClass, self.token))
+
+        worker.progress.connect(self.view.showProgress)
+
+        self.view.setComputing(True)
+
+        try:
+
+            return worker.execute()
+
+        except ComputationCancelled:
+
+            self.view.showCancelled()
+
+            raise UserCancel
+
+        finally:
+
+            self.token = None
+
+            self.view.setComputing(False)
+
+    def __runEngine(self, DatasetClass, token, progress):
         """Computes the events given algorithm and filter. The dataset is also
         loaded at this step based on the path that is currently selected.
         The settings are inherited from the parent. Note that in this case 'parent'
         does not refer to a super-class but to the application calling this
-        application.
+        application. Executed in a background thread, thus must not access the
+        view. The events are created lazily, such that only the events around
+        the navigated ones are kept in memory.
         """
 
-        dataset = self.__loadDataset()
+        dataset = self.__loadDataset(DatasetClass)
 
         try:
 
             settings = self.parent.settings
 
-            return Engine.run(self.algorithm, self.filter, dataset, settings), dataset
+            events = Engine.run(
+                self.algorithm,
+                self.filter,
+                dataset,
+                settings,
+                executor = self.__getExecutor(),
+                progress = progress,
+                token = token,
+                lazy = True
+            )
 
         except AttributeError:
             return dataset.labels, dataset
 
-    def __loadDataset(self):
-        """Loads a :class:`Dataset` instance based on the path currently selected.
-        Parses the path to find the file extension and finds the appropriate
-        instance via the supported file. The resulting class must implement a
-        static load method that returns a raw data object with which an instance
-        of said class can be constructed.
+        # Regenerates the filtered data here rather than on the first plot,
+        # such that a failure can be reported on load
+        if hasattr(dataset, 'regenerateFilteredData'):
+            dataset.filteredData
+
+        return events, dataset
+
+    def __getExecutor(self):
+        """Returns the process pool for algorithms that compute all signals at
+        once and None otherwise. The pool is created on first use and reused
+        for every following computation. Its workers are spawned rather than
+        forked, since the computation runs in a background thread.
+        """
+
+        if not hasattr(self.algorithm, 'computeAll'):
+            return None
+
+        if Preprocessing.executor is None:
+            Preprocessing.executor = ProcessPoolExecutor(mp_context = multiprocessing.get_context('spawn'))
+
+        return Preprocessing.executor
+
+    def __getDatasetClass(self):
+        """Parses the path to find the file extension and finds the appropriate
+        dataset class via the supported file.
         """
 
         extension = self.__getFileExtension()
 
-        DatasetClass = self.__findSupportedAttempt(extension)
+        return self.__findSupportedAttempt(extension)
+
+    def __loadDataset(self, DatasetClass):
+        """Loads a :class:`Dataset` instance based on the path currently selected.
+        The dataset class must implement a static load method that returns a raw
+        data object with which an instance of said class can be constructed.
+        """
 
         raw = DatasetClass.load(self.path)
 
@@ -223,21 +380,24 @@ class Preprocessing:
 
             raise UserCancel
 
-    def __renderFilters(self):
-        """Renders the list of supported filters, drawn from the supported
-        file. At the top of the list is a NoneType, indicating that no
-        filter was selected.
+    def __select(self, processors, index):
+        """Returns the processor with the given index from a list of processors,
+        drawn from the supported file. At the top of the list is a NoneType,
+        indicating that no processor was selected. A :class:`ProcessorEntry`
+        is replaced in the list by its rendered instance on first selection,
+        such that the instance and its parameters are kept while the dialog
+        is open.
         """
 
-        return [None] + [ f().render() for f in self.parent.supportedFilters ]
+        processor = processors[index]
 
-    def __renderAlgorithms(self):
-        """Renders the list of supported algorithms, drawn from the supported
-        file. At the top of the list is a NoneType, indicating that no
-        algorithm was selected.
-        """
+        if isinstance(processor, ProcessorEntry):
+
+            processor = processor.create()
+
+            processors[index] = processor
 
-        return [None] + [ a().render() for a in self.parent.supportedAlgorithms ]
+        return processor
 
     def __getFileExtension(self):
         """Returns the file extension of the current path in upper-case letters.
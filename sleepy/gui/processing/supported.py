@@ -1,22 +1,8 @@
-from sleepy.processing.algorithms import Massimi, Walkthrough, Relative, Percentile, BiLSTM, RandomForest, DTW1NN, Custom
-from sleepy.processing.filters import BandPassFilter
-from sleepy.processing.mat.core import MatDataset
-
-SUPPORTED_ALGORITHMS = [
-    Massimi,
-    #Walkthrough,
-    Relative,
-    Percentile,
-    BiLSTM,
-    RandomForest,
-    Custom,
-    DTW1NN
-]
-
-SUPPORTED_FILTERS = [
-    BandPassFilter
-]
+# The supported algorithms and filters are shared with the batch script,
+# which must not depend on the GUI
+from sleepy.processing.registry import SUPPORTED_ALGORITHMS, SUPPORTED_FILTERS
+from sleepy.processing.mat.cache import MappedMatDataset
 
 SUPPORTED_DATASETS = {
-    'MAT' : MatDataset
+    'MAT' : MappedMatDataset
 }
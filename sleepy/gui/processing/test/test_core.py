@@ -3,10 +3,14 @@ from sleepy.test.core import TestBase
 from sleepy.gui.processing.core import Preprocessing
 from sleepy.gui.processing.supported import SUPPORTED_DATASETS
 from sleepy.processing.dataset import Dataset
+from sleepy.processing.registry import ProcessorEntry
+from sleepy.processing.engine import ComputationCancelled
 
 import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
+import tempfile
+import os
 
 class MockingDataset(Dataset):
 
@@ -31,6 +35,19 @@ class MockingOneUserLabelDataset(Dataset):
     def getDataSource(self, channel, label):
         return TestBase.getDataSource()
 
+class MockingFilteredDataErrorDataset(Dataset):
+    """Dataset whose filtered data could not be rebuilt.
+    """
+
+    filteredDataError = "Not rebuilt"
+
+class MockingSidecarDataset(Dataset):
+    """Dataset that stores its changes in a sidecar next to its file.
+    """
+
+    def getSidecarPath(path):
+        return path + ".sidecar"
+
 class MockingProcessor:
     """Mock object for a processor (algorithm or filter). Supplied with an id,
     this can be used to ensure that on algorithm or filter change the options
@@ -44,9 +61,26 @@ class MockingProcessor:
     def options(self):
         return self.id
 
+class MockParameterized:
+    """Mock object for a processor with user parameters.
+    """
+
+    def __init__(self, threshold):
+        self.parameters = { "threshold" : threshold }
+
+class MockComputingAll(MockParameterized):
+    """Mock object for an algorithm computing all signals at once.
+    """
+
+    def computeAll(self, signals, executor = None, monitor = None):
+        pass
+
 class MockRendered:
 
+    instances = 0
+
     def __init__(self):
+        MockRendered.instances += 1
         self.rendered = False
 
     def render(self):
@@ -62,7 +96,12 @@ class ProcessingTest(unittest.TestCase):
 
         _ , app, settings = TestBase.getBasics(active = False, name = "Test")
 
-        app.supportedDatasets = { "TEST" : Dataset, "MOCK" : MockingDataset, "MOCK_SINGLE" : MockingOneUserLabelDataset }
+        app.supportedDatasets = {
+            "TEST" : Dataset,
+            "MOCK" : MockingDataset,
+            "MOCK_SINGLE" : MockingOneUserLabelDataset,
+            "MOCK_ERROR" : MockingFilteredDataErrorDataset
+        }
         app.supportedFilters = app.supportedAlgorithms = []
 
         proc = ProcessingTest.getPreprocessing(app, extension)
@@ -159,6 +198,25 @@ class ProcessingTest(unittest.TestCase):
             []
         )
 
+    def test_load_filteredData_error_shown(self):
+        """Calling load informs the user if the filtered data could not be
+        rebuilt, but loads the navigators nevertheless.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario("mock_error")
+
+        self.call(proc.load, events)
+
+        proc.view.showFilteredDataError.assert_called_with("Not rebuilt")
+
+        self.assertEqual(len(proc.navigators), 2)
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        self.call(proc.load, events)
+
+        proc.view.showFilteredDataError.assert_not_called()
+
     def test_compute_view_output(self):
         """Calling compute leads to the view being called with the correct number
         of channels and number of events.
@@ -170,6 +228,209 @@ class ProcessingTest(unittest.TestCase):
 
         proc.view.showNumberOfEvents.assert_called_with(6,2)
 
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_load_after_compute_cached(self, engine):
+        """Loading after computing with the same settings reuses the computed
+        events and dataset instead of running the engine again.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        engine.run = MagicMock(return_value = events)
+
+        proc.algorithm = MockParameterized(1)
+
+        proc.compute()
+        proc.load()
+
+        engine.run.assert_called_once()
+
+        self.assertIs(proc.dataset, engine.run.call_args[0][2])
+
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_compute_parameter_change_not_cached(self, engine):
+        """Changing a parameter of the algorithm or selecting another filter
+        runs the engine again.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        engine.run = MagicMock(return_value = events)
+
+        proc.algorithm = MockParameterized(1)
+
+        proc.compute()
+
+        proc.algorithm.parameters["threshold"] = 2
+
+        proc.compute()
+
+        proc.filter = MockParameterized(1)
+
+        proc.compute()
+        proc.compute()
+
+        self.assertEqual(engine.run.call_count, 3)
+
+    @patch.object(Preprocessing, 'executor', None)
+    @patch('sleepy.gui.processing.core.ProcessPoolExecutor')
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_compute_all_executor_reused(self, engine, executorClass):
+        """Algorithms computing all signals at once receive a process pool,
+        which is created once and reused by later preprocessing screens.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        engine.run = MagicMock(return_value = events)
+
+        proc.algorithm = MockComputingAll(1)
+
+        proc.compute()
+
+        other = ProcessingTest.getPreprocessing(app, "test")
+
+        other.algorithm = MockComputingAll(2)
+
+        other.compute()
+
+        executorClass.assert_called_once()
+
+        executors = [ call[1]["executor"] for call in engine.run.call_args_list ]
+
+        self.assertEqual(executors, [executorClass.return_value] * 2)
+
+    @patch.object(Preprocessing, 'executor', None)
+    @patch('sleepy.gui.processing.core.ProcessPoolExecutor')
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_compute_without_executor(self, engine, executorClass):
+        """Algorithms computing signal by signal run without a process pool.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        engine.run = MagicMock(return_value = events)
+
+        proc.algorithm = MockParameterized(1)
+
+        proc.compute()
+
+        executorClass.assert_not_called()
+
+        self.assertIsNone(engine.run.call_args[1]["executor"])
+
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_compute_file_modified_not_cached(self, engine):
+        """Modifying the file of the dataset runs the engine again.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        engine.run = MagicMock(return_value = events)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            proc.path = os.path.join(directory, "file.test")
+
+            open(proc.path, 'w').close()
+
+            proc.compute()
+
+            os.utime(proc.path, (0, 0))
+
+            proc.compute()
+
+        self.assertEqual(engine.run.call_count, 2)
+
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_compute_sidecar_modified_not_cached(self, engine):
+        """Saving the sidecar of the dataset runs the engine again, although
+        the file itself is unchanged.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        app.supportedDatasets["SIDE"] = MockingSidecarDataset
+
+        engine.run = MagicMock(return_value = events)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            proc.path = os.path.join(directory, "file.side")
+
+            open(proc.path, 'w').close()
+
+            proc.compute()
+            proc.compute()
+
+            open(MockingSidecarDataset.getSidecarPath(proc.path), 'w').close()
+
+            proc.compute()
+
+        self.assertEqual(engine.run.call_count, 2)
+
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_load_twice_not_cached(self, engine):
+        """Loading again runs the engine again, since the navigators of the
+        first load changed the events and the dataset.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        engine.run = MagicMock(return_value = events)
+
+        proc.load()
+        proc.load()
+
+        self.assertEqual(engine.run.call_count, 2)
+
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_compute_reports_progress(self, engine):
+        """Computing passes a progress callback and a cancellation token to the
+        engine and shows the computation as running in the meantime.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        engine.run = MagicMock(return_value = events)
+
+        proc.compute()
+
+        self.assertTrue(callable(engine.run.call_args[1]['progress']))
+        self.assertIsNotNone(engine.run.call_args[1]['token'])
+
+        proc.view.setComputing.assert_any_call(True)
+        proc.view.setComputing.assert_called_with(False)
+
+        self.assertIsNone(proc.token)
+
+    @patch('sleepy.gui.processing.core.Engine')
+    def test_compute_cancelled(self, engine):
+        """A cancelled computation shows no events, informs the user and is
+        not cached.
+        """
+
+        app, settings, proc, events = ProcessingTest.standardScenario()
+
+        def run(*args, **kwargs):
+            proc.cancel()
+            self.assertTrue(kwargs['token'].cancelled)
+            raise ComputationCancelled
+
+        engine.run = MagicMock(side_effect = run)
+
+        proc.compute()
+
+        proc.view.showNumberOfEvents.assert_not_called()
+        proc.view.showCancelled.assert_called_once()
+        proc.view.setComputing.assert_called_with(False)
+
+        engine.run = MagicMock(return_value = events)
+
+        proc.compute()
+
+        engine.run.assert_called_once()
+
     def test_compute_file_not_supported(self):
         """Calling compute with a non supported file extension results in the
         view being called to display an error popup with the correct parameter.
@@ -238,23 +499,42 @@ class ProcessingTest(unittest.TestCase):
 
         proc.view.setNoFilterParameters.assert_called()
 
-    def test_construction_rendered(self):
-        """Creating a Preprocessing instance causes the processors to be rendered.
+    def test_construction_not_rendered(self):
+        """Creating a Preprocessing instance does not instantiate any processor.
+        Selecting a processor instantiates and renders it once.
         """
 
         _ , app, _ = TestBase.getBasics(active = False, name = "Test")
 
-        app.supportedFilters = [MockRendered] * 30
-        app.supportedAlgorithms = [MockRendered] * 30
+        entry = ProcessorEntry("Mock", __name__, 'MockRendered')
+
+        app.supportedFilters = [entry] * 30
+        app.supportedAlgorithms = [entry] * 30
+
+        MockRendered.instances = 0
 
         proc = ProcessingTest.getPreprocessing(app, "")
 
-        [ self.assertTrue(a.rendered) for a in proc.algorithms[1:]]
-        [ self.assertTrue(f.rendered) for f in proc.filters[1:]]
+        self.assertEqual(MockRendered.instances, 0)
 
         self.assertEqual(proc.algorithms[0], None)
         self.assertEqual(proc.filters[0], None)
 
+        proc.onAlgorithmChange(3)
+        proc.onFilterChange(5)
+
+        self.assertEqual(MockRendered.instances, 2)
+        self.assertTrue(proc.algorithm.rendered)
+        self.assertTrue(proc.filter.rendered)
+
+        algorithm = proc.algorithm
+
+        proc.onAlgorithmChange(0)
+        proc.onAlgorithmChange(3)
+
+        self.assertIs(proc.algorithm, algorithm)
+        self.assertEqual(MockRendered.instances, 2)
+
 
     def test_onAlgorithmChange_with_algorithms(self):
         """Calling onAlgorithmChange with algorithms supported causes the view
@@ -0,0 +1,23 @@
+from sleepy.gui.processing.view import PreprocessingView
+import unittest
+from unittest.mock import MagicMock, patch
+
+class PreprocessingViewTest(unittest.TestCase):
+
+    @patch('sleepy.gui.processing.view.QMessageBox')
+    def test_pop_ups_parented_to_dialog(self, messageBox):
+        """Pop-up windows are parented to the dialog itself rather than to its
+        window method.
+        """
+
+        view = MagicMock()
+
+        PreprocessingView.showFilteredDataError(view, "Not rebuilt")
+
+        messageBox.assert_called_with(view)
+        messageBox.return_value.setText.assert_called_with("Not rebuilt")
+        messageBox.return_value.exec_.assert_called_once()
+
+        PreprocessingView.showFileNotSupported(view, "TXT")
+
+        messageBox.assert_called_with(view)
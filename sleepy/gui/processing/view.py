@@ -1,6 +1,7 @@
 
 from PyQt5.QtWidgets import QVBoxLayout, QPushButton, QLineEdit, QDialogButtonBox, QDialog, QMessageBox
 from PyQt5.QtWidgets import QHBoxLayout, QGroupBox, QWidget, QComboBox, QStackedWidget, QLabel
+from PyQt5.QtWidgets import QProgressBar
 
 class PreprocessingView(QDialog):
 
@@ -18,6 +19,8 @@ class PreprocessingView(QDialog):
 
         self.control = control
 
+        self.computing = False
+
         self.setWindowTitle("Preprocessing")
         self.setMinimumWidth(600)
 
@@ -27,15 +30,39 @@ class PreprocessingView(QDialog):
         """Constructs the outer layout of the dialog and calls all initializations
         of the elements of that layout: A path selector for the dataset, an options
         layout containing algorithm and filter selection and a button box controlling
-        the interactions with the dialog.
+        the interactions with the dialog. A progress bar is shown below the
+        options while a computation is running.
         """
 
         self.layout = QVBoxLayout(self)
 
         self.__initializePathSelector()
         self.__initializeOptions()
+        self.__initializeProgress()
         self.__initializeButtonBox()
 
+    def __initializeProgress(self):
+        """Constructs the progress bar and the button to cancel a running
+        computation. Both are hidden until a computation is started.
+        """
+
+        self.progressWidget = QWidget()
+
+        progressLayout = QHBoxLayout()
+
+        self.progressBar = QProgressBar()
+        progressLayout.addWidget(self.progressBar)
+
+        self.cancelComputationButton = QPushButton('Cancel')
+        self.cancelComputationButton.clicked.connect(self.control.cancel)
+        progressLayout.addWidget(self.cancelComputationButton)
+
+        self.progressWidget.setLayout(progressLayout)
+
+        self.progressWidget.hide()
+
+        self.layout.addWidget(self.progressWidget)
+
     def __initializePathSelector(self):
         """Constructs a group box containing a path selector with which the user
         can choose the path to the dataset.
@@ -131,11 +158,6 @@ class PreprocessingView(QDialog):
         self.noFilterParameters = QWidget()
         self.filterParameters.addWidget(self.noFilterParameters)
 
-        list(map(
-            lambda f: self.filterParameters.addWidget(f.options),
-            self.control.filters[1:]
-        ))
-
         layout.addWidget(self.filterParameters)
 
         self.filterBox.setLayout(layout)
@@ -168,11 +190,6 @@ class PreprocessingView(QDialog):
         self.noParameters = QWidget()
         self.algorithmParameters.addWidget(self.noParameters)
 
-        list(map(
-            lambda a: self.algorithmParameters.addWidget(a.options),
-            self.control.algorithms[1:]
-        ))
-
         layout.addWidget(self.algorithmParameters)
 
         self.algorithmBox.setLayout(layout)
@@ -181,6 +198,50 @@ class PreprocessingView(QDialog):
 
         return self.algorithmBox
 
+    def reject(self):
+        """Cancels the running computation instead of closing the dialog if
+        a computation is running.
+        """
+
+        if self.computing:
+            self.control.cancel()
+        else:
+            super().reject()
+
+    def setComputing(self, computing):
+        """Shows the progress of a computation and disables the controls that
+        would interfere with it while the computation is running.
+
+        :param computing: Whether a computation is running.
+        """
+
+        self.computing = computing
+
+        self.progressBar.setRange(0, 0)
+
+        self.progressWidget.setVisible(computing)
+
+        self.pathSelectorBox.setEnabled(not computing)
+        self.optionsWidget.setEnabled(not computing)
+        self.buttonBox.setEnabled(not computing)
+
+    def showProgress(self, done, total):
+        """Updates the progress bar.
+
+        :param done: The number of processed signals.
+
+        :param total: The total number of signals.
+        """
+
+        self.progressBar.setRange(0, total)
+        self.progressBar.setValue(done)
+
+    def showCancelled(self):
+        """Informs the user that the computation was cancelled.
+        """
+
+        self.computationStatus.setText("Computation cancelled.")
+
     def setPath(self, path):
         """Abstraction around setting the text of the pathEdit widget.
 
@@ -202,19 +263,27 @@ class PreprocessingView(QDialog):
         self.filterParameters.setCurrentWidget(self.noFilterParameters)
 
     def setAlgorithmParameters(self, parameters):
-        """Set the options view displaying the algorithm parameters.
+        """Set the options view displaying the algorithm parameters. The
+        parameters are added to the view on first display.
 
         :param parameters: A :class:`QWidget` containing the parameters.
         """
 
+        if self.algorithmParameters.indexOf(parameters) == -1:
+            self.algorithmParameters.addWidget(parameters)
+
         self.algorithmParameters.setCurrentWidget(parameters)
 
     def setFilterParameters(self, parameters):
-        """Set the options view displaying the filter parameters.
+        """Set the options view displaying the filter parameters. The
+        parameters are added to the view on first display.
 
         :param parameters: A :class:`QWidget` containing the parameters.
         """
 
+        if self.filterParameters.indexOf(parameters) == -1:
+            self.filterParameters.addWidget(parameters)
+
         self.filterParameters.setCurrentWidget(parameters)
 
     def showNumberOfEvents(self, numberOfEvents, numberOfChannels):
@@ -236,6 +305,19 @@ class PreprocessingView(QDialog):
 
         self.computationStatus.repaint()
 
+    def showFilteredDataError(self, message):
+        """Show a pop-up window, notifying the user that the filtered data
+        could not be rebuilt.
+
+        :param message: The message describing the failure.
+        """
+
+        warning = QMessageBox(self)
+        warning.setWindowTitle('Warning')
+        warning.setIcon(QMessageBox.Warning)
+        warning.setText(message)
+        warning.exec_()
+
     def showFileNotSupported(self, extension):
         """Show a pop-up window, notifying the user that the file type is not
         supported.
@@ -243,7 +325,7 @@ class PreprocessingView(QDialog):
         :param extension: The unsupported exension as a string.
         """
 
-        error = QMessageBox(self.window)
+        error = QMessageBox(self)
         error.setWindowTitle('Error')
         error.setIcon(QMessageBox.Critical)
         error.setText(
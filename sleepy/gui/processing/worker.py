@@ -0,0 +1,61 @@
+from PyQt5.QtCore import QThread, QEventLoop, QCoreApplication, pyqtSignal
+
+class EngineWorker(QThread):
+    """Thread executing a long running computation, e.g. :class:`Engine.run`,
+    in the background. The computation receives a function to report its
+    progress, which is forwarded to the GUI thread via the progress signal.
+    """
+
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, function):
+        """
+        :param function: The computation. Called with a function that takes
+        the number of processed steps and the total number of steps.
+        """
+
+        super().__init__()
+
+        self.function = function
+
+    def run(self):
+        """Executes the computation and stores its result or the exception it
+        raised.
+        """
+
+        try:
+            self.result = self.function(self.progress.emit)
+        except Exception as exception:
+            self.exception = exception
+
+    def execute(self):
+        """Starts the computation and waits for it to finish. While waiting,
+        the events of the GUI are processed in a local event loop, such that
+        the GUI remains responsive and receives the progress.
+
+        :returns: The result of the computation.
+
+        :raises Exception: The exception raised by the computation.
+        """
+
+        # An event loop requires an application, otherwise merely wait
+        loop = None
+
+        if QCoreApplication.instance() is not None:
+
+            loop = QEventLoop()
+
+            # Queued, thus also received if finished before the loop started
+            self.finished.connect(loop.quit)
+
+        self.start()
+
+        if loop is not None:
+            loop.exec_()
+
+        self.wait()
+
+        if hasattr(self, 'exception'):
+            raise self.exception
+
+        return self.result
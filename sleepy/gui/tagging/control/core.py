@@ -305,20 +305,37 @@ class TaggingControl(MultiChannelControl):
         self.navigator.onPosition.trigger()
 
     def save(self):
-        """Tells the fileLoader to save the current dataset. If this does not
-        result in an exception, then the dataset is considered saved, which
-        needs reflection in the navigator (e.g. reset changesMade flag).
+        """Tells the fileLoader to save the current dataset. The changes are
+        saved next to the file the dataset has been loaded from, the user is
+        only asked for a path if the dataset has not been loaded from a file.
+        If this does not result in an exception, then the dataset is considered
+        saved, which needs reflection in the navigator (e.g. reset changesMade
+        flag).
         """
 
         if not self.active:
             return
 
-        path = self.view.getSaveFileName()
+        path = self.dataset.path or self.view.getSaveFileName()
 
         self.dataset.save(path, self.navigators)
 
         self.navigator.onSave()
 
+    def export(self):
+        """Asks the user for a path and writes the entire dataset including
+        the changes to it. Afterwards, the dataset is considered saved.
+        """
+
+        if not self.active:
+            return
+
+        path = self.view.getSaveFileName()
+
+        self.dataset.export(path, self.navigators)
+
+        self.navigator.onSave()
+
     def onSaveFile(self):
         """Wraps around the save method but suppresses the UserCancel and
         returns None instead.
@@ -329,6 +346,16 @@ class TaggingControl(MultiChannelControl):
         except UserCancel:
             return
 
+    def onExportFile(self):
+        """Wraps around the export method but suppresses the UserCancel and
+        returns None instead.
+        """
+
+        try:
+            self.export()
+        except UserCancel:
+            return
+
     def onChangesMade(self, changesMade):
         """Event handler for the changesMade event of the navigator. Keeps track
         of whether changes are made, updates the menu options (save disabled if
@@ -477,3 +477,46 @@ class ControlTest(unittest.TestCase):
         view.askUserForCheckPoint.assert_called()
 
         self.assertEqual(dataset.checkpoint, (0,1))
+
+    def test_save_next_to_dataset(self):
+        """Saving writes the changes to the path of the dataset without asking
+        the user for a path and resets changes made.
+        """
+
+        view, app, settings, control, navigator, processing = ControlTest.standardScenario()
+
+        control.open(processing)
+
+        navigator.switchSelectionTag()
+
+        control.onSaveFile()
+
+        _, dataset = processing.run()
+
+        view.getSaveFileName.assert_not_called()
+        dataset.save.assert_called_with("test/path/TestFile", [navigator])
+
+        self.assertEqual(navigator.changesMade, False)
+
+    def test_export_asks_for_path(self):
+        """Exporting asks the user for a path, writes the entire dataset to it
+        and does nothing if the user cancels the dialog.
+        """
+
+        view, app, settings, control, navigator, processing = ControlTest.standardScenario()
+
+        control.open(processing)
+
+        _, dataset = processing.run()
+
+        view.getSaveFileName = MagicMock(side_effect = UserCancel)
+
+        control.onExportFile()
+
+        dataset.export.assert_not_called()
+
+        view.getSaveFileName = MagicMock(return_value = "test/path/Exported")
+
+        control.onExportFile()
+
+        dataset.export.assert_called_with("test/path/Exported", [navigator])
@@ -1,3 +1,4 @@
 
 from sleepy.gui.tagging.model.datasource import DataSource
+from sleepy.gui.tagging.model.lazy import EventList, LazyEvents
 from sleepy.gui.tagging.model.navigator import Navigator
@@ -31,6 +31,9 @@ class DataSource:
     def addLabel(self, label):
         self.labels.append(label)
 
+    def addLabels(self, labels):
+        self.labels.extend(labels)
+
     def addEvent(self, event):
         self.events.append(event)
 
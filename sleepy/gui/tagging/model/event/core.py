@@ -1,7 +1,5 @@
 
 import numpy as np
-from matplotlib.axes import Axes
-from matplotlib.ticker import FuncFormatter
 import time
 import pdb
 
@@ -140,6 +138,10 @@ class Event:
 
     def setTicks(self, axis):
 
+        # Imported on plotting, such that events can be created without
+        # matplotlib, e.g. by the batch script
+        from matplotlib.ticker import FuncFormatter
+
         tickFrequency = int(self.applicationSettings.plotGridSize * self.samplingRate)
 
         axis.set(
@@ -153,6 +155,8 @@ class Event:
 
     def labelAxes(self, axis):
 
+        from matplotlib.axes import Axes
+
         if not isinstance(axis, Axes):
 
             axis.xlabel("Time (s)")
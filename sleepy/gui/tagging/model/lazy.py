@@ -0,0 +1,200 @@
+from collections import OrderedDict
+import numpy as np
+
+class LazyEvents:
+    """Sequence of the computed events of a channel that creates an event only
+    once it is accessed. The labels and the tags of all events are kept in
+    arrays, which provide the points and tags for the timeline and for saving.
+    Accessing an event also creates the events that are visible next to it,
+    since an event plots the other events registered at its data source. At
+    most capacity events are kept at once, the least recently accessed events
+    are released, keeping their tags.
+    """
+
+    def __init__(self, labels, tags, create, samplingRate, capacity = 1024):
+        """
+        :param labels: Array with one row per event, containing either the
+        point or the start and the stop of the interval of the event in samples.
+
+        :param tags: Array with the tag of each event.
+
+        :param create: Function that creates the event with a given index.
+
+        :param samplingRate: The sampling rate of the labels.
+
+        :param capacity: The maximum number of events kept at once. Should
+        exceed the number of events that are visible next to each other.
+        """
+
+        self.rows = labels
+        self.create = create
+        self.samplingRate = samplingRate
+        self.capacity = capacity
+
+        self.storedTags = ( np.asarray(tags) == 1 ).astype(int)
+
+        self.cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        """Returns the event with the given index, creating it and the events
+        visible next to it if necessary.
+        """
+
+        index = int(index)
+
+        if not 0 <= index < len(self):
+            raise IndexError("Event index {} out of range".format(index))
+
+        event = self.__materialize(index)
+
+        start, stop = event.absoluteLimits
+
+        for neighbour in self.__findVisible(start, stop):
+            self.__materialize(neighbour)
+
+        # The accessed event is released last
+        self.cache.move_to_end(index)
+
+        self.__release()
+
+        return event
+
+    def __iter__(self):
+
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def labels(self):
+        """The labels of all events in the format of the labels of a dataset,
+        i.e. points or intervals.
+        """
+
+        if self.rows.shape[1] == 1:
+            return self.rows[:,0]
+
+        return self.rows
+
+    @property
+    def points(self):
+        """The point of each event in samples, the center for intervals.
+        """
+
+        return ( self.rows[:,0].astype(float) + self.rows[:,-1] ) / 2
+
+    @property
+    def pointsInSeconds(self):
+
+        return ( self.rows[:,0] / self.samplingRate + self.rows[:,-1] / self.samplingRate ) / 2
+
+    @property
+    def tags(self):
+        """The current tag of each event, including the tags switched on
+        events that have not been released yet.
+        """
+
+        tags = self.storedTags.copy()
+
+        for index, event in self.cache.items():
+            tags[index] = event.tagged
+
+        return tags
+
+    def __materialize(self, index):
+        """Returns the event with the given index from the cache or creates
+        it with its stored tag.
+        """
+
+        try:
+
+            self.cache.move_to_end(index)
+
+            return self.cache[index]
+
+        except KeyError:
+            pass
+
+        event = self.create(index)
+
+        if self.storedTags[index] == 1:
+            event.switchTag()
+
+        self.cache[index] = event
+
+        return event
+
+    def __findVisible(self, start, stop):
+        """Returns the indices of the events that lie within the given limits
+        in samples, by a binary search over the events sorted by their start.
+        """
+
+        order, starts = self.__getStartIndex()
+
+        candidates = order[np.searchsorted(starts, start, side = 'left'):np.searchsorted(starts, stop, side = 'right')]
+
+        return candidates[self.rows[candidates,-1] <= stop].tolist()
+
+    def __getStartIndex(self):
+        """Returns the order of the events sorted by their start and the sorted
+        starts. Built on the first access.
+        """
+
+        try:
+            return self._startIndex
+        except AttributeError:
+            pass
+
+        order = np.argsort(self.rows[:,0], kind = 'stable')
+
+        self._startIndex = (order, self.rows[order,0])
+
+        return self._startIndex
+
+    def __release(self):
+        """Releases the least recently accessed events until the capacity is
+        met. Their tags are stored and they are removed from their data sources.
+        """
+
+        while len(self.cache) > self.capacity:
+
+            index, event = self.cache.popitem(last = False)
+
+            self.storedTags[index] = event.tagged
+
+            event.onRemove()
+
+class EventList:
+    """Counterpart of :class:`LazyEvents` for events that have been created
+    beforehand. The arrays are computed from the events on each access.
+    """
+
+    def __init__(self, events):
+        self.events = events
+
+    def __len__(self):
+        return len(self.events)
+
+    def __getitem__(self, index):
+        return self.events[index]
+
+    def __iter__(self):
+        return iter(self.events)
+
+    @property
+    def labels(self):
+        return np.array([ event.label for event in self.events ])
+
+    @property
+    def points(self):
+        return np.array([ event.point for event in self.events ])
+
+    @property
+    def pointsInSeconds(self):
+        return np.array([ event.currentPointInSeconds for event in self.events ])
+
+    @property
+    def tags(self):
+        return np.array([ event.tagged for event in self.events ])
@@ -1,19 +1,33 @@
-
 from sleepy.gui.tagging.core import DataEvent
 from sleepy.gui.tagging.model.event import UserPointEvent
 from sleepy.gui.tagging.model.exceptions import UserEventExists
+from sleepy.gui.tagging.model.lazy import EventList, LazyEvents
 import numpy as np
 
 class Navigator:
     def __init__(self, events, changesMade = False):
+        """
+        :param events: The computed events, either a list of events or an
+        instance of :class:`LazyEvents`, which creates the events only when
+        they are navigated to.
+
+        :param changesMade: Whether changes have been made before the creation.
+        """
+
+        if not isinstance(events, LazyEvents):
+            events = EventList(events)
 
-        self.events = events
+        self.computedEvents = events
         self.userEvents = []
 
+        # The navigation order refers to computed events by their index and
+        # to user events by the bitwise complement of their index
+        self.order = np.arange(len(events))
+
         self.maximumPosition = len(events)
 
         self.stateBeforeChanges = self.getCurrentTags()
-        self.eventsBeforeChanges = self.events
+        self.pointsBeforeChanges = self.__getPointsInSeconds()
         self.changesMadeBeforeCreation = changesMade
 
         self.onChangesMade = DataEvent(changesMade)
@@ -43,20 +57,28 @@ class Navigator:
     def currentLimitsInSeconds(self):
         return self.selectedEvent.absoluteLimitsInSeconds
 
+    @property
+    def events(self):
+        """All events in the navigation order. Creates every event, thus
+        selectedEvent should be used to access the current event.
+        """
+
+        return [ self.__getEvent(code) for code in self.order ]
+
     @property
     def pointsInSeconds(self):
-        return list(map(lambda e: e.currentPointInSeconds, self.events))
+        return self.__getPointsInSeconds().tolist()
 
     @property
     def selectedEvent(self):
-        return self.events[self.position]
+        return self.__getEvent(self.order[self.position])
 
     @property
     def tagsInSeconds(self):
 
-        selectedEvents = list(filter(lambda e: e.tagged, self.events))
+        pointsInSeconds = self.__getPointsInSeconds()
 
-        return list(map(lambda e: e.currentPointInSeconds, selectedEvents))
+        return pointsInSeconds[self.getCurrentTags() == 1].tolist()
 
     @property
     def selectionTag(self):
@@ -78,7 +100,7 @@ class Navigator:
 
     def selectClosestToTime(self, time):
 
-        pointsInSeconds = np.array(self.pointsInSeconds)
+        pointsInSeconds = self.__getPointsInSeconds()
 
         self.position = np.argmin(np.abs(pointsInSeconds - time))
 
@@ -103,8 +125,8 @@ class Navigator:
         self.changesMade = not np.array_equal(
             self.stateBeforeChanges, self.getCurrentTags()
         ) or self.changesMadeBeforeCreation or not np.array_equal(
-            list(map(lambda e:e.currentPointInSeconds, self.eventsBeforeChanges)),
-            list(map(lambda e:e.currentPointInSeconds, self.events))
+            self.pointsBeforeChanges,
+            self.__getPointsInSeconds()
         )
 
 
@@ -116,36 +138,31 @@ class Navigator:
 
         self.stateBeforeChanges = self.getCurrentTags()
 
-        self.eventsBeforeChanges = self.events
+        self.pointsBeforeChanges = self.__getPointsInSeconds()
 
     def getCurrentTags(self):
 
-        tags = []
-
-        for event in self.events:
-            tags.append(event.tagged)
-
-        return np.array(tags)
+        return self.__merge(
+            self.computedEvents.tags,
+            [ e.tagged for e in self.userEvents ]
+        )
 
     def getCurrentLabels(self):
 
-        labels = []
+        labels = list(self.computedEvents.labels) + [ e.label for e in self.userEvents ]
 
-        for event in self.events:
-            labels.append(event.label)
-
-        return np.array(labels)
+        return np.array([ labels[index] for index in self.__getIndices() ])
 
     def getLabelPartition(self):
         """Returns the labels belonging to computed events and the labels
-        belonging to user events as two separate numpy arrays.
+        belonging to user events as two separate numpy arrays. The computed
+        labels are in the order of the computed events, the user labels in the
+        navigation order.
         """
 
-        computed = list(filter(lambda e: e not in self.userEvents, self.events))
-
-        user = list(filter(lambda e: e in self.userEvents, self.events))
+        user = [ self.userEvents[~code] for code in self.order[self.order < 0] ]
 
-        return self.getLabelsFromEvents(computed), self.getLabelsFromEvents(user)
+        return self.computedEvents.labels, self.getLabelsFromEvents(user)
 
     def getLabelsFromEvents(self, events):
         """Returns the labels of a given set of events as a numpy array.
@@ -196,9 +213,10 @@ class Navigator:
 
         selectedEvent = self.selectedEvent
 
-        self.events.append(userEvent)
         self.userEvents.append(userEvent)
 
+        self.order = np.append(self.order, ~(len(self.userEvents) - 1))
+
         self.ensureConsistency()
 
         # Make sure that position is updated if inserted before current
@@ -212,9 +230,15 @@ class Navigator:
 
         selectedEvent = self.selectedEvent
 
-        self.events.remove(userEvent)
+        code = ~self.userEvents.index(userEvent)
+
         self.userEvents.remove(userEvent)
 
+        self.order = self.order[self.order != code]
+
+        # The user events after the removed one move up by one index
+        self.order[self.order < code] += 1
+
         userEvent.onRemove()
 
         self.ensureConsistency()
@@ -242,15 +266,18 @@ class Navigator:
 
     def ensureConsistency(self):
 
-        oldEvents = self.events
-
-        self.events = sorted(
-            self.events, key = lambda event: event.point
+        points = self.__merge(
+            self.computedEvents.points,
+            [ e.point for e in self.userEvents ]
         )
 
-        self.maximumPosition = len(self.events)
+        oldOrder = self.order
+
+        self.order = self.order[np.argsort(points, kind = 'stable')]
+
+        self.maximumPosition = len(self.order)
 
-        if oldEvents != self.events:
+        if not np.array_equal(oldOrder, self.order):
             self.changesMade = True
 
     def getTimelineData(self):
@@ -269,6 +296,45 @@ class Navigator:
         """Returns the tags that belong to events that are not user events.
         """
 
-        tags = [ e.tagged for e in self.events if e not in self.userEvents ]
+        return self.computedEvents.tags
+
+    def __getEvent(self, code):
+        """Returns the computed or the user event a code of the navigation
+        order refers to.
+        """
+
+        if code < 0:
+            return self.userEvents[~code]
+
+        return self.computedEvents[code]
+
+    def __getPointsInSeconds(self):
+        """Returns the points in seconds of all events in the navigation order
+        as an array.
+        """
+
+        return self.__merge(
+            self.computedEvents.pointsInSeconds,
+            [ e.currentPointInSeconds for e in self.userEvents ]
+        )
+
+    def __getIndices(self):
+        """Returns the navigation order as indices into the computed events
+        followed by the user events.
+        """
+
+        return np.where(self.order < 0, len(self.computedEvents) + ~self.order, self.order)
+
+    def __merge(self, computedValues, userValues):
+        """Arranges the values of the computed events and the values of the
+        user events in the navigation order.
+        """
+
+        computedValues = np.asarray(computedValues)
+
+        values = np.concatenate([
+            computedValues,
+            np.array(userValues, dtype = computedValues.dtype)
+        ])
 
-        return np.array(tags)
+        return values[self.__getIndices()]
@@ -0,0 +1,82 @@
+from sleepy.gui.tagging.model import LazyEvents
+from sleepy.gui.tagging.model.event import PointEvent
+from sleepy.test.core import TestBase
+import unittest
+import numpy as np
+
+class LazyEventsTest(unittest.TestCase):
+
+    def standardScenario(points, tags = None, capacity = 1024):
+        """Creates lazy point events in a single data source, which record the
+        indices of the created events. Each event shows 10 samples on either
+        side.
+        """
+
+        settings = TestBase.getSettings()
+
+        dataSource = TestBase.getDataSource()
+
+        created = []
+
+        def create(index):
+
+            created.append(index)
+
+            return PointEvent(points[index], dataSource, settings)
+
+        if tags is None:
+            tags = np.zeros(len(points))
+
+        events = LazyEvents(np.array(points).reshape(-1, 1), tags, create, dataSource.samplingRate, capacity)
+
+        return dataSource, created, events
+
+    def test_arrays_without_creating_events(self):
+        """Labels, points and tags are provided without creating any event.
+        """
+
+        dataSource, created, events = LazyEventsTest.standardScenario([5, 12, 50], [0, 1, 0])
+
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events.labels.tolist(), [5, 12, 50])
+        self.assertEqual(events.pointsInSeconds.tolist(), [.5, 1.2, 5.])
+        self.assertEqual(events.tags.tolist(), [0, 1, 0])
+
+        self.assertEqual(created, [])
+
+    def test_access_creates_visible_neighbours(self):
+        """Accessing an event creates the event and the events visible next to
+        it, which are registered at the data source.
+        """
+
+        dataSource, created, events = LazyEventsTest.standardScenario([5, 12, 50, 58, 90], [0, 0, 0, 1, 0])
+
+        event = events[2]
+
+        self.assertEqual(event.point, 50)
+        self.assertEqual(sorted(created), [2, 3])
+
+        self.assertEqual(sorted(e.point for e in dataSource.events), [50, 58])
+        self.assertEqual([ e.tagged for e in dataSource.events if e.point == 58 ], [1])
+
+        self.assertIs(events[2], event)
+        self.assertEqual(sorted(created), [2, 3])
+
+    def test_capacity_releases_events_keeping_tags(self):
+        """Beyond the capacity, the least recently accessed events are removed
+        from the data source. Their tags are kept and restored when they are
+        created again.
+        """
+
+        dataSource, created, events = LazyEventsTest.standardScenario([10, 40, 70, 95], capacity = 2)
+
+        events[0].switchTag()
+
+        events[1]
+        events[2]
+
+        self.assertEqual(sorted(e.point for e in dataSource.events), [40, 70])
+        self.assertEqual(events.tags.tolist(), [1, 0, 0, 0])
+
+        self.assertEqual(events[0].tagged, 1)
+        self.assertEqual(created, [0, 1, 2, 0])
@@ -2,6 +2,8 @@
 from unittest.mock import MagicMock
 import unittest
 from sleepy.test.core import TestBase
+from sleepy.gui.tagging.model import LazyEvents
+from sleepy.gui.tagging.model.event import PointEvent
 import numpy as np
 
 class NavigatorTest(unittest.TestCase):
@@ -203,3 +205,43 @@ class NavigatorTest(unittest.TestCase):
         self.assertEqual(navigator.getCurrentTags().tolist(), [0,0,1,0,0,0])
 
         self.assertEqual(navigator.getComputedEventTags().tolist(), [0,1,0,0,0])
+
+    def test_lazy_events_created_on_navigation(self):
+        """A navigator over lazy events creates only the navigated events and
+        keeps tags and labels of computed and user events apart.
+        """
+
+        settings = TestBase.getSettings()
+
+        dataSource = TestBase.getDataSource()
+
+        points = [15, 40, 65, 90]
+
+        events = LazyEvents(
+            np.array(points).reshape(-1, 1),
+            np.zeros(len(points)),
+            lambda index: PointEvent(points[index], dataSource, settings),
+            dataSource.samplingRate
+        )
+
+        navigator = TestBase.getNavigator(events)
+
+        self.assertEqual(navigator.pointsInSeconds, [1.5, 4., 6.5, 9.])
+        self.assertEqual(len(dataSource.events), 0)
+
+        navigator.selectNext()
+        navigator.switchSelectionTag()
+
+        self.assertEqual(len(dataSource.events), 1)
+        self.assertTrue(navigator.changesMade)
+
+        navigator.addUserEventSamples(30)
+
+        self.assertEqual(navigator.selectedEvent.point, 40)
+        self.assertEqual(navigator.getCurrentTags().tolist(), [0,0,1,0,0])
+
+        computed, user = navigator.getLabelPartition()
+
+        self.assertEqual(computed.tolist(), points)
+        self.assertEqual(user.tolist(), [30])
+        self.assertEqual(navigator.getComputedEventTags().tolist(), [0,1,0,0])
@@ -52,6 +52,7 @@ class NullView(QWidget):
 
         self.wrapping.clearFile.setDisabled(True)
         self.wrapping.saveFile.setDisabled(True)
+        self.wrapping.exportFile.setDisabled(True)
         self.wrapping.reloadFile.setDisabled(True)
 
         self.wrapping.window.setWindowTitle(self.wrapping.control.name)
@@ -77,6 +78,7 @@ class TaggingView(QWidget):
         self.initializeShortcuts()
 
         self.wrapping.saveFile.triggered.connect(self.control.onSaveFile)
+        self.wrapping.exportFile.triggered.connect(self.control.onExportFile)
 
     def initializeLayout(self):
 
@@ -144,6 +146,7 @@ class TaggingView(QWidget):
         self.addToolBar()
 
         self.wrapping.clearFile.setDisabled(False)
+        self.wrapping.exportFile.setDisabled(False)
         self.wrapping.reloadFile.setDisabled(False)
 
     def setButtonStyle(self, stylesheet, text):
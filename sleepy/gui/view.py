@@ -139,6 +139,9 @@ class View:
         self.saveFile = QAction('Save', self.window)
         fileMenu.addAction(self.saveFile)
 
+        self.exportFile = QAction('Export', self.window)
+        fileMenu.addAction(self.exportFile)
+
         self.clearFile = QAction('Clear', self.window)
         self.clearFile.triggered.connect(self.control.onClearFile)
         fileMenu.addAction(self.clearFile)
@@ -2,3 +2,4 @@
 #from sleepy.processing.core import FileProcessor
 from sleepy.processing.valley import Valley
 from sleepy.processing.signal import Signal
+from sleepy.processing.features import EventFeatures
@@ -1,6 +1,7 @@
 
 from sleepy.processing.processor import Algorithm
 from sleepy.processing.parameter import Parameter
+from sleepy.processing.algorithms.waves import concatenateWaves, resampleAndPad
 import numpy as np
 
 class BiLSTM(Algorithm):
@@ -8,10 +9,14 @@ class BiLSTM(Algorithm):
     def __init__(self):
 
         self.name = "BiLSTM"
-        
 
-    def compute(self, signal):
-        
+        # Number of waves predicted at once, the last batch is padded to this
+        # size such that the model always sees the same input shape
+        self.batchSize = 1024
+
+
+    def getModel(self):
+
         if not hasattr(self, 'BiLSTM_model'):
             # generate model
             from keras.models import Sequential
@@ -38,19 +43,75 @@ class BiLSTM(Algorithm):
     
             self.BiLSTM_model=model
 
-        intervals = signal.findWaves()
-        if len(intervals)>=1:
-            signals = [signal.data[interval[0]:interval[1]] for interval in intervals]
-            from keras.preprocessing.sequence import pad_sequences
+        return self.BiLSTM_model
+
+    def computeAll(self, signals, executor = None, monitor = None):
+        """Gathers the waves of all epochs and channels, predicts them in
+        batches of fixed size and scatters the labels back to the signals.
+        The monitor of the engine, if any, is checked for a cancellation
+        before each batch and advanced in shares of the predicted waves.
+        """
+
+        intervals = [ signal.findWaves() for signal in signals ]
+
+        data, starts, stops = concatenateWaves(signals, intervals)
+
+        labels = np.zeros(len(starts), dtype = bool)
+
+        if monitor is not None:
+            monitor = monitor.share(len(signals), len(starts))
+
+        if len(starts) >= 1:
             # downsampling and padding
-            resamplingRate=signal.samplingRate/50
-            signals=[np.interp(np.arange(0, len(sig), resamplingRate), np.arange(0, len(sig)), sig) for sig in signals]
-            signals=pad_sequences(signals, padding='post',dtype='float64',maxlen=126)
-            signals=signals.reshape((signals.shape[0], 126, 1))
-            labels=self.BiLSTM_model.predict(signals)>0.5
-            if len(labels)>1:
-                labels=np.squeeze(labels)
-
-            return np.array([interval for interval,label in zip(intervals,labels) if label])
-        else:
-            return np.array([])
+            resamplingRate=signals[0].samplingRate/50
+            waves=resampleAndPad(data, starts, stops, resamplingRate, 126)
+            waves=waves.reshape((waves.shape[0], 126, 1))
+
+            labels = self.predict(waves, monitor)
+
+        offsets = np.cumsum([0] + [ len(signalIntervals) for signalIntervals in intervals ])
+
+        return [
+            signalIntervals[labels[start:stop]]
+                for signalIntervals, start, stop in zip(intervals, offsets[:-1], offsets[1:])
+        ]
+
+    def predict(self, waves, monitor = None):
+        """Predicts the waves in batches of fixed size.
+
+        :param waves: Array of shape (N, 126, 1).
+
+        :param monitor: Optional :class:`Progress` checked before each batch
+        and advanced by the number of waves of each batch.
+
+        :returns: Boolean array with one entry per wave.
+        """
+
+        model = self.getModel()
+
+        labels = np.zeros(len(waves), dtype = bool)
+
+        batch = np.zeros((self.batchSize,) + waves.shape[1:], dtype = waves.dtype)
+
+        for start in range(0, len(waves), self.batchSize):
+
+            if monitor is not None:
+                monitor.check()
+
+            stop = min(start + self.batchSize, len(waves))
+
+            batch[:stop - start] = waves[start:stop]
+            batch[stop - start:] = 0
+
+            prediction = np.ravel(model.predict_on_batch(batch))
+
+            labels[start:stop] = prediction[:stop - start] > 0.5
+
+            if monitor is not None:
+                monitor.advance(stop - start)
+
+        return labels
+
+    def compute(self, signal):
+
+        return self.computeAll([signal])[0]
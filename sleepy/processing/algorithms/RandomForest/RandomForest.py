@@ -1,6 +1,7 @@
 
 from sleepy.processing.processor import Algorithm
 from sleepy.processing.parameter import Parameter
+from sleepy.processing.algorithms.waves import concatenateWaves, resampleAndPad
 import numpy as np
 
 class RandomForest(Algorithm):
@@ -8,7 +9,11 @@ class RandomForest(Algorithm):
     def __init__(self):
 
         self.name = "RandomForest"
-        
+
+        # Number of waves classified at once, between which a cancellation
+        # of the computation is checked
+        self.batchSize = 4096
+
     def calc_fs(self,X):
         features=np.zeros((X.shape[0],17),dtype='float32')
         # Features 0-4: Length, Minimum, Maximum, Amplitude, Ratio of Min to max
@@ -55,8 +60,8 @@ class RandomForest(Algorithm):
         return features
         
 
-    def compute(self, signal):
-        
+    def getModel(self):
+
         if not hasattr(self, 'RF_model'):
             # generate model
             import joblib
@@ -64,18 +69,68 @@ class RandomForest(Algorithm):
     
             self.RF_model=model
 
-        intervals = signal.findWaves()
-        if len(intervals)>=1:
-            signals = [signal.data[interval[0]:interval[1]] for interval in intervals]
-            from keras.preprocessing.sequence import pad_sequences
+        return self.RF_model
+
+    def computeAll(self, signals, executor = None, monitor = None):
+        """Gathers the waves of all epochs and channels, classifies them in
+        batches and scatters the labels back to the signals. The monitor of
+        the engine, if any, is checked for a cancellation before each batch
+        and advanced in shares of the classified waves.
+        """
+
+        intervals = [ signal.findWaves() for signal in signals ]
+
+        data, starts, stops = concatenateWaves(signals, intervals)
+
+        labels = np.zeros(len(starts), dtype = bool)
+
+        if monitor is not None:
+            monitor = monitor.share(len(signals), len(starts))
+
+        if len(starts) >= 1:
             # downsampling and padding
-            resamplingRate=signal.samplingRate/50
-            signals=[np.interp(np.arange(0, len(sig), resamplingRate), np.arange(0, len(sig)), sig) for sig in signals]
-            signals=pad_sequences(signals, padding='post',dtype='float64',maxlen=126)
-            
-            signals=self.calc_fs(signals)
-            labels=self.RF_model.predict(signals)
-
-            return np.array([interval for interval,label in zip(intervals,labels) if label==1])
-        else:
-            return np.array([])
+            resamplingRate=signals[0].samplingRate/50
+            waves=resampleAndPad(data, starts, stops, resamplingRate, 126)
+
+            labels = self.predict(waves, monitor)
+
+        offsets = np.cumsum([0] + [ len(signalIntervals) for signalIntervals in intervals ])
+
+        return [
+            signalIntervals[labels[start:stop]]
+                for signalIntervals, start, stop in zip(intervals, offsets[:-1], offsets[1:])
+        ]
+
+    def predict(self, waves, monitor = None):
+        """Computes the features of the waves and classifies them in batches.
+        The features of a wave do not depend on the other waves.
+
+        :param waves: Array of shape (N, 126).
+
+        :param monitor: Optional :class:`Progress` checked before each batch
+        and advanced by the number of waves of each batch.
+
+        :returns: Boolean array with one entry per wave.
+        """
+
+        model = self.getModel()
+
+        labels = np.zeros(len(waves), dtype = bool)
+
+        for start in range(0, len(waves), self.batchSize):
+
+            if monitor is not None:
+                monitor.check()
+
+            features = self.calc_fs(waves[start:start + self.batchSize])
+
+            labels[start:start + self.batchSize] = model.predict(features) == 1
+
+            if monitor is not None:
+                monitor.advance(len(features))
+
+        return labels
+
+    def compute(self, signal):
+
+        return self.computeAll([signal])[0]
@@ -1,11 +1,17 @@
-
 from sleepy.processing.algorithms.massimi import Massimi
-#rom sleepy.processing.algorithms.core import Algorithm
-#from sleepy.processing.algorithms.parameter import Parameter
 from sleepy.processing.algorithms.walkthrough.walkthrough import Walkthrough
 from sleepy.processing.algorithms.relative.relative import Relative
 from sleepy.processing.algorithms.percentile.percentile import Percentile
 from sleepy.processing.algorithms.custom.custom import Custom
 from sleepy.processing.algorithms.BiLSTM.BiLSTM import BiLSTM
 from sleepy.processing.algorithms.RandomForest.RandomForest import RandomForest
-from sleepy.processing.algorithms.dtw1nn import DTW1NN
+import importlib
+
+# DTW-1NN is imported on first access, such that using any other algorithm
+# does not import its dependencies (numba, dill)
+def __getattr__(name):
+
+    if name == 'DTW1NN':
+        return importlib.import_module('sleepy.processing.algorithms.dtw1nn').DTW1NN
+
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
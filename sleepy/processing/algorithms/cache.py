@@ -0,0 +1,68 @@
+import os
+import threading
+
+class ModelCache:
+    """Process-wide cache for models that are loaded from disk. A model is
+    identified by the paths of the files it is loaded from together with their
+    modification times, such that a model is loaded once per process and is
+    reloaded only if one of its files changes. The cache is shared by all
+    algorithm instances and survives subsequent calls of :class:`Engine.run`.
+    """
+
+    models = {}
+
+    lock = threading.Lock()
+
+    def get(paths, loader):
+        """Returns the model loaded from the given paths. Calls the loader with
+        the paths if the model is not in the cache or if one of its files has
+        been modified since it was loaded.
+
+        :param paths: A list of paths to the files the model is loaded from.
+
+        :param loader: A function that receives the paths as arguments and
+        returns the model.
+
+        :returns: The cached model.
+        """
+
+        key = ModelCache.getKey(paths)
+
+        with ModelCache.lock:
+
+            if key not in ModelCache.models:
+
+                ModelCache.evict(paths)
+
+                ModelCache.models[key] = loader(*paths)
+
+            return ModelCache.models[key]
+
+    def getKey(paths):
+        """Creates the cache key for a list of paths from the absolute paths
+        and the modification times of the files.
+        """
+
+        return tuple(
+            (os.path.abspath(path), os.path.getmtime(path)) for path in paths
+        )
+
+    def evict(paths):
+        """Removes all models loaded from the given paths from the cache,
+        regardless of the modification times they were loaded with.
+        """
+
+        absolutePaths = [ os.path.abspath(path) for path in paths ]
+
+        ModelCache.models = {
+            key : model for key, model in ModelCache.models.items()
+                if [ path for path, _ in key ] != absolutePaths
+        }
+
+    def clear():
+        """Removes all models from the cache.
+        """
+
+        with ModelCache.lock:
+
+            ModelCache.models = {}
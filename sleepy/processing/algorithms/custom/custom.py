@@ -65,14 +65,12 @@ class Custom(Algorithm):
 
     def compute(self, signal):
 
-        intervals = signal.findWaves()
+        intervals = signal.findWavesInDuration(self.durationLow, self.durationHigh)
 
         def isEvent(interval):
 
             currSignal = signal.data[interval[0]:interval[1]]
 
-            currDuration = interval[1] - interval[0]
-
             minInd = np.where(currSignal == np.min(currSignal))[0]
             maxInd = np.where(currSignal == np.max(currSignal))[0]
 
@@ -83,8 +81,7 @@ class Custom(Algorithm):
             posPeaks, _ = find_peaks(signal.data[interval[0]:interval[1]], height=0)
             nPosPeaks = len(posPeaks)
 
-            if self.durationLow * signal.samplingRate <= currDuration <= self.durationHigh * signal.samplingRate and \
-                firstCrossToMinDuration <= self.firstCrosstoMinDuration * signal.samplingRate and \
+            if firstCrossToMinDuration <= self.firstCrosstoMinDuration * signal.samplingRate and \
                 minToMaxDuration <= self.minToMaxDuration * signal.samplingRate and \
                 maxToSecondCrossDuration <= self.maxToSecondZeroCrossDuration * signal.samplingRate and \
                 nPosPeaks <= self.nPosPeaks:
@@ -93,31 +90,30 @@ class Custom(Algorithm):
 
             return False
 
-        return np.array([interval for interval in intervals if isEvent(interval)])
+        return intervals[np.array([ isEvent(interval) for interval in intervals ], dtype = bool)]
 
     def filter(self, events, data):
 
-        if self.scalingAmplitude:
+        amplitudes = events.amplitude
 
-            amplitudes = [ event.maxVoltage - event.minVoltage for event in events ]
+        negAmplitudes = events.minVoltage
 
-            amplitudeThreshold = np.mean(amplitudes) * self.scalingAmplitude
+        keep = np.ones(len(events), dtype = bool)
 
-            events = [ event for event in events if (event.maxVoltage - event.minVoltage) >= amplitudeThreshold ]
+        if self.scalingAmplitude:
 
-        if self.scalingNegPeak:
+            amplitudeThreshold = np.mean(amplitudes[keep]) * self.scalingAmplitude
 
-            negAmplitudes = [ event.minVoltage for event in events ]
+            keep &= amplitudes >= amplitudeThreshold
 
-            negThreshold = np.mean(negAmplitudes) * self.scalingNegPeak
+        if self.scalingNegPeak:
 
-            events = [ event for event in events if event.minVoltage <= negThreshold ]
+            negThreshold = np.mean(negAmplitudes[keep]) * self.scalingNegPeak
 
-        
-        amplitudes = [ event.maxVoltage - event.minVoltage for event in events ]
+            keep &= negAmplitudes <= negThreshold
 
-        amplitudeThreshold = np.percentile(amplitudes, 100 - self.percentile)
+        amplitudeThreshold = np.percentile(amplitudes[keep], 100 - self.percentile)
 
-        events = [ event for event in events if (event.maxVoltage - event.minVoltage) >= amplitudeThreshold ]
+        keep &= amplitudes >= amplitudeThreshold
 
-        return events
+        return keep
@@ -44,6 +44,10 @@ spec = [
     ('intervals', int32),
     ('distComputation', float64),
     ('distComputationPerQuery', float64),
+    ('lbAbandoned', int64),
+    ('lbAbandonedPerQuery', int64),
+    ('dtwAbandoned', int64),
+    ('dtwAbandonedPerQuery', int64),
     ('nbTimeSeriesSeen', int32),
     ('nbTimeSeriesToActualNN', int32),
     ('timeToActualNN', float64),
@@ -105,6 +109,12 @@ class classifierTSI:
         self.distComputation = 0.0
         self.distComputationPerQuery = 0.0
 
+        # Number of lower bound and DTW computations that were abandoned early
+        self.lbAbandoned = 0
+        self.lbAbandonedPerQuery = 0
+        self.dtwAbandoned = 0
+        self.dtwAbandonedPerQuery = 0
+
         self.nbTimeSeriesSeen = 0
 
         self.nbTimeSeriesToActualNN = self.nil
@@ -239,6 +249,8 @@ class classifierTSI:
         self.dtwBranchPQ = BranchPriorityQueue(self.maxPQSize) # Priority queue for DTW branches (min PQ)
         self.lbBranchPQ = BranchPriorityQueue(self.maxPQSize) # Priority queue for LB branches (min PQ)
         self.distComputationPerQuery = 0.0
+        self.lbAbandonedPerQuery = 0
+        self.dtwAbandonedPerQuery = 0
         self.arrayCount = 0
         self.nbTimeSeriesSeen = 0
 
@@ -307,12 +319,17 @@ class classifierTSI:
                 index = np.zeros(np.shape(nodeIndex)[0], dtype=int32)
                 lbDistances = np.zeros(np.shape(nodeIndex)[0], dtype = float64)
 
+                # The worst distance only decreases while traversing the leaf,
+                # candidates whose lower bound exceeds it are never examined
+                worstSoFarDist = self.kNNIndex.firstDistance()
 
                 for j in range(0, np.shape(nodeIndex)[0]):
 
                     index[j] = nodeIndex[j]
-                    lbDistances[j] = self.lbKeogh.compute(wedge, self.trainingDataset[index[j]])
+                    lbDistances[j] = self.lbKeogh.computeEarlyAbandon(wedge, self.trainingDataset[index[j]], worstSoFarDist)
                     self.distComputationPerQuery += self.lbKeogh.distComputation
+                    if self.lbKeogh.abandoned:
+                        self.lbAbandonedPerQuery += 1
                 lbDistances, index = sort(lbDistances, index, 0, np.shape(lbDistances)[0] - 1)
 
                 # Apply LB Keogh-NN-DTW with LB Keogh to all the time series in this node
@@ -321,9 +338,11 @@ class classifierTSI:
                     worstSoFarDist = self.kNNIndex.firstDistance()
 
                     if lbDistances[j] < worstSoFarDist:
-                        dtwDistance = self.dtw.dtw(query, self.trainingDataset[index[j]], w)
+                        dtwDistance = self.dtw.dtwEarlyAbandon(query, self.trainingDataset[index[j]], w, worstSoFarDist)
 
                         self.distComputationPerQuery += self.dtw.distComputation
+                        if self.dtw.abandoned:
+                            self.dtwAbandonedPerQuery += 1
 
                         if dtwDistance < worstSoFarDist:
                             # If dtw distance is better than the worst knn distance, add it to the results queue
@@ -431,7 +450,10 @@ class classifierTSI:
                         else:
                             if distances[i] < self.kNNIndex.firstDistance():
                                 if children[i].centroid is not None:
-                                    distances[i] = self.dtw.dtw(query, children[i].centroid, w)
+                                    distances[i] = self.dtw.dtwEarlyAbandon(query, children[i].centroid, w, self.kNNIndex.firstDistance())
+                                    self.distComputationPerQuery += self.dtw.distComputation
+                                    if self.dtw.abandoned:
+                                        self.dtwAbandonedPerQuery += 1
                                     if distances[i] < self.kNNIndex.firstDistance():
                                         if self.kNNIndex.isFull():
                                             self.kNNIndex.pop()
@@ -508,6 +530,8 @@ class classifierTSI:
         self.totalQueryTime = 0.0
         self.index1NN = np.empty(len(testingDataset), dtype = int32)
         self.distComputation = 0
+        self.lbAbandoned = 0
+        self.dtwAbandoned = 0
 
         # Initialize the results for different time intervals
         self.maxCount = 0
@@ -539,6 +563,8 @@ class classifierTSI:
             self.totalQueryTime += self.elapsedTime # Update total query time
             self.index1NN[i] = self.getNN() # Predicted nearest neighbour index of the query
             self.distComputation += self.distComputationPerQuery
+            self.lbAbandoned += self.lbAbandonedPerQuery
+            self.dtwAbandoned += self.dtwAbandonedPerQuery
 
             # Update error count
             if predictClass[i] != self.actualClass:
@@ -5,69 +5,100 @@ from numba import typed, types
 from numba.types import pyobject
 import numpy as np
 spec = [
-        ('maxSeqLen', int32),               
-        ('D', float64[:,:]),
-        ('distComputation', float64)
+        ('distComputation', float64),
+        ('abandoned', boolean)
 ]
 @jitclass(spec)
 class DTW:
 
     def __init__(self):
 
-        maxSeqLen = 15000
-        self.D = np.zeros((maxSeqLen, maxSeqLen), dtype = float64)
         self.distComputation = 0.0
+        self.abandoned = False
 
     def dtw(self, Q, C, W):
 
         """
         Function for calculating dynamic time warping instance.
+        Only two rows of the cost matrix within the Sakoe-Chiba band are kept
+        in memory, cells outside of the band are infinite.
         Input parameters:
         Q - query time series 1 x N
         C - comparison time series 1 x M
         W - warping window
         """
 
-        nq = len(Q) # length of query
-        nc = len(C) # length of comparison
-        w = np.max(np.array([W, np.absolute(nq - nc)])) # warping window
+        return self.dtwEarlyAbandon(Q, C, W, np.inf)
 
-        mq = np.min(np.array([nq, 1 + w])) # boundary of cost matrix
-        mc = np.min(np.array([nc, 1 + w]))
+    def dtwEarlyAbandon(self, Q, C, W, bestSoFar):
 
-        self.D[0][0] = np.power((Q[0] - C[0]), 2)
-        self.distComputation = 1
+        """
+        Function for calculating dynamic time warping instance, abandoning the
+        computation as soon as the minimum of a row exceeds the best distance so
+        far. Since every warping path crosses every row, the distance cannot be
+        smaller than that minimum. Returns infinity and sets abandoned if the
+        computation was abandoned, the exact distance otherwise.
+        Input parameters:
+        Q - query time series 1 x N
+        C - comparison time series 1 x M
+        W - warping window
+        bestSoFar - distance above which the computation is abandoned
+        """
 
-        for i in range(1, mq):
-            self.D[i][0] = self.D[i-1][0] + np.power((Q[i] - C[0]), 2)
+        nq = len(Q) # length of query
+        nc = len(C) # length of comparison
+        w = max(W, abs(nq - nc)) # warping window
+
+        mq = min(nq, 1 + w) # boundary of cost matrix
+        mc = min(nc, 1 + w)
 
-        if i < nq:
-            self.D[i][0] = np.inf
+        previous = np.full(nc, np.inf) # row i - 1 of the cost matrix
+        current = np.full(nc, np.inf) # row i of the cost matrix
 
+        # First row, the last cell within the band is marked infinite
+        previous[0] = (Q[0] - C[0]) ** 2
         for j in range(1, mc):
-            self.D[0][j] = self.D[0][j-1] + np.power((Q[0] - C[j]), 2)
+            previous[j] = previous[j-1] + (Q[0] - C[j]) ** 2
+
+        if mc > 1:
+            previous[mc - 1] = np.inf
 
-        if j < nc:
-            self.D[0][j] = np.inf
+        # First column, the last cell within the band is marked infinite
+        firstColumn = previous[0]
 
+        self.distComputation = 1
         self.distComputation += (mq + mc)
+        self.abandoned = False
 
         for i in range(1, nq):
-            jStart = np.max(np.array([1, i - w]))
-            jStop = np.min(np.array([nc, i + w + 1]))
+            jStart = max(1, i - w)
+            jStop = min(nc, i + w + 1)
+
+            if i < mq:
+                firstColumn += (Q[i] - C[0]) ** 2
+
+            if jStart == 1 and i < mq - 1:
+                current[0] = firstColumn
+            else:
+                current[jStart - 1] = np.inf
+
+            rowMin = current[jStart - 1]
 
             for j in range(jStart, jStop):
 
-                cost = np.power((Q[i] - C[j]), 2)
-                temp = np.min(np.array([self.D[i - 1][j - 1], self.D[i - 1][j], self.D[i][j - 1]]))
-                self.D[i][j] = cost + temp
+                cost = (Q[i] - C[j]) ** 2
+                temp = min(previous[j - 1], previous[j], current[j - 1])
+                current[j] = cost + temp
+                rowMin = min(rowMin, current[j])
                 self.distComputation += 1
 
-            if jStop < nc:
-                self.D[i][jStop] = np.inf
+            if rowMin > bestSoFar:
+                self.abandoned = True
+                return np.inf
 
-            if i < nq - 1:
-                self.D[i+1][jStart] = np.inf
+            if jStop < nc:
+                current[jStop] = np.inf
 
+            previous, current = current, previous
 
-        return self.D[nq-1][nc-1]
+        return previous[nc - 1]
@@ -6,13 +6,15 @@ from numba.types import pyobject
 import numpy as np
 from scipy.io import loadmat, savemat
 spec = [
-        ('distComputation', int32)
+        ('distComputation', int32),
+        ('abandoned', boolean)
 ]
 @jitclass(spec)
 class LBKeogh:
 
     def __init__(self):
         self.distComputation = 0
+        self.abandoned = False
 
     def envelope(self, query, w):
 
@@ -37,8 +39,18 @@ class LBKeogh:
 
     def compute(self, wedge, candidate):
 
+        return self.computeEarlyAbandon(wedge, candidate, np.inf)
+
+    def computeEarlyAbandon(self, wedge, candidate, bestSoFar):
+        """Computes the lower bound cumulatively and abandons as soon as the
+        partial sum exceeds the best distance so far. In that case the partial
+        sum, which is still larger than bestSoFar, is returned and abandoned
+        is set.
+        """
+
         minLength = np.min(np.array([len(wedge[0]), len(candidate)]))
-        res = 0
+        res = 0.0
+        self.abandoned = False
 
         for i in range(0, minLength):
 
@@ -50,6 +62,11 @@ class LBKeogh:
 
                 res += np.power((wedge[0][i] - candidate[i]), 2)
 
+            if res > bestSoFar:
+                self.distComputation = i + 1
+                self.abandoned = True
+                return res
+
         self.distComputation = minLength
 
         return res
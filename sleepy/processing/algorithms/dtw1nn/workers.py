@@ -0,0 +1,88 @@
+import numpy as np
+
+from sleepy.processing.algorithms.cache import ModelCache
+
+def classifyWaves(paths, loader, waves, windowSize, batchSize, executor = None, monitor = None):
+    """Classifies waves with the DTW-1NN classifier. The waves are split into
+    batches, which are distributed among the workers of the executor supplied
+    by the caller, if any, and classified in the calling process otherwise.
+    The predictions are collected by the index of the wave. Each process loads
+    the model through the :class:`ModelCache` on its first batch and keeps its
+    compiled classifier, such that neither is paid again for every batch.
+
+    :param paths: Paths of the model files, as used by the :class:`ModelCache`.
+
+    :param loader: A picklable function that loads the model from the paths.
+
+    :param waves: List of waves, each a one-dimensional array.
+
+    :param windowSize: Warping window of the dynamic time warping.
+
+    :param batchSize: Number of waves sent to a worker at once.
+
+    :param executor: Optional instance of :class:`concurrent.futures.Executor`
+    owned by the caller, e.g. the one handed to :meth:`Engine.run`.
+
+    :param monitor: Optional :class:`Progress` checked for a cancellation
+    before each batch is collected, the pending batches are cancelled then,
+    and advanced by the number of waves of each collected batch.
+
+    :returns: Array with the predicted class of each wave.
+    """
+
+    predictions = np.zeros(len(waves), dtype = int)
+
+    batches = [
+        (paths, loader, waves[start:start + batchSize], windowSize, start)
+            for start in range(0, len(waves), batchSize)
+    ]
+
+    if executor is None:
+        futures = []
+        results = map(classifyBatch, batches)
+    else:
+        futures = [ executor.submit(classifyBatch, batch) for batch in batches ]
+        results = ( future.result() for future in futures )
+
+    try:
+
+        for batch in batches:
+
+            if monitor is not None:
+                monitor.check()
+
+            start, prediction = next(results)
+
+            predictions[start:start + len(prediction)] = prediction
+
+            if monitor is not None:
+                monitor.advance(len(prediction))
+
+    finally:
+
+        for future in futures:
+            future.cancel()
+
+    return predictions
+
+def classifyBatch(arguments):
+    """Classifies a batch of waves, using the model that was loaded into the
+    :class:`ModelCache` of the process. Declared on module level, such that it
+    can be sent to the workers.
+
+    :returns: The start index of the batch and the predictions of its waves.
+    """
+
+    paths, loader, waves, windowSize, start = arguments
+
+    model, parent = ModelCache.get(paths, loader)
+
+    waves = [ np.ascontiguousarray(wave, dtype = np.float64) for wave in waves ]
+
+    labels = np.zeros(len(waves), dtype = int)
+
+    indices = np.arange(len(waves))
+
+    _, prediction, _, _ = model.performance(parent, waves, labels, windowSize, indices)
+
+    return start, np.asarray(prediction)
@@ -30,17 +30,15 @@ class Massimi(Algorithm):
         """Make computations on epoch level
         """
 
-        def isEvent(peak):
+        negativePeaks = signal.getNegativePeaks(self.negativeHeight)
 
-            valley = signal.findValley(peak)
+        peaks, nCrossings, pCrossings, nextPeaks = signal.findValleys(negativePeaks)
 
-            if valley:
-                if valley.negativeToPositivePeak > self.negativeToPositivePeak:
-                    if  valley.separation >= self.separation * signal.samplingRate:
-                        return True
+        negativeToPositivePeak = signal.data[nextPeaks] - signal.data[peaks]
 
-            return False
+        separation = pCrossings - nCrossings
 
-        negativePeaks = signal.getNegativePeaks(self.negativeHeight)
+        isEvent = (negativeToPositivePeak > self.negativeToPositivePeak) & \
+            (separation >= self.separation * signal.samplingRate)
 
-        return list(filter(isEvent, negativePeaks))
+        return peaks[isEvent]
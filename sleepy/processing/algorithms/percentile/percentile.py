@@ -29,24 +29,12 @@ class Percentile(Algorithm):
 
     def compute(self, signal):
 
-        intervals = signal.findWaves()
-
-        def isEvent(interval):
-
-            currDuration = interval[1] - interval[0]
-
-            if self.durationLow * signal.samplingRate <= currDuration <= self.durationHigh * signal.samplingRate:
-
-                return True
-
-            return False
-
-        return np.array([interval for interval in intervals if isEvent(interval)])
+        return signal.findWavesInDuration(self.durationLow, self.durationHigh)
 
     def filter(self, events, data):
 
-        amplitudes = [ event.maxVoltage - event.minVoltage for event in events ]
+        amplitudes = events.amplitude
 
         amplitudeThreshold = np.percentile(amplitudes, 100 - self.percentile)
 
-        return [event for event in events if (event.maxVoltage - event.minVoltage) >= amplitudeThreshold ]
\ No newline at end of file
+        return amplitudes >= amplitudeThreshold
\ No newline at end of file
@@ -35,29 +35,16 @@ class Relative(Algorithm):
 
 	def compute(self, signal):
 
-		intervals = signal.findWaves()
-
-		def isEvent(interval):
-
-			currDuration = interval[1] - interval[0]
-
-			if self.durationLow * signal.samplingRate <= currDuration <= self.durationHigh * signal.samplingRate:
-						
-				return True
-			
-			return False
-
-		return np.array([ interval for interval in intervals if isEvent(interval) ])
+		return signal.findWavesInDuration(self.durationLow, self.durationHigh)
 
 	def filter(self, events, data):
 
-		amplitudes = [ event.maxVoltage - event.minVoltage for event in events ]
+		amplitudes = events.amplitude
 
 		amplitudeThreshold = np.mean(amplitudes) * self.scalingAmplitude
 
-		negAmplitudes = [ event.minVoltage for event in events ]
+		negAmplitudes = events.minVoltage
 
 		negThreshold = np.mean(negAmplitudes) * self.scalingNegPeak
 
-		return [ event for event in events if event.minVoltage <= negThreshold and \
-				(event.maxVoltage - event.minVoltage) >= amplitudeThreshold ]
+		return (negAmplitudes <= negThreshold) & (amplitudes >= amplitudeThreshold)
@@ -0,0 +1,85 @@
+from sleepy.processing.algorithms.BiLSTM.BiLSTM import BiLSTM
+from sleepy.processing.signal import Signal
+from sleepy.processing.engine import ComputationCancelled
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+
+class BiLSTMTest(unittest.TestCase):
+
+    def mockAlgorithm(batchSize):
+        """Creates a BiLSTM instance whose model predicts a wave to be an event
+        if its first sample is positive.
+        """
+
+        algorithm = BiLSTM()
+
+        algorithm.batchSize = batchSize
+
+        algorithm.BiLSTM_model = MagicMock()
+        algorithm.BiLSTM_model.predict_on_batch.side_effect = lambda batch: (batch[:,0] > 0).astype(float)
+
+        return algorithm
+
+    def test_predict_fixed_batch_size(self):
+        """The model is always called with batches of the configured size and
+        the predictions are returned in the order of the waves.
+        """
+
+        random = np.random.RandomState(0)
+
+        waves = random.normal(size = (25, 126, 1))
+
+        algorithm = BiLSTMTest.mockAlgorithm(10)
+
+        labels = algorithm.predict(waves)
+
+        self.assertEqual(labels.tolist(), (waves[:,0,0] > 0).tolist())
+
+        calls = algorithm.BiLSTM_model.predict_on_batch.call_args_list
+
+        self.assertEqual(len(calls), 3)
+
+        for call in calls:
+            self.assertEqual(call[0][0].shape, (10, 126, 1))
+
+    def test_predict_cancelled_between_batches(self):
+        """Predicting stops before the next batch once the monitor reports a
+        cancellation.
+        """
+
+        algorithm = BiLSTMTest.mockAlgorithm(10)
+
+        monitor = MagicMock()
+        monitor.check.side_effect = [None, ComputationCancelled]
+
+        with self.assertRaises(ComputationCancelled):
+            algorithm.predict(np.ones((25, 126, 1)), monitor)
+
+        self.assertEqual(algorithm.BiLSTM_model.predict_on_batch.call_count, 1)
+
+        monitor.advance.assert_called_once_with(10)
+
+    def test_computeAll_no_signals(self):
+        """No signals yield no results.
+        """
+
+        self.assertEqual(BiLSTMTest.mockAlgorithm(16).computeAll([]), [])
+
+    def test_computeAll_same_result_as_compute(self):
+        """Predicting the waves of all signals at once yields the same labels
+        as predicting each signal separately.
+        """
+
+        random = np.random.RandomState(0)
+
+        signals = [ Signal(random.normal(size = 1000), 100) for _ in range(5) ]
+
+        algorithm = BiLSTMTest.mockAlgorithm(16)
+
+        result = algorithm.computeAll(signals)
+
+        self.assertEqual(len(result), len(signals))
+
+        for signal, labels in zip(signals, result):
+            self.assertEqual(labels.tolist(), algorithm.compute(signal).tolist())
@@ -0,0 +1,57 @@
+from sleepy.processing.algorithms.cache import ModelCache
+import unittest
+from unittest.mock import MagicMock
+import tempfile
+import os
+
+class ModelCacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        ModelCache.clear()
+
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.path = os.path.join(self.directory.name, 'model.bin')
+
+        with open(self.path, 'w') as f:
+            f.write('model')
+
+    def tearDown(self):
+
+        ModelCache.clear()
+
+        self.directory.cleanup()
+
+    def test_loaded_once(self):
+        """Requesting the same model twice calls the loader only once and
+        returns the same instance.
+        """
+
+        loader = MagicMock(side_effect = lambda path: object())
+
+        first = ModelCache.get([self.path], loader)
+        second = ModelCache.get([self.path], loader)
+
+        self.assertIs(first, second)
+
+        loader.assert_called_once_with(self.path)
+
+    def test_reloaded_on_modification(self):
+        """Modifying a model file causes the model to be loaded again and
+        replaces the stale entry.
+        """
+
+        loader = MagicMock(side_effect = lambda path: object())
+
+        first = ModelCache.get([self.path], loader)
+
+        modified = os.path.getmtime(self.path) + 10
+        os.utime(self.path, (modified, modified))
+
+        second = ModelCache.get([self.path], loader)
+
+        self.assertIsNot(first, second)
+
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(len(ModelCache.models), 1)
@@ -0,0 +1,214 @@
+from sleepy.processing.algorithms.dtw1nn.DTW import DTW
+from sleepy.processing.algorithms.dtw1nn.LBKeogh import LBKeogh
+import unittest
+import numpy as np
+
+def fullMatrixDTW(Q, C, W):
+    """Reference implementation of the full cost matrix DTW, including its
+    boundary handling. Cells that are never written are infinite.
+    """
+
+    nq, nc = len(Q), len(C)
+    w = max(W, abs(nq - nc))
+    mq, mc = min(nq, 1 + w), min(nc, 1 + w)
+
+    D = np.full((nq + 1, nc + 1), np.inf)
+
+    D[0][0] = (Q[0] - C[0]) ** 2
+
+    for i in range(1, mq):
+        D[i][0] = D[i-1][0] + (Q[i] - C[0]) ** 2
+
+    if mq > 1:
+        D[mq - 1][0] = np.inf
+
+    for j in range(1, mc):
+        D[0][j] = D[0][j-1] + (Q[0] - C[j]) ** 2
+
+    if mc > 1:
+        D[0][mc - 1] = np.inf
+
+    for i in range(1, nq):
+        jStart = max(1, i - w)
+        jStop = min(nc, i + w + 1)
+
+        for j in range(jStart, jStop):
+            D[i][j] = (Q[i] - C[j]) ** 2 + min(D[i-1][j-1], D[i-1][j], D[i][j-1])
+
+        D[i][jStop] = np.inf
+        D[i+1][jStart] = np.inf
+
+    return D[nq - 1][nc - 1]
+
+def originalDTW(Q, C, W, D):
+    """Port of the kernel before the band rows, which wrote into a cost matrix
+    of 15000 x 15000 kept by the instance across calls. The recursion also
+    reads cells next to the band that are not written in the call, which
+    contain zero for a new instance and the values of earlier calls otherwise.
+
+    :param D: The cost matrix, modified in place.
+    """
+
+    nq, nc = len(Q), len(C)
+    w = max(W, abs(nq - nc))
+    mq, mc = min(nq, 1 + w), min(nc, 1 + w)
+
+    D[0][0] = (Q[0] - C[0]) ** 2
+
+    for i in range(1, mq):
+        D[i][0] = D[i-1][0] + (Q[i] - C[0]) ** 2
+
+    if i < nq:
+        D[i][0] = np.inf
+
+    for j in range(1, mc):
+        D[0][j] = D[0][j-1] + (Q[0] - C[j]) ** 2
+
+    if j < nc:
+        D[0][j] = np.inf
+
+    for i in range(1, nq):
+        jStart = max(1, i - w)
+        jStop = min(nc, i + w + 1)
+
+        for j in range(jStart, jStop):
+            D[i][j] = (Q[i] - C[j]) ** 2 + min(D[i-1][j-1], D[i-1][j], D[i][j-1])
+
+        if jStop < nc:
+            D[i][jStop] = np.inf
+
+        if i < nq - 1:
+            D[i+1][jStart] = np.inf
+
+    return D[nq - 1][nc - 1]
+
+def isSameDistance(a, b):
+    return np.isclose(a, b, rtol = 1e-12, atol = 0)
+
+class DTWTest(unittest.TestCase):
+
+    def test_dtw_matches_full_matrix(self):
+        """The band-limited kernel yields the same distances as the full cost
+        matrix for different lengths and warping windows.
+        """
+
+        random = np.random.RandomState(0)
+
+        dtw = DTW()
+
+        for _ in range(200):
+
+            nq, nc, W = random.randint(2, 40), random.randint(2, 40), random.randint(0, 50)
+
+            Q, C = random.normal(size = nq), random.normal(size = nc)
+
+            self.assertEqual(dtw.dtw(Q, C, W), fullMatrixDTW(Q, C, W))
+
+    def test_dtw_matches_original_kernel(self):
+        """The kernel yields the distances of the original kernel, up to
+        rounding, if the cells the original kernel does not write in a call
+        are infinite. Requires a warping window of at least one sample, the
+        classifier uses 119.
+        """
+
+        random = np.random.RandomState(0)
+
+        dtw = DTW()
+
+        for _ in range(500):
+
+            nq, nc, W = random.randint(2, 40), random.randint(2, 40), random.randint(1, 50)
+
+            Q, C = random.normal(size = nq), random.normal(size = nc)
+
+            self.assertTrue(isSameDistance(dtw.dtw(Q, C, W), originalDTW(Q, C, W, np.full((40, 40), np.inf))))
+
+    def test_dtw_original_kernel_difference(self):
+        """Accepted difference to the original kernel: its distances depend on
+        the cells left over from earlier calls. On one instance, as used by
+        the classifier, 15 of these 500 consecutive distances differ. On new
+        instances, where the left over cells are zero, 193 differ. The kernel
+        treats these cells as infinite, i.e. outside the warping window.
+        """
+
+        random = np.random.RandomState(0)
+
+        dtw = DTW()
+
+        D = np.zeros((40, 40))
+
+        reused, new = 0, 0
+
+        for _ in range(500):
+
+            nq, nc, W = random.randint(2, 40), random.randint(2, 40), random.randint(1, 50)
+
+            Q, C = random.normal(size = nq), random.normal(size = nc)
+
+            distance = dtw.dtw(Q, C, W)
+
+            reused += not isSameDistance(distance, originalDTW(Q, C, W, D))
+            new += not isSameDistance(distance, originalDTW(Q, C, W, np.zeros((40, 40))))
+
+        self.assertEqual((reused, new), (15, 193))
+
+    def test_dtw_identical_series(self):
+        """The distance of a time series to itself is zero.
+        """
+
+        Q = np.sin(np.linspace(0, 10, 100))
+
+        self.assertEqual(DTW().dtw(Q, Q, 10), 0)
+
+    def test_dtw_early_abandon(self):
+        """Abandoning yields the exact distance if it does not exceed the best
+        distance so far and infinity otherwise, computing fewer cells.
+        """
+
+        random = np.random.RandomState(1)
+
+        dtw = DTW()
+
+        for _ in range(200):
+
+            nq, nc, W = random.randint(2, 40), random.randint(2, 40), random.randint(0, 50)
+
+            Q, C = random.normal(size = nq), random.normal(size = nc)
+
+            distance = dtw.dtw(Q, C, W)
+            computations = dtw.distComputation
+
+            self.assertEqual(dtw.dtwEarlyAbandon(Q, C, W, distance), distance)
+            self.assertFalse(dtw.abandoned)
+
+            abandoned = dtw.dtwEarlyAbandon(Q, C, W, distance / 2)
+
+            if dtw.abandoned:
+                self.assertEqual(abandoned, np.inf)
+                self.assertLessEqual(dtw.distComputation, computations)
+            else:
+                self.assertEqual(abandoned, distance)
+
+    def test_lb_keogh_early_abandon(self):
+        """The cumulative lower bound stops once it exceeds the best distance
+        so far and is exact otherwise.
+        """
+
+        random = np.random.RandomState(2)
+
+        lbKeogh = LBKeogh()
+
+        Q, C = random.normal(size = 100), random.normal(size = 100)
+
+        wedge = lbKeogh.envelope(Q, 5)
+
+        bound = lbKeogh.compute(wedge, C)
+
+        self.assertEqual(lbKeogh.computeEarlyAbandon(wedge, C, bound), bound)
+        self.assertFalse(lbKeogh.abandoned)
+
+        partial = lbKeogh.computeEarlyAbandon(wedge, C, bound / 2)
+
+        self.assertTrue(lbKeogh.abandoned)
+        self.assertGreater(partial, bound / 2)
+        self.assertLess(lbKeogh.distComputation, 100)
@@ -0,0 +1,160 @@
+from sleepy.processing.algorithms.RandomForest.RandomForest import RandomForest
+from sleepy.processing.signal import Signal
+from sleepy.processing.engine import ComputationCancelled, Progress
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import subprocess
+import sys
+import os
+from sleepy import SLEEPY_ROOT_DIR
+
+HEAVY_MODULES = ['tensorflow', 'keras', 'numba', 'PyQt5']
+
+# Runs the RandomForest pipeline with a stand-in model in a fresh interpreter
+# and prints the heavy modules that have been imported
+PIPELINE_SCRIPT = """
+import sys
+import numpy as np
+from sleepy.processing.algorithms.RandomForest import RandomForest
+from sleepy.processing.signal import Signal
+
+class Model:
+    def predict(self, features):
+        return (features[:,2] > 1).astype(int)
+
+algorithm = RandomForest()
+algorithm.RF_model = Model()
+algorithm.computeAll([ Signal(np.random.normal(size = 1000), 100) for _ in range(5) ])
+
+print(','.join(module for module in {} if module in sys.modules))
+""".format(HEAVY_MODULES)
+
+# Imports the sub-packages before the package names in a fresh interpreter
+# and prints whether the names are classes
+EXPORT_SCRIPT = """
+import sleepy.processing.algorithms.BiLSTM.BiLSTM
+import sleepy.processing.algorithms.RandomForest.RandomForest
+from sleepy.processing.algorithms import BiLSTM, RandomForest
+
+print(isinstance(BiLSTM, type) and isinstance(RandomForest, type))
+"""
+
+class RandomForestTest(unittest.TestCase):
+
+    def test_computeAll_same_result_as_compute(self):
+        """Classifying the waves of all signals at once yields the same labels
+        as classifying each signal separately.
+        """
+
+        random = np.random.RandomState(0)
+
+        signals = [ Signal(random.normal(size = 1000), 100) for _ in range(5) ]
+
+        algorithm = RandomForest()
+
+        # Predicts a wave to be an event if its maximum is larger than one
+        algorithm.RF_model = MagicMock()
+        algorithm.RF_model.predict.side_effect = lambda features: (features[:,2] > 1).astype(int)
+
+        result = algorithm.computeAll(signals)
+
+        self.assertEqual(len(result), len(signals))
+        self.assertTrue(any(len(labels) > 0 for labels in result))
+
+        for signal, labels in zip(signals, result):
+            self.assertEqual(labels.tolist(), algorithm.compute(signal).tolist())
+
+    def test_computeAll_progress_per_batch(self):
+        """Classifying the waves of all signals at once advances the progress
+        after each batch, up to one step per signal.
+        """
+
+        random = np.random.RandomState(0)
+
+        signals = [ Signal(random.normal(size = 1000), 100) for _ in range(5) ]
+
+        algorithm = RandomForest()
+
+        algorithm.RF_model = MagicMock()
+        algorithm.RF_model.predict.side_effect = lambda features: (features[:,2] > 1).astype(int)
+
+        algorithm.batchSize = 10
+
+        reported = []
+
+        algorithm.computeAll(signals, monitor = Progress(lambda done, total: reported.append(done), None, len(signals)))
+
+        self.assertGreater(len(reported), 1)
+        self.assertEqual(reported, sorted(reported))
+        self.assertEqual(reported[-1], len(signals))
+
+    def test_predict_batches(self):
+        """Classifying in batches yields the labels of a single prediction and
+        stops before the next batch once the monitor reports a cancellation.
+        """
+
+        random = np.random.RandomState(0)
+
+        waves = random.normal(size = (25, 126))
+
+        algorithm = RandomForest()
+
+        algorithm.RF_model = MagicMock()
+        algorithm.RF_model.predict.side_effect = lambda features: (features[:,2] > 2).astype(int)
+
+        expected = algorithm.predict(waves)
+
+        algorithm.batchSize = 10
+
+        self.assertEqual(algorithm.predict(waves).tolist(), expected.tolist())
+        self.assertTrue(any(expected))
+
+        monitor = MagicMock()
+        monitor.check.side_effect = [None, ComputationCancelled]
+
+        algorithm.RF_model.predict.reset_mock()
+
+        with self.assertRaises(ComputationCancelled):
+            algorithm.predict(waves, monitor)
+
+        self.assertEqual(algorithm.RF_model.predict.call_count, 1)
+
+        monitor.advance.assert_called_once_with(10)
+
+    def test_package_exports_classes(self):
+        """The algorithms package exports the algorithm classes, not the
+        sub-packages of the same name.
+        """
+
+        from sleepy.processing.algorithms import BiLSTM, RandomForest, DTW1NN
+
+        self.assertTrue(all(isinstance(a, type) for a in [BiLSTM, RandomForest, DTW1NN]))
+
+    def test_package_exports_classes_fresh_interpreter(self):
+        """The algorithms package exports the algorithm classes although the
+        sub-packages of the same name are imported first.
+        """
+
+        environment = dict(os.environ, PYTHONPATH = os.path.dirname(SLEEPY_ROOT_DIR))
+
+        output = subprocess.check_output(
+            [sys.executable, '-c', EXPORT_SCRIPT],
+            env = environment
+        )
+
+        self.assertEqual(output.decode().strip(), 'True')
+
+    def test_pipeline_without_heavy_modules(self):
+        """Importing and running the RandomForest pipeline neither imports
+        TensorFlow or Keras nor numba or Qt.
+        """
+
+        environment = dict(os.environ, PYTHONPATH = os.path.dirname(SLEEPY_ROOT_DIR))
+
+        output = subprocess.check_output(
+            [sys.executable, '-c', PIPELINE_SCRIPT],
+            env = environment
+        )
+
+        self.assertEqual(output.decode().strip(), '')
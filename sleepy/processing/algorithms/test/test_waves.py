@@ -0,0 +1,73 @@
+from sleepy.processing.algorithms.waves import concatenateWaves, resampleAndPad
+from sleepy.processing.signal import Signal
+import unittest
+import numpy as np
+
+def referenceResampleAndPad(waves, resamplingRate, length):
+    """Resamples each wave with np.interp and pads it like Keras'
+    pad_sequences with padding='post' and truncating='pre'.
+    """
+
+    result = np.zeros((len(waves), length))
+
+    for row, wave in enumerate(waves):
+
+        resampled = np.interp(np.arange(0, len(wave), resamplingRate), np.arange(0, len(wave)), wave)[-length:]
+
+        result[row,:len(resampled)] = resampled
+
+    return result
+
+class WavesTest(unittest.TestCase):
+
+    def test_resampleAndPad_matches_interp(self):
+        """Resampling and padding a ragged batch yields the same matrix as
+        interpolating and padding each wave separately, including waves that
+        are longer than the target length.
+        """
+
+        random = np.random.RandomState(0)
+
+        data = random.normal(size = 20000)
+
+        starts = random.randint(0, 15000, size = 300)
+        stops = starts + random.randint(1, 4000, size = 300)
+
+        waves = [ data[start:stop] for start, stop in zip(starts, stops) ]
+
+        for samplingRate in [50, 100, 256, 333.3, 1000]:
+
+            resamplingRate = samplingRate / 50
+
+            result = resampleAndPad(data, starts, stops, resamplingRate)
+
+            np.testing.assert_array_equal(result, referenceResampleAndPad(waves, resamplingRate, 126))
+
+    def test_resampleAndPad_no_waves(self):
+        """No waves yield an empty matrix of the target length.
+        """
+
+        self.assertEqual(resampleAndPad(np.ones(5), [], [], 2).shape, (0, 126))
+
+    def test_concatenateWaves(self):
+        """The waves of several signals are mapped into one buffer.
+        """
+
+        signals = [ Signal(np.arange(5.), 100), Signal(np.arange(10., 13.), 100) ]
+
+        intervals = [ np.array([[1, 3], [2, 5]]), np.array([[0, 2]]) ]
+
+        data, starts, stops = concatenateWaves(signals, intervals)
+
+        self.assertEqual(
+            [ data[start:stop].tolist() for start, stop in zip(starts, stops) ],
+            [ [1., 2.], [2., 3., 4.], [10., 11.] ]
+        )
+
+    def test_concatenateWaves_no_signals(self):
+        """No signals yield an empty buffer and no waves.
+        """
+
+        data, starts, stops = concatenateWaves([], [])
+
+        self.assertEqual((len(data), len(starts), len(stops)), (0, 0, 0))
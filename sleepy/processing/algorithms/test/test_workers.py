@@ -0,0 +1,97 @@
+from sleepy.processing.algorithms.dtw1nn.workers import classifyWaves
+from sleepy.processing.engine import ComputationCancelled
+from unittest.mock import MagicMock
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import unittest
+import tempfile
+import os
+import numpy as np
+
+class MockModel:
+    """Picklable stand-in for the classifier that predicts a wave to be an
+    event if its first sample is positive.
+    """
+
+    def performance(self, parent, waves, labels, windowSize, indices):
+
+        prediction = np.array([ int(wave[0] > 0) for wave in waves ])
+
+        return 0, prediction, labels, indices
+
+def loadMockModel(path):
+    return MockModel(), None
+
+
+class WorkersTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.path = os.path.join(self.directory.name, 'model.bin')
+
+        with open(self.path, 'w') as f:
+            f.write('model')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_predictions_keyed_by_index(self):
+        """The predictions are returned in the order of the waves, regardless
+        of the batch size and of the executor the batches are classified on.
+        """
+
+        random = np.random.RandomState(0)
+
+        waves = [ random.normal(size = random.randint(1, 10)) for _ in range(100) ]
+
+        expected = [ int(wave[0] > 0) for wave in waves ]
+
+        with ThreadPoolExecutor(2) as threads, ProcessPoolExecutor(2) as processes:
+
+            for executor in [None, threads, processes]:
+                for batchSize in [1, 7, 200]:
+
+                    predictions = classifyWaves([self.path], loadMockModel, waves, 10, batchSize, executor)
+
+                    self.assertEqual(predictions.tolist(), expected)
+
+    def test_no_processes_without_executor(self):
+        """Without an executor, the waves are classified in the calling process
+        and no worker processes are started.
+        """
+
+        predictions = classifyWaves([self.path], loadMockModel, [np.ones(3), -np.ones(3)], 10, 1)
+
+        self.assertEqual(predictions.tolist(), [1, 0])
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_cancelled_between_batches(self):
+        """The classification stops before the next batch is collected once
+        the monitor reports a cancellation, serially and on an executor.
+        """
+
+        waves = [ np.ones(3) ] * 10
+
+        with ThreadPoolExecutor(1) as threads:
+
+            for executor in [None, threads]:
+
+                monitor = MagicMock()
+                monitor.check.side_effect = [None, ComputationCancelled]
+
+                with self.assertRaises(ComputationCancelled):
+                    classifyWaves([self.path], loadMockModel, waves, 10, 2, executor, monitor)
+
+                self.assertEqual(monitor.check.call_count, 2)
+
+                monitor.advance.assert_called_once_with(2)
+
+    def test_no_waves(self):
+        """Classifying no waves returns an empty array.
+        """
+
+        predictions = classifyWaves([self.path], loadMockModel, [], 10, 1)
+
+        self.assertEqual(len(predictions), 0)
@@ -0,0 +1,89 @@
+import numpy as np
+
+def concatenateWaves(signals, intervals):
+    """Concatenates the data of several signals into one buffer and maps the
+    intervals of the waves in each signal into this buffer.
+
+    :param signals: List of :class:`Signal` instances.
+
+    :param intervals: List with an (N,2) array of wave intervals per signal.
+
+    :returns: A tuple of the buffer and the start and stop of each wave in it,
+    ordered by signal and interval. All are empty if there are no signals.
+    """
+
+    if len(signals) == 0:
+        return np.zeros(0), np.zeros(0, dtype = np.int64), np.zeros(0, dtype = np.int64)
+
+    data = np.concatenate([ np.asarray(signal.data, dtype = np.float64) for signal in signals ])
+
+    offsets = np.cumsum([0] + [ len(signal.data) for signal in signals[:-1] ])
+
+    bounds = [
+        np.reshape(signalIntervals, (-1, 2)) + offset
+            for signalIntervals, offset in zip(intervals, offsets)
+    ]
+
+    bounds = np.concatenate(bounds).astype(np.int64) if bounds else np.zeros((0, 2), dtype = np.int64)
+
+    return data, bounds[:,0], bounds[:,1]
+
+def resampleAndPad(data, starts, stops, resamplingRate, length = 126):
+    """Resamples a ragged batch of waves by linear interpolation and pads them
+    to a common length, in one vectorized pass over all waves.
+    Each wave data[start:stop] is sampled at the positions 0, resamplingRate,
+    2 * resamplingRate, ... below its length. Waves with more samples keep
+    their last samples, shorter waves are padded with zeros at the end. The
+    result equals np.interp per wave followed by Keras' pad_sequences with
+    padding='post' and the default truncating='pre'.
+
+    :param data: One-dimensional buffer containing the waves.
+
+    :param starts: Start of each wave in the buffer.
+
+    :param stops: Stop (exclusive) of each wave in the buffer.
+
+    :param resamplingRate: Distance of the resampled positions in samples.
+
+    :param length: Number of samples of each resampled wave.
+
+    :returns: Array of shape (N, length).
+    """
+
+    data = np.asarray(data, dtype = np.float64)
+    starts = np.asarray(starts, dtype = np.int64)
+    waveLengths = np.asarray(stops, dtype = np.int64) - starts
+
+    result = np.zeros((len(starts), length), dtype = np.float64)
+
+    if len(starts) == 0:
+        return result
+
+    # Number of resampled positions of each wave, as in np.arange
+    counts = np.ceil(waveLengths / resamplingRate).astype(np.int64)
+
+    # Positions that are cut off at the beginning of long waves
+    skipped = np.maximum(counts - length, 0)
+
+    columns = np.arange(length)
+
+    valid = columns < np.minimum(counts, length)[:,None]
+
+    positions = ( columns + skipped[:,None] ) * resamplingRate
+
+    left = np.minimum(np.floor(positions).astype(np.int64), waveLengths[:,None] - 1)
+    right = np.minimum(left + 1, waveLengths[:,None] - 1)
+
+    fraction = positions - left
+
+    leftValues = data[np.where(valid, starts[:,None] + left, 0)]
+    rightValues = data[np.where(valid, starts[:,None] + right, 0)]
+
+    values = ( rightValues - leftValues ) * fraction + leftValues
+
+    # Positions beyond the last sample take its value
+    values = np.where(left == right, leftValues, values)
+
+    result[valid] = values[valid]
+
+    return result
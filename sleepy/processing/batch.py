@@ -0,0 +1,354 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sleepy.processing.engine import Engine
+from sleepy.processing.mat.core import MatDataset
+from sleepy.processing.registry import SUPPORTED_ALGORITHMS, SUPPORTED_FILTERS
+
+class Batch:
+    """Runs an algorithm and a filter on many .mat files without the GUI. The
+    files are distributed among a pool of worker processes, each of which
+    loads, computes and saves one file at a time. Algorithms that compute all
+    signals at once instead receive the pool, which is reused for all files,
+    while the files are processed one after another in this process.
+    """
+
+    def run(paths, algorithm, filter, output = None, sidecar = False, jobs = None, report = None, detectionRate = None):
+        """Processes a list of .mat files and reports each file as soon as it
+        has been processed.
+
+        :param paths: List of paths of .mat files.
+
+        :param algorithm: Tuple of a :class:`ProcessorEntry` and a dictionary
+        of parameters, or None.
+
+        :param filter: Tuple of a :class:`ProcessorEntry` and a dictionary of
+        parameters, or None.
+
+        :param output: Directory the processed files are written to. The files
+        are overwritten if None.
+
+        :param sidecar: Whether only the sleepy additions are written to a
+        sidecar file next to the output, instead of the entire file.
+
+        :param jobs: Number of worker processes, all processors if None. Files
+        are processed in this process without a pool if 1.
+
+        :param report: Optional function called with the result of each file.
+
+        :param detectionRate: Optional sampling rate the algorithm is run at,
+        see :meth:`Engine.run`.
+
+        :returns: A list with the result of each file, in the order the files
+        have been processed.
+        """
+
+        arguments = [ (path, algorithm, filter, output, sidecar, detectionRate) for path in paths ]
+
+        computingAll = algorithm is not None and hasattr(algorithm[0].processorClass, 'computeAll')
+
+        results = []
+
+        def collect(result):
+
+            results.append(result)
+
+            if report is not None:
+                report(result)
+
+        if jobs == 1:
+
+            for argument in arguments:
+                collect(processFile(*argument))
+
+            return results
+
+        with ProcessPoolExecutor(max_workers = jobs) as executor:
+
+            # The workers keep their models loaded between the files
+            if computingAll:
+
+                for argument in arguments:
+                    collect(processFile(*argument, executor = executor))
+
+                return results
+
+            futures = [ executor.submit(processFile, *argument) for argument in arguments ]
+
+            for future in as_completed(futures):
+                collect(future.result())
+
+        return results
+
+    def findFiles(patterns):
+        """Expands directories and glob patterns into a sorted list of .mat
+        files. Sidecar files are skipped.
+
+        :param patterns: List of paths of directories, files or glob patterns.
+        """
+
+        paths = []
+
+        for pattern in patterns:
+
+            if os.path.isdir(pattern):
+                pattern = os.path.join(pattern, '*.mat')
+
+            paths.extend(glob.glob(pattern))
+
+        return sorted({
+            path for path in paths
+                if os.path.isfile(path) and not path.endswith(MatDataset.sidecarSuffix)
+        })
+
+    def findEntry(entries, name):
+        """Finds a supported algorithm or filter by its name or by the name of
+        its class, ignoring the case.
+
+        :param entries: List of :class:`ProcessorEntry` instances.
+
+        :raises ValueError: No entry has the given name.
+        """
+
+        for entry in entries:
+
+            if name.lower() in (entry.name.lower(), entry.className.lower()):
+                return entry
+
+        raise ValueError(
+            "Unknown processor '{}', expected one of {}".format(
+                name,
+                ', '.join(entry.className for entry in entries)
+            )
+        )
+
+    def parseParameters(assignments):
+        """Parses parameters given as NAME=VALUE into a dictionary. The values
+        are converted by :meth:`Processor.setParameters`.
+
+        :raises ValueError: An assignment has no equals sign.
+        """
+
+        parameters = {}
+
+        for assignment in assignments or []:
+
+            name, separator, value = assignment.partition('=')
+
+            if not separator:
+                raise ValueError("Parameter '{}' is not of the form NAME=VALUE".format(assignment))
+
+            parameters[name.strip()] = value.strip()
+
+        return parameters
+
+    def describe(entries):
+        """Returns a description of the given algorithms or filters and their
+        parameters with default values. Uses the parameters recorded by the
+        entries, such that no processor is imported.
+        """
+
+        lines = []
+
+        for entry in entries:
+
+            lines.append("{} ({})".format(entry.className, entry.name))
+
+            for parameter in sorted(entry.parameters, key = lambda parameter: parameter.name):
+
+                lines.append("    {}={}  {}".format(parameter.name, parameter.default, parameter.title))
+
+        return '\n'.join(lines)
+
+def createProcessor(processor):
+    """Creates a processor from a tuple of a :class:`ProcessorEntry` and a
+    dictionary of parameters, None if no processor is given.
+    """
+
+    if processor is None:
+        return None
+
+    entry, parameters = processor
+
+    return entry.processorClass().setParameters(parameters)
+
+def processFile(path, algorithm, filter, output, sidecar, detectionRate = None, executor = None):
+    """Loads, computes and saves a single .mat file. Declared on module level,
+    such that it can be executed on a process pool. Errors are returned
+    instead of raised, such that a defective file does not stop the batch.
+
+    :param executor: Optional executor passed to :meth:`Engine.run`.
+
+    :returns: Dictionary with the path, the number of events and channels, the
+    time spent loading, computing and saving, and the error message if any.
+    """
+
+    result = { 'path' : path, 'error' : None }
+
+    try:
+
+        start = time.perf_counter()
+
+        dataset = MatDataset(MatDataset.load(path), path)
+
+        loaded = time.perf_counter()
+
+        events = Engine.run(
+            createProcessor(algorithm),
+            createProcessor(filter),
+            dataset,
+            detectionRate = detectionRate,
+            executor = executor,
+            lazy = True
+        )
+
+        computed = time.perf_counter()
+
+        target = path if output is None else os.path.join(output, os.path.basename(path))
+
+        # Keeps the stored tags if they still fit the labels, e.g. if only a
+        # filter is run, otherwise the computed labels are saved untagged
+        dataset.tags = dataset.constructTags(dataset.tags)
+
+        if sidecar:
+            dataset.saveSidecar(target)
+        else:
+            dataset.saveToDisk(target)
+
+        saved = time.perf_counter()
+
+    except Exception as exception:
+
+        result['error'] = "{}: {}".format(type(exception).__name__, exception)
+
+        return result
+
+    result['events'] = sum(len(channelEvents) for channelEvents in events)
+    result['channels'] = len(events)
+    result['load'] = loaded - start
+    result['compute'] = computed - loaded
+    result['save'] = saved - computed
+
+    return result
+
+def formatResult(result):
+    """Formats the result of a single file for the report.
+    """
+
+    if result['error'] is not None:
+        return "{}: failed, {}".format(result['path'], result['error'])
+
+    return "{}: {} events in {} channels, load {:.2f} s, compute {:.2f} s, save {:.2f} s".format(
+        result['path'],
+        result['events'],
+        result['channels'],
+        result['load'],
+        result['compute'],
+        result['save']
+    )
+
+def formatSummary(results, wallTime):
+    """Formats the summary of all files for the report.
+    """
+
+    succeeded = [ result for result in results if result['error'] is None ]
+
+    fileTime = sum(result['load'] + result['compute'] + result['save'] for result in succeeded)
+
+    return "{} of {} files processed, {} failed, {} events, {:.2f} s in total, {:.2f} s per file".format(
+        len(succeeded),
+        len(results),
+        len(results) - len(succeeded),
+        sum(result['events'] for result in succeeded),
+        wallTime,
+        fileTime / len(succeeded) if succeeded else 0
+    )
+
+def parseArguments(arguments):
+    """Parses the command line arguments.
+
+    :returns: The parser and the parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(
+        description = "Detects events in .mat files without the GUI."
+    )
+
+    parser.add_argument('paths', nargs = '*', help = "Directories, files or glob patterns of .mat files")
+    parser.add_argument('-a', '--algorithm', help = "Name or class name of the algorithm")
+    parser.add_argument('-p', '--parameter', action = 'append', metavar = 'NAME=VALUE', help = "Parameter of the algorithm, repeatable")
+    parser.add_argument('-f', '--filter', help = "Name or class name of the filter")
+    parser.add_argument('-q', '--filter-parameter', action = 'append', metavar = 'NAME=VALUE', help = "Parameter of the filter, repeatable")
+    parser.add_argument('-o', '--output', help = "Directory the results are written to, the files are overwritten otherwise")
+    parser.add_argument('-s', '--sidecar', action = 'store_true', help = "Write the results to a {} file next to each output instead of the entire file".format(MatDataset.sidecarSuffix))
+    parser.add_argument('-r', '--detection-rate', type = float, help = "Sampling rate in Hz the algorithm is run at, the filtered data is decimated accordingly")
+    parser.add_argument('-j', '--jobs', type = int, help = "Number of worker processes, defaults to the number of processors")
+    parser.add_argument('-l', '--list', action = 'store_true', help = "List the supported algorithms and filters with their parameters")
+
+    return parser, parser.parse_args(arguments)
+
+def main(arguments = None):
+    """Entry point of the command line interface.
+
+    :returns: The exit status, 1 if a file failed.
+    """
+
+    parser, arguments = parseArguments(arguments)
+
+    if arguments.list:
+
+        print("Algorithms:\n" + Batch.describe(SUPPORTED_ALGORITHMS))
+        print("Filters:\n" + Batch.describe(SUPPORTED_FILTERS))
+
+        return 0
+
+    if not arguments.algorithm and not arguments.filter:
+        parser.error("an algorithm or a filter is required")
+
+    try:
+
+        algorithm = filter = None
+
+        if arguments.algorithm:
+            algorithm = (Batch.findEntry(SUPPORTED_ALGORITHMS, arguments.algorithm), Batch.parseParameters(arguments.parameter))
+
+        if arguments.filter:
+            filter = (Batch.findEntry(SUPPORTED_FILTERS, arguments.filter), Batch.parseParameters(arguments.filter_parameter))
+
+        # Fails early on invalid parameters instead of once per file
+        createProcessor(algorithm)
+        createProcessor(filter)
+
+    except ValueError as exception:
+        parser.error(str(exception))
+
+    paths = Batch.findFiles(arguments.paths)
+
+    if not paths:
+        parser.error("no .mat files found")
+
+    if arguments.output is not None:
+        os.makedirs(arguments.output, exist_ok = True)
+
+    start = time.perf_counter()
+
+    results = Batch.run(
+        paths,
+        algorithm,
+        filter,
+        output = arguments.output,
+        sidecar = arguments.sidecar,
+        jobs = arguments.jobs,
+        detectionRate = arguments.detection_rate,
+        report = lambda result: print(formatResult(result), flush = True)
+    )
+
+    print(formatSummary(results, time.perf_counter() - start))
+
+    return int(any(result['error'] is not None for result in results))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,6 @@
 
 import numpy as np
-from sleepy.gui.tagging.model import DataSource
+from sleepy.gui.tagging.model import DataSource, LazyEvents
 
 class Dataset:
 
@@ -40,8 +40,15 @@ class Dataset:
 
     @epochs.setter
     def epochs(self, epochs):
+
         self._epochs = epochs
 
+        # The epoch index is built again from the new epochs
+        try:
+            del self._epochIndex
+        except AttributeError:
+            pass
+
     @property
     def data(self):
         return self._data
@@ -144,11 +151,27 @@ class Dataset:
     def checkpoint(self, checkpoint):
         self._checkpoint = checkpoint
 
+    @property
+    def provenance(self):
+        try:
+            return self._provenance
+        except AttributeError:
+            return None
+
+    @provenance.setter
+    def provenance(self, provenance):
+        self._provenance = provenance
+
     def save(self):
         """Call to the dataset to save its contents on disk.
         """
         pass
 
+    def export(self):
+        """Call to the dataset to write its entire contents to a new file.
+        """
+        pass
+
     def setChangesMadeFrom(self, result):
         """Sets changesMade to true if the result array is equal to the labels
         in the dataset.
@@ -185,6 +208,56 @@ class Dataset:
 
         return [ self.__forEachLabel(labels, channel, converter) for channel in range(numberOfChannels) ]
 
+    def forEachEpoch(self, labels, converter):
+        """Bulk counterpart of :meth:`forEachChannel`. Groups the labels of each
+        channel by the epoch they belong to and supplies the converter function
+        once for each group with the following arguments:
+
+        * Array (labelsInEpoch * samplesPerLabel) of the labels in the group
+        * Data source containing the data of the epoch
+
+        The converter function returns a list with one value per label.
+
+        :param labels: A np.array (channel * labelsPerEpoch) containing the labels.
+
+        :param converter: A function that respects the said format.
+
+        :returns: A list of lists with the value of each label, in the order of
+        the labels.
+
+        :raises ValueError: The labels of a channel have different lengths.
+        Raised before any data source is touched, such that the caller can
+        fall back to :meth:`forEachChannel`.
+        """
+
+        numberOfChannels = labels.shape[0]
+
+        rows = [ Dataset.getLabelRows(labels[channel]) for channel in range(numberOfChannels) ]
+
+        return [ self.__forEachGroup(rows[channel], channel, converter) for channel in range(numberOfChannels) ]
+
+    def getLazyEvents(self, labels, tags, converter):
+        """Lazy counterpart of :meth:`forEachEpoch`. Returns one
+        :class:`LazyEvents` instance per channel, which supplies the converter
+        with the label of an event and the data source of its epoch only once
+        the event is accessed.
+
+        :param labels: A np.array (channel * labelsPerEpoch) containing the labels.
+
+        :param tags: A np.array (channel * labelsPerEpoch) containing the tags.
+
+        :param converter: A function that respects the format of
+        :meth:`forEachEpoch`.
+
+        :returns: A list with one :class:`LazyEvents` instance per channel.
+
+        :raises ValueError: The labels of a channel have different lengths.
+        """
+
+        numberOfChannels = labels.shape[0]
+
+        return [ self.__getLazyChannel(labels[channel], tags[channel], channel, converter) for channel in range(numberOfChannels) ]
+
     def getDataSource(self, channel, label):
         """Returns a data source for a given channel and a given label.
         Extracts the first element from the label. The goal is to create one
@@ -207,13 +280,88 @@ class Dataset:
         if isinstance(label, np.ndarray):
             label = label[0]
 
-        epochIndex = self.__findIndexInInterval(label)
+        epochIndex = self.getEpochIndices([label])[0]
 
-        dataSource = self.__getBufferedDataSource(epochIndex, channel)
+        return self.__getLabelDataSource(epochIndex, channel, label)
 
-        dataSource.addLabel(label)
+    def getEpochIndices(self, labels):
+        """Maps labels to the indices of the epochs they belong to, in one
+        vectorized binary search over the epochs sorted by their start.
 
-        return dataSource
+        :param labels: Array of N labels, either points of shape (N,) or (N,1)
+        or intervals of shape (N,2) whose start determines the epoch.
+
+        :returns: Array of N epoch indices.
+
+        :raises IndexError: A label does not belong to any epoch.
+        """
+
+        points = Dataset.__getLabelPoints(labels)
+
+        order, starts, stops = self.__getEpochIndex()
+
+        positions = np.searchsorted(starts, points, side = 'right') - 1
+
+        outside = ( positions < 0 ) | ( points > stops[np.maximum(positions, 0)] )
+
+        if np.any(outside):
+            raise IndexError("Label {} does not belong to any epoch".format(points[outside][0]))
+
+        return order[positions]
+
+    def __getLabelPoints(labels):
+        """Returns the first sample of each label.
+        """
+
+        labels = np.asarray(labels)
+
+        if labels.dtype == object:
+            return np.array([ np.ravel(label)[0] for label in labels ])
+
+        if labels.ndim > 1:
+            return labels.reshape(len(labels), -1)[:,0]
+
+        return labels
+
+    def getLabelRows(labels):
+        """Returns the labels as an array with one row per label.
+
+        :raises ValueError: The labels have different lengths.
+        """
+
+        labels = np.asarray(labels)
+
+        if len(labels) == 0:
+            return labels.reshape(0, 1)
+
+        if labels.dtype == object:
+
+            if len({ np.size(label) for label in labels }) > 1:
+                raise ValueError("The labels have different lengths")
+
+            labels = np.array([ np.ravel(label) for label in labels ])
+
+        return labels.reshape(len(labels), -1)
+
+    def __getEpochIndex(self):
+        """Returns the order of the epochs sorted by their start and the sorted
+        starts and stops. Built once, since the epochs do not change.
+        """
+
+        try:
+            return self._epochIndex
+        except AttributeError:
+            pass
+
+        epochs = np.asarray(self.epochs)
+
+        # We assume the intervals to be non-overlapping and thus the stops
+        # are sorted as well
+        order = np.argsort(epochs[:,0], kind = 'stable')
+
+        self._epochIndex = (order, epochs[order,0], epochs[order,1])
+
+        return self._epochIndex
 
     def __forEachLabel(self, labels, channel, converter):
         """Supplies a set of parameters to a converter and returns
@@ -222,11 +370,13 @@ class Dataset:
 
         numberOfLabels = labels[channel].shape[0]
 
+        epochIndices = self.getEpochIndices(labels[channel]) if numberOfLabels else []
+
         def getObject(labelIndex):
 
             label = np.array([labels[channel][labelIndex]]).ravel()
 
-            dataSource = self.getDataSource(channel, label)
+            dataSource = self.__getLabelDataSource(epochIndices[labelIndex], channel, label[0])
 
             #tag = self.tags[channel][labelIndex]
 
@@ -234,26 +384,62 @@ class Dataset:
 
         return [ getObject(idx) for idx in range(numberOfLabels) ]
 
-    def __findIndexInInterval(self, point):
-        """Finds the epoch interval by index to which a given point belongs.
+    def __forEachGroup(self, rows, channel, converter):
+        """Supplies the converter with the labels of a channel, an array with
+        one row per label, grouped by their epoch and returns the results in
+        the order of the labels.
         """
 
-        startPoints = self.epochs[:,0]
-        endPoints = self.epochs[:,1]
+        if len(rows) == 0:
+            return []
 
-        startIndices = np.where(
-            startPoints <= point
-        )
+        epochIndices = self.getEpochIndices(rows)
 
-        endIndices = np.where(
-            endPoints >= point
-        )
+        order = np.argsort(epochIndices, kind = 'stable')
+
+        groups = np.split(order, np.flatnonzero(np.diff(epochIndices[order])) + 1)
+
+        results = [None] * len(rows)
+
+        for group in groups:
+
+            dataSource = self.__getBufferedDataSource(epochIndices[group[0]], channel)
+
+            dataSource.addLabels(rows[group,0])
+
+            for index, result in zip(group.tolist(), converter(rows[group], dataSource)):
+                results[index] = result
+
+        return results
+
+    def __getLazyChannel(self, labels, tags, channel, converter):
+        """Creates the :class:`LazyEvents` of a channel. The epoch of each label
+        is looked up once, the data source of an epoch is created when the
+        first of its events is accessed.
+        """
 
-        intersection = np.intersect1d(startIndices, endIndices)
+        rows = Dataset.getLabelRows(labels)
 
-        # We assume the intervals to be non-overlapping and thus
-        # it can only be one index match in both queries
-        return intersection[0]
+        epochIndices = self.getEpochIndices(rows[:,0])
+
+        def create(index):
+
+            dataSource = self.__getBufferedDataSource(epochIndices[index], channel)
+
+            return converter(rows[index:index+1], dataSource)[0]
+
+        return LazyEvents(rows, tags, create, self.samplingRate)
+
+    def __getLabelDataSource(self, epochIndex, channel, label):
+        """Returns the buffered data source of the epoch and registers the
+        label at it.
+        """
+
+        dataSource = self.__getBufferedDataSource(epochIndex, channel)
+
+        dataSource.addLabel(label)
+
+        return dataSource
 
     def __getBufferedDataSource(self, epochIndex, channel):
         """Checks the buffer if the data source for the epoch specified by
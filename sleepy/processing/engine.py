@@ -1,13 +1,16 @@
 
 import numpy as np
 from functools import partial
+from scipy.signal import decimate
 from sleepy.processing.signal import Signal
+from sleepy.processing.features import EventFeatures
+from sleepy.processing.dataset import Dataset
+from sleepy.processing.processor import Algorithm, describeProcessor
 from sleepy.gui.tagging.model.event import EventTypeNotSupported, PointEvent, IntervalEvent
-from sleepy.test.debug import tracing
 
 class Engine:
 
-    def run(algorithm, filter, dataset, settings = None):
+    def run(algorithm, filter, dataset, settings = None, executor = None, progress = None, token = None, detectionRate = None, lazy = False):
         """Executes an algorithm and a filter on a dataset. The execution follows
         a pipeline concept. The algorithm first gets called with the entire data
         and produces a set of parameters. Then every epoch in every channel is
@@ -19,37 +22,115 @@ class Engine:
         methods extract, compute and filter. Extracts receives the entire data
         and returns a set of parameters. These parameters are plugged into
         compute which is called for each signal in every epoch and every channel.
-        The results are aggregated and filtered in the filter method.
+        The results are aggregated and filtered in the filter method. The filter
+        method receives an :class:`EventFeatures` instance, which can be used
+        like the list of events but also provides array-backed features of the
+        events, and returns either the surviving events or a boolean keep-mask
+        with one entry per event. Instead of compute, an algorithm may implement
+        computeAll, which receives the extract parameters and the signals of all
+        epochs and channels at once and returns one result per signal. This
+        allows algorithms to batch work across the whole recording.
 
         :param filter: Filter object. Must support a call via the
-        filter-method.
+        filter-method. A filter may additionally implement filterAll, which
+        receives an array of epochs of channels of samples and filters along
+        the last axis. It is called once for all epochs if they have the same
+        length and once per epoch otherwise, without using the executor. If a
+        filter implements filterContinuous and its continuous attribute is set,
+        epochs that are contiguous according to the epochs of the dataset are
+        filtered as one recording instead. filterContinuous receives a list of
+        contiguous epochs, each channels by samples, and returns the list of
+        filtered epochs.
 
         :param dataset: Data-set object that provides the properties data,
         samplingRate and epochs.
 
         :param settings: Optional parameter that is passed to all created events.
 
+        :param executor: Optional instance of :class:`concurrent.futures.Executor`.
+        If supplied, the filter and compute calls of every epoch in every channel
+        are fanned out on this executor instead of being executed serially. Use a
+        thread pool for algorithms whose work is done in NumPy/SciPy and a process
+        pool for pure-Python algorithms. In the latter case algorithm and filter
+        must be picklable. The results are reassembled in channel/epoch order and
+        are identical to the serial execution. Algorithms implementing computeAll
+        are called once and receive the executor as keyword argument instead,
+        such that they can distribute their work on it. Without an executor,
+        computeAll does all its work in the calling process. computeAll also
+        receives the keyword argument monitor, a :class:`Progress` whose check
+        method it calls between batches to stop once cancelled. computeAll
+        advances the monitor by one step per signal, e.g. in shares of the
+        waves of all signals via :meth:`Progress.share`.
+
+        :param progress: Optional function that is called with the number of
+        processed signals and the total number of signals to process, after
+        each epoch in each channel has been filtered or computed.
+
+        :param token: Optional :class:`CancellationToken`. The computation is
+        cancelled before the next signal is processed once the token has been
+        cancelled. The dataset may be partially processed in that case.
+
+        :param detectionRate: Optional sampling rate in Hz the algorithm is run
+        at. The filtered data is decimated by the largest integer factor that
+        keeps the sampling rate at or above the detection rate, after applying
+        an anti-aliasing filter. The labels are mapped back to samples at the
+        sampling rate of the dataset, such that the stored labels and the
+        events are unaffected apart from the reduced temporal resolution.
+
+        :param lazy: Whether the events of each channel are returned as
+        :class:`LazyEvents`, which create an event only once it is accessed.
+        The events are not created at all unless the algorithm implements a
+        filter step, which works on events, or points and intervals are mixed
+        within a channel. Events created for the filter step are released
+        afterwards.
+
         :returns: A list of navigators, one for each channel.
+
+        :raises ComputationCancelled: The token has been cancelled.
         """
 
+        steps = int(bool(filter)) + int(bool(algorithm))
+
+        monitor = Progress(progress, token, steps * Engine.__countSignals(dataset))
+
         if filter:
-            Engine.__applyPreFilter(filter, dataset)
+            Engine.__applyPreFilter(filter, dataset, executor, monitor)
 
         labels = dataset.labels
 
         if algorithm:
-            computing = Engine.__getComputeMethod(algorithm, dataset.filteredData)
+            detection = Engine.__getDetectionData(dataset, detectionRate)
 
-            labels = Engine.__computeStep(computing, dataset)
+            computing = Engine.__getComputeMethod(algorithm, detection[0])
 
-        events = Engine.__getEvents(dataset, labels, settings)
+            if hasattr(algorithm, 'computeAll'):
+                labels = Engine.__computeAllStep(computing, dataset, detection, executor, monitor)
+            else:
+                labels = Engine.__computeStep(computing, dataset, detection, executor, monitor)
 
-        if algorithm:
-            events = Engine.__filterStep(algorithm, events, dataset)
+        monitor.check()
+
+        if not ( lazy and Engine.__storeLabels(dataset, labels, algorithm) ):
 
-        Engine.__setLabelsFromEvents(dataset, events)
+            events = Engine.__getEvents(dataset, labels, settings)
 
-        Engine.__setTagsFromDataset(events, dataset)
+            if algorithm:
+                events = Engine.__filterStep(algorithm, events, dataset)
+
+            Engine.__setLabelsFromEvents(dataset, events)
+
+            Engine.__setTagsFromDataset(events, dataset)
+
+        if lazy:
+
+            try:
+                events = Engine.__getLazyEvents(dataset, settings)
+            except ValueError:
+                # Points and intervals are mixed within a channel, thus the
+                # events have been created and are kept
+                pass
+
+        Engine.__setProvenance(dataset, algorithm, filter, detectionRate)
 
         return events
 
@@ -73,85 +154,332 @@ class Engine:
 
         return np.array(result)
 
-    def __applyPreFilter(filter, dataset):
+    def filterData(filter, dataset, executor = None):
+        """Filters the data of a dataset like the filter step of :meth:`run`,
+        without handing the result to the dataset.
+
+        :param filter: Filter object, see :meth:`run`.
+
+        :param dataset: Data-set object that provides the properties data,
+        samplingRate and epochs.
+
+        :param executor: Optional executor, see :meth:`run`.
+
+        :returns: The filtered data, epoch by channel by samples.
+        """
+
+        monitor = Progress(total = Engine.__countSignals(dataset))
+
+        return Engine.__preFilter(filter, dataset, range(len(dataset.data)), executor, monitor)
+
+    def __countSignals(dataset):
+        """Returns the number of signals, i.e. epochs times channels, in the
+        dataset.
+        """
+
+        return sum(len(epoch) for epoch in dataset.data)
+
+    def __applyPreFilter(filter, dataset, executor, monitor):
         """Applies a given filter to a given dataset and hands the result to
         the dataset in the appropriate format (channel by epoch).
         """
 
         epochs = range(len(dataset.data))
 
-        filteredData = Engine.__preFilter(filter, dataset, epochs)
+        filteredData = Engine.__preFilter(filter, dataset, epochs, executor, monitor)
 
         dataset.filteredData = filteredData
 
-    def __preFilter(filter, dataset, epochs):
+    def __preFilter(filter, dataset, epochs, executor, monitor):
         """Filters the entire dataset for the extract step.
         """
 
-        numberOfEpochs = len(epochs)
+        # Looked up on the class, such that only implemented methods count
+        if getattr(type(filter), 'filterContinuous', None) is not None and filter.continuous:
+            return Engine.__preFilterContinuous(filter, dataset, epochs, monitor)
+
+        if getattr(type(filter), 'filterAll', None) is not None:
+            return Engine.__preFilterAll(filter, dataset, epochs, monitor)
+
+        data = dataset.data
+
+        signals = [ data[epoch][channel] for epoch in epochs for channel in range(len(data[epoch])) ]
+
+        filtered = iter(Engine.__map(
+            executor,
+            monitor,
+            filter.filter,
+            signals,
+            [dataset.samplingRate] * len(signals)
+        ))
 
         filteredData = [
-            np.array([
-                filter.filter(dataset.data[epoch][channel], dataset.samplingRate)
-                    for channel in range(len(dataset.data[epoch]))
-            ])
+            np.array([ next(filtered) for channel in range(len(data[epoch])) ])
                 for epoch in epochs
         ]
 
         return np.array(filteredData)
 
+    def __preFilterAll(filter, dataset, epochs, monitor):
+        """Filters the entire dataset with the filterAll method of the filter,
+        in a single call if all epochs have the same shape.
+        """
+
+        data = dataset.data
+
+        if len({ np.shape(data[epoch]) for epoch in epochs }) == 1:
+
+            monitor.check()
+
+            filteredData = filter.filterAll(
+                np.stack([ data[epoch] for epoch in epochs ]),
+                dataset.samplingRate
+            )
+
+            monitor.advance(sum(len(data[epoch]) for epoch in epochs))
+
+            return filteredData
+
+        filteredData = []
+
+        for epoch in epochs:
+
+            monitor.check()
+
+            filteredData.append(filter.filterAll(np.asarray(data[epoch])[None], dataset.samplingRate)[0])
+
+            monitor.advance(len(data[epoch]))
+
+        return Engine.__combineEpochs(filteredData)
+
+    def __preFilterContinuous(filter, dataset, epochs, monitor):
+        """Filters each run of contiguous epochs with the filterContinuous
+        method of the filter.
+        """
+
+        data = dataset.data
+
+        filteredData = []
+
+        for run in Engine.__getContiguousRuns(dataset.epochs, list(epochs)):
+
+            monitor.check()
+
+            filteredData.extend(filter.filterContinuous(
+                [ np.asarray(data[epoch]) for epoch in run ],
+                dataset.samplingRate
+            ))
+
+            monitor.advance(sum(len(data[epoch]) for epoch in run))
+
+        return Engine.__combineEpochs(filteredData)
+
+    def __getContiguousRuns(intervals, epochs):
+        """Splits the epochs into runs of epochs where each epoch starts with
+        the sample following the last sample of its predecessor.
+
+        :param intervals: Array with the first and the last sample of each
+        epoch, as in the epochs of a dataset.
+
+        :param epochs: Sorted list of the indices of the epochs.
+
+        :returns: List of runs, each a list of indices of epochs.
+        """
+
+        if not epochs:
+            return []
+
+        starts = np.asarray(intervals)[epochs,0]
+        stops = np.asarray(intervals)[epochs,1]
+
+        breaks = np.flatnonzero(starts[1:] != stops[:-1] + 1) + 1
+
+        return [ run.tolist() for run in np.split(np.asarray(epochs), breaks) ]
+
+    def __combineEpochs(epochs):
+        """Combines a list of epochs into an array of epochs, which is an array
+        of objects if the epochs differ in shape, like the data.
+        """
+
+        if len({ np.shape(epoch) for epoch in epochs }) <= 1:
+            return np.array(epochs)
+
+        combined = np.empty(len(epochs), dtype = object)
+
+        for index, epoch in enumerate(epochs):
+            combined[index] = epoch
+
+        return combined
+
+    def __getDetectionData(dataset, detectionRate):
+        """Returns the data the algorithm is run on, its sampling rate and the
+        factor the filtered data has been decimated by to obtain it.
+        """
+
+        factor = 1 if detectionRate is None else int(dataset.samplingRate // detectionRate)
+
+        if factor <= 1:
+            return dataset.filteredData, dataset.samplingRate, 1
+
+        return Engine.__decimate(dataset.filteredData, factor), dataset.samplingRate / factor, factor
+
+    def __decimate(data, factor):
+        """Decimates every channel of every epoch by the given factor, with a
+        zero-phase FIR anti-aliasing filter, such that the samples are not
+        shifted in time. All epochs are decimated at once if their shapes
+        match.
+        """
+
+        if len({ np.shape(epoch) for epoch in data }) == 1:
+            return decimate(np.stack([ epoch for epoch in data ]), factor, ftype = 'fir', axis = -1)
+
+        return Engine.__combineEpochs([
+            decimate(np.asarray(epoch), factor, ftype = 'fir', axis = -1) for epoch in data
+        ])
+
     def __getComputeMethod(algorithm, data):
         """Executes the extract step and attaches the parameters to the compute
-        method of the algorithm.
+        method of the algorithm, or to its computeAll method if implemented.
         """
 
+        compute = getattr(algorithm, 'computeAll', None) or algorithm.compute
+
         extractParameters = algorithm.extract(data)
 
         if extractParameters is not None:
 
             if isinstance(extractParameters, tuple):
 
-                return partial(algorithm.compute, *extractParameters)
+                return partial(compute, *extractParameters)
 
             else:
 
-                return partial(algorithm.compute, extractParameters)
+                return partial(compute, extractParameters)
 
         else:
 
-            return algorithm.compute
+            return compute
 
-    def __computeStep(computing, dataset):
+    def __computeStep(computing, dataset, detection, executor, monitor):
         """Performs the compute step for each signal in the filtered dataset.
         Converts the resulting, aggregated labels into event instances and
         returns these.
         """
 
-        compute = partial(Engine.__compute, computing, dataset.samplingRate)
+        data, samplingRate, factor = detection
+
+        compute = partial(computeSignal, computing, samplingRate, factor = factor)
+
+        signals, starts = Engine.__getSignalData(data, dataset)
+
+        computed = Engine.__map(executor, monitor, compute, signals, starts)
+
+        return Engine.__arrangeLabels(computed, dataset)
+
+    def __computeAllStep(computingAll, dataset, detection, executor, monitor):
+        """Performs the compute step for all signals in the filtered dataset
+        with a single call, such that the algorithm can batch its work across
+        epochs and channels.
+        """
+
+        data, samplingRate, factor = detection
+
+        signals, starts = Engine.__getSignalData(data, dataset)
+
+        monitor.check()
+
+        computed = computingAll([
+            Signal(signal, samplingRate) for signal in signals
+        ], executor = executor, monitor = monitor)
+
+        if len(computed) != len(signals):
+            raise ValueError("computeAll must return one result per signal.")
+
+        computed = [
+            shiftLabels(labels, epochStart, factor)
+                for labels, epochStart in zip(computed, starts)
+        ]
+
+        return Engine.__arrangeLabels(computed, dataset)
+
+    def __getSignalData(data, dataset):
+        """Returns the data of every channel in every epoch, ordered by epoch
+        and channel, together with the start of the respective epoch in the
+        dataset.
+        """
+
+        epochStarts = dataset.epochs[:,0]
 
-        epochs = range(len(dataset.filteredData))
+        signals, starts = [], []
+
+        for epoch in range(len(data)):
+            for channel in range(len(data[epoch])):
+
+                signals.append(data[epoch][channel])
+                starts.append(epochStarts[epoch])
+
+        return signals, starts
+
+    def __arrangeLabels(computed, dataset):
+        """Arranges the labels computed for the signals returned by
+        __getSignalData channel-wise, concatenating the labels of all epochs.
+        """
+
+        filteredData = dataset.filteredData
+
+        computed = iter(computed)
 
         labels = [
-            [
-                compute(dataset.filteredData[epoch][channel], dataset.epochs[epoch][0])
-                    for channel in range(len(dataset.filteredData[epoch]))
-            ]
-            for epoch in epochs
+            [ next(computed) for channel in range(len(filteredData[epoch])) ]
+                for epoch in range(len(filteredData))
         ]
 
         return Engine.__format(
             Engine.__transposeFirstTwoDimensions(np.array(labels))
         )
 
-    def __compute(computing, samplingRate, data, epochStart):
-        """Computes the result of a signal applied to a given algorithm.
+    def __map(executor, monitor, function, *iterables):
+        """Applies a function to every item of the given iterables, either
+        serially or on the executor if one is supplied. The results are returned
+        as a list in the order of the input. Reports each result to the monitor
+        and stops once the computation has been cancelled, in which case the
+        pending calls on the executor are cancelled too.
         """
 
-        signal = Signal(data, samplingRate)
+        if executor is None:
+
+            results = []
+
+            for arguments in zip(*iterables):
+
+                monitor.check()
+
+                results.append(function(*arguments))
 
-        labels = computing(signal)
+                monitor.advance()
 
-        return ( labels + epochStart ).astype(np.int32).tolist()
+            return results
+
+        futures = [ executor.submit(function, *arguments) for arguments in zip(*iterables) ]
+
+        try:
+
+            results = []
+
+            for future in futures:
+
+                monitor.check()
+
+                results.append(future.result())
+
+                monitor.advance()
+
+            return results
+
+        finally:
+
+            for future in futures:
+                future.cancel()
 
     def __filterStep(algorithm, events, dataset):
         """Performs the filter step. The algorithm is supplied with the events
@@ -162,17 +490,60 @@ class Engine:
 
         allEvents = np.concatenate(events)
 
-        filteredEvents = algorithm.filter(allEvents, dataset.filteredData)
+        features = Engine.__getFeatures(allEvents, events, dataset)
+
+        filteredEvents = algorithm.filter(features, dataset.filteredData)
 
-        Engine.__handleRemovedEvents(allEvents, filteredEvents)
+        keep = Engine.__getKeepMask(allEvents, filteredEvents)
+
+        Engine.__handleRemovedEvents(allEvents, keep)
+
+        offsets = np.cumsum([0] + [ len(channelEvents) for channelEvents in events ])
 
         return [
             [
-                event for event in channelEvents if event in filteredEvents
+                event for event, kept in zip(channelEvents, keep[start:stop]) if kept
             ]
-            for channelEvents in events
+            for channelEvents, start, stop in zip(events, offsets[:-1], offsets[1:])
         ]
 
+    def __getFeatures(allEvents, events, dataset):
+        """Creates the :class:`EventFeatures` handed to the filter step. The
+        channel of each event is given by the events array, the epoch is found
+        by the start of the epoch interval of the event's data source.
+        """
+
+        channels = np.repeat(
+            np.arange(len(events)),
+            [ len(channelEvents) for channelEvents in events ]
+        )
+
+        epochStarts = [ event.epochInterval[0] for event in allEvents ]
+
+        epochs = np.searchsorted(dataset.epochs[:,0], epochStarts)
+
+        return EventFeatures(allEvents, channels, epochs)
+
+    def __getKeepMask(allEvents, filteredEvents):
+        """Converts the result of the filter method of an algorithm into a
+        boolean mask over all events. The filter method may either return a
+        boolean mask of the same length as the events or the list of events
+        that survive the filter step. In the latter case, the surviving events
+        are identified by their identity, which keeps the step linear in the
+        number of events.
+        """
+
+        if isinstance(filteredEvents, np.ndarray) and filteredEvents.dtype == bool:
+
+            if filteredEvents.shape != (len(allEvents),):
+                raise ValueError("The keep-mask must have one entry per event.")
+
+            return filteredEvents
+
+        survivors = set(map(id, filteredEvents))
+
+        return np.array([ id(event) in survivors for event in allEvents ], dtype = bool)
+
     def __setLabelsFromEvents(dataset, events):
         """Extracts the labels from an array of events and sets the resulting
         array as the new labels of the dataset.
@@ -187,28 +558,100 @@ class Engine:
 
         dataset.labels = np.array(labels)
 
+    def __storeLabels(dataset, labels, algorithm):
+        """Sets the labels as the new labels of the dataset in the format of
+        :meth:`__setLabelsFromEvents`, without creating events. This is not
+        possible if the algorithm implements a filter step or if a channel
+        mixes points and intervals.
+
+        :returns: Whether the labels have been set.
+        """
+
+        if algorithm and Engine.__hasFilterStep(algorithm):
+            return False
+
+        channelLabels = []
+
+        for channel in range(labels.shape[0]):
+
+            try:
+                rows = Dataset.getLabelRows(labels[channel])
+            except ValueError:
+                return False
+
+            if rows.shape[1] == 1:
+                channelLabels.append(rows[:,0])
+            elif rows.shape[1] == 2:
+                channelLabels.append(rows)
+            else:
+                return False
+
+        dataset.labels = np.array(channelLabels)
+
+        return True
+
+    def __hasFilterStep(algorithm):
+        """Checks whether the algorithm overrides the filter method, which
+        otherwise keeps all events.
+        """
+
+        # Looked up on the class, such that only implemented methods count
+        return getattr(type(algorithm), 'filter', None) is not Algorithm.filter
+
+    def __getLazyEvents(dataset, settings):
+        """Creates the lazy events of each channel from the labels and the
+        tags of the dataset.
+
+        :raises ValueError: The labels of a channel have different lengths.
+        """
+
+        lazyEvents = dataset.getLazyEvents(dataset.labels, dataset.tags, partial(Engine.__createEvents, settings))
+
+        # Releases the events created for the filter step, which are
+        # registered at the data sources
+        dataset.dataSources = {}
+
+        return lazyEvents
+
+    def __setProvenance(dataset, algorithm, filter, detectionRate):
+        """Records the filter and the algorithm that have been executed together
+        with their parameters in the dataset. Entries of processors that have
+        not been executed are kept, since their results are kept too.
+        """
+
+        provenance = dict(dataset.provenance or {})
+
+        if filter:
+            provenance['filter'] = describeProcessor(filter)
+
+        if algorithm:
+            provenance['algorithm'] = describeProcessor(algorithm)
+            provenance['detectionRate'] = detectionRate
+
+        dataset.provenance = provenance
+
     def __setTagsFromDataset(events, dataset):
         """Sets the tags of the dataset to the corresponding events
         """
 
-        for channel in range(len(dataset.tags)):
+        # The tags are constructed on each access
+        tags = dataset.tags
 
-            for label in range(len(dataset.tags[channel])):
+        for channel in range(len(tags)):
 
-                if dataset.tags[channel][label] == 1:
+            for label in np.flatnonzero(np.asarray(tags[channel]) == 1):
 
-                    events[channel][label].switchTag()
+                events[channel][label].switchTag()
 
-    def __handleRemovedEvents(allEvents, filteredEvents):
-        """Calculates the diff of the input arrays and calls the onRemove method
-        for each event that has been removed by the algorithm.
+    def __handleRemovedEvents(allEvents, keep):
+        """Calls the onRemove method for each event that has been removed by
+        the algorithm, i.e. whose entry in the keep-mask is False.
         """
 
-        removedEvents = [ event for event in allEvents if event not in filteredEvents]
-
-        for event in removedEvents:
+        for event, kept in zip(allEvents, keep):
 
-            event.onRemove()
+            if not kept:
+                event.onRemove()
 
     def __transposeFirstTwoDimensions(array):
         """Transposes the first two dimensions of a given array
@@ -225,13 +668,31 @@ class Engine:
 
     def __getEvents(dataset, labels, settings):
         """Creates events from a fully computed dataset (labels, tags, filteredData).
-        Labels are stored in the dataset channel-wise. Calls a creator function
-        for each label, appending the settings object.
+        Labels are stored in the dataset channel-wise. The labels of each epoch
+        are converted at once, sharing the data source of the epoch. Falls back
+        to calling a creator function for each label, appending the settings
+        object, if points and intervals are mixed within a channel.
         """
 
-        createEvents = partial(Engine.__createEvent, settings)
+        try:
+            events = dataset.forEachEpoch(labels, partial(Engine.__createEvents, settings))
+        except ValueError:
+            events = dataset.forEachChannel(labels, partial(Engine.__createEvent, settings))
+
+        return np.array(events)
+
+    def __createEvents(settings, labels, dataSource):
+        """Creates the events from the labels of an epoch, an array with one
+        row per label, and the data source of the epoch.
+        """
+
+        if labels.shape[1] == 1:
+            return [ PointEvent(point, dataSource, settings) for point in labels[:,0] ]
+
+        if labels.shape[1] == 2:
+            return [ IntervalEvent(start, stop, dataSource, settings) for start, stop in labels ]
 
-        return np.array(dataset.forEachChannel(labels, createEvents))
+        raise EventTypeNotSupported
 
     def __createEvent(settings, label, dataSource):
         """Creates an event from a given label, and a given data source.
@@ -263,3 +724,132 @@ class Engine:
         """
 
         return label.shape == (2,)
+
+class ComputationCancelled(Exception):
+    pass
+
+class CancellationToken:
+    """Token handed to :class:`Engine.run` to cancel a running computation from
+    another thread.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        """Requests the cancellation of the computation.
+        """
+
+        self.cancelled = True
+
+class Progress:
+    """Reports the progress of a computation to an optional callback and checks
+    an optional cancellation token.
+    """
+
+    def __init__(self, callback = None, token = None, total = 0):
+        """
+        :param callback: Function called with the number of processed signals
+        and the total number of signals.
+
+        :param token: Instance of :class:`CancellationToken`.
+
+        :param total: The total number of signals to process.
+        """
+
+        self.callback = callback
+        self.token = token
+        self.total = total
+        self.done = 0
+
+    def advance(self, steps = 1):
+        """Marks a number of signals as processed and reports the progress.
+        """
+
+        self.done += steps
+
+        if self.callback is not None:
+            self.callback(self.done, self.total)
+
+    def check(self):
+        """Raises :class:`ComputationCancelled` if the token has been cancelled.
+        """
+
+        if self.token is not None and self.token.cancelled:
+            raise ComputationCancelled
+
+    def share(self, steps, parts):
+        """Splits a number of steps into smaller parts, e.g. the signals that
+        are computed at once into their waves, such that the progress moves
+        while the parts are processed.
+
+        :param steps: The number of steps of this progress, e.g. signals.
+
+        :param parts: The number of parts the steps are split into. The steps
+        are marked as processed at once if there are no parts.
+
+        :returns: A :class:`ProgressShare` advanced by parts.
+        """
+
+        share = ProgressShare(self, steps, parts)
+
+        if parts == 0:
+            self.advance(steps)
+
+        return share
+
+class ProgressShare:
+    """Part of a :class:`Progress` that is advanced in smaller parts than the
+    steps of the progress. The progress is advanced by the whole steps the
+    processed parts amount to.
+    """
+
+    def __init__(self, progress, steps, parts):
+
+        self.progress = progress
+        self.steps = steps
+        self.parts = parts
+        self.done = 0
+        self.reported = 0
+
+    def advance(self, parts = 1):
+        """Marks a number of parts as processed and advances the progress by
+        the steps completed since.
+        """
+
+        self.done += parts
+
+        steps = self.steps * self.done // self.parts
+
+        if steps > self.reported:
+
+            self.progress.advance(steps - self.reported)
+
+            self.reported = steps
+
+    def check(self):
+        """Raises :class:`ComputationCancelled` if the progress has been
+        cancelled.
+        """
+
+        self.progress.check()
+
+def computeSignal(computing, samplingRate, data, epochStart, factor = 1):
+    """Computes the result of a signal applied to a given algorithm. Declared
+    on module level, such that it can be pickled when the compute step is
+    executed on a process pool.
+    """
+
+    signal = Signal(data, samplingRate)
+
+    labels = computing(signal)
+
+    return shiftLabels(labels, epochStart, factor)
+
+def shiftLabels(labels, epochStart, factor = 1):
+    """Shifts labels computed relative to an epoch by the start of the epoch.
+    Labels computed on data decimated by a factor are scaled by the factor
+    first, mapping them to the samples of the original data.
+    """
+
+    return ( np.asarray(labels) * factor + epochStart ).astype(np.int32).tolist()
@@ -0,0 +1,153 @@
+import numpy as np
+
+class EventFeatures:
+    """Column-oriented view on the events that are handed to the filter step
+    of an algorithm. Each feature is an array with one entry per event, such
+    that thresholds and percentiles can be computed as single vectorized
+    operations. The voltages are computed on the filtered data of each event's
+    epoch with one segmented reduction per data source. All columns are
+    computed lazily on first access.
+    Iterating, indexing and measuring the length of an instance falls back to
+    the underlying events, so filter implementations working on a list of
+    events remain supported.
+    """
+
+    def __init__(self, events, channels, epochs):
+        """
+        :param events: Array of events, as concatenated by the engine.
+
+        :param channels: Array containing the channel index of each event.
+
+        :param epochs: Array containing the epoch index of each event.
+        """
+
+        self.events = events
+        self.channel = np.asarray(channels, dtype = int)
+        self.epoch = np.asarray(epochs, dtype = int)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __getitem__(self, index):
+        return self.events[index]
+
+    @property
+    def start(self):
+        """Start of each event in samples. Equals stop for point events.
+        """
+
+        try:
+            return self._start
+        except AttributeError:
+
+            self.__collectLabels()
+
+            return self._start
+
+    @property
+    def stop(self):
+        """Stop of each event in samples. Equals start for point events.
+        """
+
+        try:
+            return self._stop
+        except AttributeError:
+
+            self.__collectLabels()
+
+            return self._stop
+
+    @property
+    def duration(self):
+        """Duration of each event in samples.
+        """
+
+        return self.stop - self.start
+
+    @property
+    def minVoltage(self):
+        """Minimum of the filtered data in each event's interval.
+        """
+
+        try:
+            return self._minVoltage
+        except AttributeError:
+
+            self.__computeVoltages()
+
+            return self._minVoltage
+
+    @property
+    def maxVoltage(self):
+        """Maximum of the filtered data in each event's interval.
+        """
+
+        try:
+            return self._maxVoltage
+        except AttributeError:
+
+            self.__computeVoltages()
+
+            return self._maxVoltage
+
+    @property
+    def amplitude(self):
+        """Peak-to-peak amplitude of the filtered data in each event's interval.
+        """
+
+        return self.maxVoltage - self.minVoltage
+
+    def __collectLabels(self):
+        """Extracts start and stop of every event from its label in a single
+        pass over the events.
+        """
+
+        labels = [ np.ravel(event.label) for event in self.events ]
+
+        self._start = np.array([ label[0] for label in labels ], dtype = np.int64)
+        self._stop = np.array([ label[-1] for label in labels ], dtype = np.int64)
+
+    def __computeVoltages(self):
+        """Computes minimum and maximum voltage of all events. Events sharing
+        a data source are reduced together via reduceat on the epoch's filtered
+        data. The interval of an event is half-open, like the slices used by
+        :class:`IntervalEvent`, whereas a point event reduces to its sample.
+        """
+
+        self._minVoltage = np.zeros(len(self.events))
+        self._maxVoltage = np.zeros(len(self.events))
+
+        for dataSource, indices in self.__groupByDataSource().items():
+
+            data = np.asarray(dataSource.epochFiltered)
+
+            # reduceat requires every index to be valid, hence the padding
+            padded = np.append(data, data[-1])
+
+            epochStart = dataSource.epochInterval[0]
+
+            starts = np.clip(self.start[indices] - epochStart, 0, len(data) - 1)
+            stops = np.clip(self.stop[indices] - epochStart, 0, len(data))
+
+            # Reduces over [start, stop) at even positions. If start >= stop,
+            # reduceat yields the element at start.
+            bounds = np.column_stack([starts, stops]).ravel()
+
+            self._minVoltage[indices] = np.minimum.reduceat(padded, bounds)[::2]
+            self._maxVoltage[indices] = np.maximum.reduceat(padded, bounds)[::2]
+
+    def __groupByDataSource(self):
+        """Returns a dictionary mapping each data source to the indices of the
+        events that refer to it.
+        """
+
+        groups = {}
+
+        for index, event in enumerate(self.events):
+
+            groups.setdefault(event.dataSource, []).append(index)
+
+        return { dataSource : np.array(indices) for dataSource, indices in groups.items() }
@@ -1,7 +1,9 @@
 
 from sleepy.processing.processor import Filter
 from sleepy.processing.parameter import Parameter
-from scipy.signal import butter, filtfilt
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
+from functools import lru_cache
+import numpy as np
 
 class BandPassFilter(Filter):
 
@@ -27,17 +29,135 @@ class BandPassFilter(Filter):
             default = 2
         )
 
+        self.continuous = Parameter(
+            title = "Filter contiguous epochs as one recording",
+            fieldType = bool,
+            default = False
+        )
+
     # Implements:
     # https://stackoverflow.com/questions/12093594/how-to-implement-band-pass-butterworth-filter-with-scipy-signal-butter
     def filter(self, data, samplingRate):
+        """Filters the data forwards and backwards along its last axis, thus
+        a single signal as well as an array of channels or of epochs of
+        channels can be filtered at once.
+        """
+
+        sos = self.getDesign(samplingRate)
+
+        return sosfiltfilt(sos, data, axis = -1, padlen = self.getPadLength())
+
+    def filterAll(self, data, samplingRate):
+        """Filters an array of epochs of channels in a single call, see
+        :meth:`Engine.run`.
+        """
+
+        return self.filter(data, samplingRate)
+
+    def filterContinuous(self, epochs, samplingRate):
+        """Filters consecutive epochs forwards and backwards as one continuous
+        recording, such that no transients occur at the boundaries between the
+        epochs. The result equals filtering the concatenated epochs, yet the
+        epochs are never concatenated. Instead, each pass filters one epoch
+        after another and carries the state of the filter over to the next
+        epoch. Only the ends of the recording are extended like in filter.
+
+        :param epochs: List of consecutive epochs, each an array of channels of
+        samples.
+
+        :param samplingRate: The sampling rate of the epochs.
+
+        :returns: List of the filtered epochs.
+        """
+
+        sos = self.getDesign(samplingRate)
+
+        padlen = self.getPadLength()
+
+        # Odd extensions of the beginning and the end of the recording, the
+        # samples of the end are taken in reverse order
+        head = leadingSamples(epochs, padlen + 1)
+        tail = leadingSamples([ epoch[...,::-1] for epoch in reversed(epochs) ], padlen + 1)
+
+        chunks = [ 2 * head[...,:1] - head[...,:0:-1] ] + list(epochs) + [ 2 * tail[...,:1] - tail[...,1:] ]
+
+        forward = filterChunks(sos, chunks)
+
+        backward = filterChunks(sos, [ chunk[...,::-1] for chunk in reversed(forward) ])
+
+        return [ chunk[...,::-1] for chunk in reversed(backward) ][1:-1]
+
+    def getDesign(self, samplingRate):
+        """Returns the cached design of the filter for the current parameters.
+        """
 
-        b, a = butter(
-            self.order,
-            [
-                self.lowCutFrequency / (0.5 * samplingRate),
-                self.highCutFrequency / (0.5 * samplingRate)
-            ],
-            btype = "bandpass"
+        return design(
+            int(self.order),
+            float(self.lowCutFrequency),
+            float(self.highCutFrequency),
+            float(samplingRate)
         )
 
-        return filtfilt(b, a, data)
+    def getPadLength(self):
+        """Returns the number of samples each end of a signal is extended by,
+        as much as filtfilt with the coefficients of the same order.
+        """
+
+        return 3 * (2 * int(self.order) + 1)
+
+def leadingSamples(epochs, count):
+    """Returns the first samples of consecutive epochs, which may span more
+    than one epoch.
+    """
+
+    samples = []
+
+    for epoch in epochs:
+
+        samples.append(epoch[...,:count - sum(part.shape[-1] for part in samples)])
+
+        if sum(part.shape[-1] for part in samples) == count:
+            break
+
+    return np.concatenate(samples, axis = -1)
+
+def filterChunks(sos, chunks):
+    """Filters consecutive chunks of a signal along their last axis in one
+    direction, carrying the state of the filter from one chunk to the next.
+    The initial state is the steady state for the first sample, as in
+    sosfiltfilt.
+    """
+
+    first = chunks[0][...,0]
+
+    state = sosfilt_zi(sos).reshape((len(sos),) + (1,) * first.ndim + (2,)) * first[...,None]
+
+    filtered = []
+
+    for chunk in chunks:
+
+        result, state = sosfilt(sos, chunk, axis = -1, zi = state)
+
+        filtered.append(result)
+
+    return filtered
+
+@lru_cache(maxsize = 32)
+def design(order, lowCutFrequency, highCutFrequency, samplingRate):
+    """Designs the butterworth bandpass as second-order sections, which remain
+    numerically stable for cut-off frequencies that are low compared to the
+    sampling rate. The design is cached, since it only depends on the
+    parameters and the sampling rate.
+
+    :returns: Array of second-order sections, shared by all callers.
+    """
+
+    return butter(
+        order,
+        [
+            lowCutFrequency / (0.5 * samplingRate),
+            highCutFrequency / (0.5 * samplingRate)
+        ],
+        btype = "bandpass",
+        output = "sos"
+    )
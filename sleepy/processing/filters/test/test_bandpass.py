@@ -0,0 +1,86 @@
+from sleepy.processing.filters.bandpass.core import BandPassFilter, design
+from scipy.signal import butter, filtfilt
+import unittest
+import numpy as np
+
+class BandPassFilterTest(unittest.TestCase):
+
+    def standardScenario():
+        """Bandpass filter with the default parameters and an array of three
+        epochs of two channels of a random walk.
+        """
+
+        filter = BandPassFilter().setParameters()
+
+        data = np.cumsum(np.random.RandomState(0).normal(size = (3, 2, 2000)), axis = 2)
+
+        return filter, data
+
+    def test_filter_same_result_as_filtfilt(self):
+        """Filtering with second-order sections yields the result of filtfilt
+        with the transfer function coefficients.
+        """
+
+        filter, data = BandPassFilterTest.standardScenario()
+
+        filter.lowCutFrequency = 1.0
+        filter.highCutFrequency = 10.0
+
+        b, a = butter(2, [1.0 / 50, 10.0 / 50], btype = "bandpass")
+
+        np.testing.assert_allclose(filter.filter(data[0,0], 100), filtfilt(b, a, data[0,0]), atol = 1e-9)
+
+    def test_filterAll_same_result_as_filter(self):
+        """Filtering all epochs and channels at once yields the same result as
+        filtering each signal separately.
+        """
+
+        filter, data = BandPassFilterTest.standardScenario()
+
+        filtered = filter.filterAll(data, 100)
+
+        for epoch in range(len(data)):
+            for channel in range(len(data[epoch])):
+                np.testing.assert_allclose(filtered[epoch,channel], filter.filter(data[epoch,channel], 100))
+
+    def test_design_cached(self):
+        """The filter design is computed once per set of parameters and sampling
+        rate, also for a sampling rate given as a 0-d array as loaded from a
+        .mat file.
+        """
+
+        filter, data = BandPassFilterTest.standardScenario()
+
+        filter.order = 3
+
+        design.cache_clear()
+
+        filter.filter(data[0,0], np.array(100.0))
+        filter.filter(data[0,1], 100)
+        filter.filter(data[0,1], 200)
+
+        self.assertEqual(design.cache_info().misses, 2)
+        self.assertEqual(design.cache_info().hits, 1)
+
+    def test_filterContinuous_same_result_as_concatenated(self):
+        """Filtering consecutive epochs as one recording yields the result of
+        filtering the concatenated epochs, also if the epochs are shorter than
+        the extension at the ends of the recording.
+        """
+
+        filter, data = BandPassFilterTest.standardScenario()
+
+        filter.lowCutFrequency = 0.5
+        filter.highCutFrequency = 4.0
+
+        epochs = [ data[0,:,:500], data[1,:,:3], data[2,:,:20], data[0,:,500:900] ]
+
+        filtered = filter.filterContinuous(epochs, 100)
+
+        self.assertEqual([ epoch.shape for epoch in filtered ], [ epoch.shape for epoch in epochs ])
+
+        np.testing.assert_allclose(
+            np.concatenate(filtered, axis = -1),
+            filter.filter(np.concatenate(epochs, axis = -1), 100),
+            atol = 1e-9
+        )
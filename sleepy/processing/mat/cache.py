@@ -0,0 +1,279 @@
+from sleepy.processing.mat.core import MatDataset
+from scipy.io import savemat
+from scipy.io.matlab import MatReadError
+import numpy as np
+import glob
+import hashlib
+import json
+import os
+
+class MatCache:
+    """Cache of a .mat file in a directory next to it, from which the trials
+    are memory-mapped instead of being read into memory. The .mat file is
+    converted once, the cache is rebuilt if the .mat file is modified or if
+    it cannot be read, e.g. since it is incomplete or corrupt. The fields that
+    are not mapped are stored in a .mat file as well, and the mapped arrays
+    are loaded without pickle, such that reading a cache never executes code
+    like reading the .mat file itself.
+    """
+
+    suffix = '.sleepy-cache'
+
+    # Epoch arrays that are memory-mapped, all other fields are loaded
+    mappedFields = ['trial', 'sleepy_filteredData']
+
+    def getDirectory(path):
+        """Returns the directory of the cache that belongs to the .mat file at
+        the given path.
+        """
+
+        return os.path.splitext(path)[0] + MatCache.suffix
+
+    def load(path):
+        """Loads the raw data of the .mat file at the given path with the trials
+        memory-mapped from the cache and merges the sidecar into it, see
+        :meth:`MatDataset.load`.
+
+        :param path: Location of the .mat file.
+
+        :returns: The raw data as returned by :meth:`MatDataset.load`.
+        """
+
+        raw = MatCache.loadRecording(path)
+
+        MatDataset.mergeSidecar(raw, path)
+
+        return raw
+
+    def loadRecording(path):
+        """Loads the raw data of the .mat file at the given path with the trials
+        memory-mapped from the cache, without the sidecar. Builds the cache if
+        it does not exist, is outdated or cannot be read. Falls back to loading the .mat
+        file into memory if the cache cannot be written, e.g. in a read-only
+        directory.
+        """
+
+        directory = MatCache.getDirectory(path)
+
+        try:
+            return MatCache.read(path, directory)
+        except (OSError, KeyError, ValueError, TypeError, IndexError, MatReadError):
+            pass
+
+        raw = MatDataset.loadRecording(path)
+
+        try:
+            MatCache.write(path, raw, directory)
+        except OSError:
+            return raw
+
+        return MatCache.read(path, directory)
+
+    def getStamp(path):
+        """Identifies the state of a file by its size and modification time.
+        """
+
+        status = os.stat(path)
+
+        return np.array([status.st_size, status.st_mtime_ns])
+
+    def read(path, directory):
+        """Reads the raw data from the cache.
+
+        :raises OSError: The cache does not exist.
+
+        :raises ValueError: The cache is outdated.
+
+        :raises MatReadError: The fields are incomplete or corrupt.
+        """
+
+        raw = MatDataset.importData(os.path.join(directory, 'fields.mat'))
+
+        if not np.array_equal(raw.pop('sleepy_cache_stamp'), MatCache.getStamp(path)):
+            raise ValueError("The cache of {} is outdated".format(path))
+
+        for key in MatCache.mappedFields:
+
+            offsets = raw.pop('sleepy_cache_offsets_' + key, None)
+
+            if offsets is not None:
+                raw[key] = MatCache.readEpochs(os.path.join(directory, key + '.npy'), offsets)
+
+        return raw
+
+    def write(path, raw, directory):
+        """Writes the raw data to the cache. The epochs of each mapped field are
+        written into an array of their own. The remaining fields are written
+        last, such that an incomplete cache is never read. Filtered data of an
+        earlier version of the .mat file is removed.
+
+        :raises OSError: The cache cannot be written.
+        """
+
+        os.makedirs(directory, exist_ok = True)
+
+        MatCache.removeFilteredData(directory)
+
+        fields = {}
+
+        for key, value in raw.items():
+
+            if key in MatCache.mappedFields:
+                fields['sleepy_cache_offsets_' + key] = MatCache.writeEpochs(os.path.join(directory, key + '.npy'), value)
+            else:
+                fields[key] = value
+
+        fields['sleepy_cache_stamp'] = MatCache.getStamp(path)
+
+        fieldsPath = os.path.join(directory, 'fields.mat')
+
+        savemat(fieldsPath + '.tmp', {'data' : fields}, appendmat = False, long_field_names = True)
+
+        os.replace(fieldsPath + '.tmp', fieldsPath)
+
+        # Fields of earlier versions, which were pickled
+        if os.path.exists(os.path.join(directory, 'fields.npz')):
+            os.remove(os.path.join(directory, 'fields.npz'))
+
+    def getFilteredPath(path, description):
+        """Returns the path in the cache of the .mat file at the given path
+        under which the data filtered by the described filter is stored. The
+        name is derived from the content it depends on, i.e. the state of the
+        .mat file and the filter with its parameters.
+
+        :param description: Description of the filter as created by
+        :func:`describeProcessor`.
+
+        :raises OSError: The .mat file does not exist.
+        """
+
+        content = json.dumps([MatCache.getStamp(path).tolist(), description], sort_keys = True, default = str)
+
+        key = hashlib.sha1(content.encode()).hexdigest()
+
+        return os.path.join(MatCache.getDirectory(path), 'filtered-' + key + '.npy')
+
+    def removeFilteredData(directory, keep = None):
+        """Removes the filtered data stored in the cache in the given
+        directory, except for the file at the path keep. Files that cannot be
+        removed, e.g. since they are still mapped on Windows, are left behind
+        and removed the next time.
+        """
+
+        for filteredPath in glob.glob(os.path.join(directory, 'filtered-*.npy')):
+
+            if keep is not None and os.path.abspath(filteredPath) == os.path.abspath(keep):
+                continue
+
+            try:
+                os.remove(filteredPath)
+            except OSError:
+                pass
+
+    def readEpochs(filePath, offsets):
+        """Memory-maps epochs written by :meth:`writeEpochs`.
+
+        :raises OSError: The file does not exist.
+
+        :raises ValueError: The file does not contain the given epochs.
+        """
+
+        mapped = np.load(filePath, mmap_mode = 'r')
+
+        if mapped.shape[-1] != offsets[-1]:
+            raise ValueError("{} does not contain the expected epochs".format(filePath))
+
+        return MatCache.split(mapped, offsets)
+
+    def writeEpochs(filePath, epochs):
+        """Writes epochs one after another into one array, concatenated along
+        their last axis. The array is written to a temporary file first, such
+        that an incomplete file is never read.
+
+        :raises OSError: The file cannot be written.
+
+        :returns: The offsets of the epochs along the last axis.
+        """
+
+        epochs = [ np.asarray(epoch) for epoch in np.atleast_1d(epochs) ]
+
+        offsets = np.cumsum([0] + [ epoch.shape[-1] for epoch in epochs ])
+
+        temporaryPath = filePath + '.tmp'
+
+        mapped = np.lib.format.open_memmap(
+            temporaryPath,
+            mode = 'w+',
+            dtype = np.result_type(*epochs),
+            shape = epochs[0].shape[:-1] + (offsets[-1],)
+        )
+
+        for epoch, start, stop in zip(epochs, offsets[:-1], offsets[1:]):
+            mapped[...,start:stop] = epoch
+
+        mapped.flush()
+
+        del mapped
+
+        os.replace(temporaryPath, filePath)
+
+        return offsets
+
+    def split(mapped, offsets):
+        """Splits the concatenated epochs into an array of views, one for each
+        epoch.
+        """
+
+        epochs = np.empty(len(offsets) - 1, dtype = object)
+
+        for index, (start, stop) in enumerate(zip(offsets[:-1], offsets[1:])):
+            epochs[index] = mapped[...,start:stop]
+
+        return epochs
+
+class MappedMatDataset(MatDataset):
+    """:class:`MatDataset` that memory-maps the trials from a :class:`MatCache`,
+    such that a recording is not held in memory while it is processed.
+    """
+
+    def load(path):
+        return MatCache.load(path)
+
+    def regenerateFilteredData(self):
+        """Memory-maps the filtered data from the cache. On first access, the
+        data is filtered and written to the cache, unless the cache cannot be
+        written. Only the data of the current filter is kept, since each file
+        is as large as the recording.
+        """
+
+        description = (self.provenance or {}).get('filter')
+
+        if description is None:
+            return super().regenerateFilteredData()
+
+        try:
+            filePath = MatCache.getFilteredPath(self.path, description)
+        except OSError:
+            return super().regenerateFilteredData()
+
+        offsets = np.cumsum([0] + [ epoch.shape[-1] for epoch in self.data ])
+
+        try:
+            return MatCache.readEpochs(filePath, offsets)
+        except (OSError, ValueError):
+            pass
+
+        filteredData = super().regenerateFilteredData()
+
+        # The unfiltered data is not cached as filtered data
+        if self.filteredDataError is not None:
+            return filteredData
+
+        try:
+            MatCache.writeEpochs(filePath, filteredData)
+        except OSError:
+            return filteredData
+
+        MatCache.removeFilteredData(os.path.dirname(filePath), keep = filePath)
+
+        return MatCache.readEpochs(filePath, offsets)
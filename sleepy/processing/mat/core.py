@@ -1,7 +1,12 @@
 
 from sleepy.processing.dataset import Dataset
+from sleepy.processing.engine import Engine
+from sleepy.processing.processor import restoreProcessor
 from scipy.io import loadmat, savemat
 import numpy as np
+import json
+import os
+import warnings
 
 class MatDataset(Dataset):
     """Implements the :class:`Dataset` interface of getters and setters. The
@@ -12,6 +17,12 @@ class MatDataset(Dataset):
     the bridge between the file-format and a convenient numpy format.
     """
 
+    sidecarSuffix = '.sleepy.mat'
+
+    # Message describing why the filtered data could not be regenerated, None
+    # if it has been regenerated or has not been accessed yet
+    filteredDataError = None
+
     def importData(filename, structName='data'):
 
         '''Load Matlab file with EEG data and save all fields in a Python dictionary'''
@@ -38,6 +49,19 @@ class MatDataset(Dataset):
         return dictData
 
     def load(path):
+        """Loads the recording at the given path and merges the sleepy additions
+        from its sidecar into it, if a sidecar exists.
+        """
+
+        raw = MatDataset.loadRecording(path)
+
+        MatDataset.mergeSidecar(raw, path)
+
+        return raw
+
+    def loadRecording(path):
+        """Loads the recording at the given path without its sidecar.
+        """
 
         raw = MatDataset.importData(path)
 
@@ -45,6 +69,41 @@ class MatDataset(Dataset):
 
         return raw
 
+    def mergeSidecar(raw, path):
+        """Replaces the sleepy additions in the raw data of the recording at the
+        given path by those in its sidecar, since the sidecar is saved more
+        recently than the recording. The raw data is left untouched if there is
+        no sidecar.
+
+        :param raw: Raw data of the recording, modified in place.
+
+        :param path: Location of the .mat file.
+        """
+
+        sidecarPath = MatDataset.getSidecarPath(path)
+
+        if not os.path.exists(sidecarPath):
+            return
+
+        annotations = loadmat(sidecarPath)['sleepy'][0, 0]
+
+        for key in [ key for key in raw if MatDataset.isAnnotation(key) ]:
+            raw.pop(key)
+
+        # A sidecar without any additions is not stored as a structure
+        if isinstance(annotations, np.void):
+
+            for key in annotations.dtype.names:
+
+                raw[key] = np.squeeze(annotations[key])
+
+    def isAnnotation(key):
+        """Whether a field of the raw data belongs to the sleepy additions that
+        are stored in the sidecar.
+        """
+
+        return key.startswith('sleepy_') and key != 'sleepy_filteredData'
+
     @property
     def samplingRate(self):
         return self.raw['fsample']
@@ -55,11 +114,21 @@ class MatDataset(Dataset):
 
     @property
     def epochs(self):
-        return self.raw['sampleinfo'].copy()#[0][0][6].copy()
+        return readOnly(self.raw['sampleinfo'])
 
     @property
     def data(self):
-        return self.raw['trial'].copy()#[0][0][1][0].copy()
+        """Read-only views of the epochs, created once, since the views of
+        all epochs are created on each call of readOnly.
+        """
+
+        try:
+            return self._data
+        except AttributeError:
+
+            self._data = readOnly(self.raw['trial'])
+
+            return self._data
 
     @property
     def labels(self):
@@ -110,25 +179,62 @@ class MatDataset(Dataset):
 
     @property
     def filteredData(self):
-        """Copies the content from the dataset's data if no filtered data is
-        available.
+        """The filtered data is not saved, but regenerated on first access
+        from the filter stored in the provenance, see
+        :meth:`regenerateFilteredData`. Files saved by earlier versions that
+        contain the filtered data are used as they are.
         """
 
-        if 'sleepy_filteredData' not in self.raw:
+        try:
+            return self._filteredData
+        except AttributeError:
+            pass
 
-            self.raw['sleepy_filteredData'] = self.data.copy()
+        if 'sleepy_filteredData' in self.raw:
+            return self.raw['sleepy_filteredData']
 
-        return self.raw['sleepy_filteredData']
+        self._filteredData = self.regenerateFilteredData()
+
+        return self._filteredData
 
     @filteredData.setter
     def filteredData(self, filteredData):
 
+        # Compares with the filtered data only if it is available, such that
+        # setting it does not regenerate it
+        previous = getattr(self, '_filteredData', self.raw.get('sleepy_filteredData', self.data))
+
         if filteredData is not None:
-            if not np.array_equal(filteredData, self.filteredData):
+            if not np.array_equal(filteredData, previous):
 
                 self.changesMade = True
 
-        self.raw['sleepy_filteredData'] = filteredData
+        self.raw.pop('sleepy_filteredData', None)
+
+        self._filteredData = filteredData
+
+    def regenerateFilteredData(self):
+        """Filters the data with the filter stored in the provenance. Copies the
+        content from the dataset's data if no filter is stored. Falls back to
+        the dataset's data as well if the filter cannot be restored, e.g. since
+        it is not available anymore or its parameters have changed, and
+        records the reason in filteredDataError.
+        """
+
+        description = (self.provenance or {}).get('filter')
+
+        if description is None:
+            return self.data
+
+        try:
+            return Engine.filterData(restoreProcessor(description), self)
+        except (ImportError, ValueError, TypeError) as exception:
+
+            self.filteredDataError = "The filtered data could not be rebuilt from the stored filter, the unfiltered data is shown instead. {}".format(exception)
+
+            warnings.warn(self.filteredDataError)
+
+            return self.data
 
     @property
     def userLabels(self):
@@ -162,6 +268,23 @@ class MatDataset(Dataset):
 
         self.raw['sleepy_metadata_checkpoint'] = np.array(list(checkpoint))
 
+    @property
+    def provenance(self):
+        """The processors the labels and the filtered data were computed with,
+        stored as JSON since the structure varies between processors.
+        """
+
+        try:
+
+            return json.loads(str(self.raw['sleepy_metadata_provenance']))
+        except KeyError:
+            pass
+
+    @provenance.setter
+    def provenance(self, provenance):
+
+        self.raw['sleepy_metadata_provenance'] = json.dumps(provenance, default = str)
+
     def removeCheckpoint(self):
 
         # Removes the metadata if it exists in the dictionary
@@ -183,8 +306,36 @@ class MatDataset(Dataset):
 
     def save(self, path, navigators):
         """Collects potentially changed data from a list of navigators and
-        stores the data in the raw structure. Then, saves the raw data in the
-        .mat file.
+        stores the data in the raw structure. Then, saves the sleepy additions
+        in the sidecar of the .mat file, which is fast regardless of the size of
+        the recording. The sidecar is merged into the recording on load.
+
+        :param path: Location of the .mat file.
+
+        :param navigators: List of navigators, one for each channel.
+        """
+
+        self.__collect(navigators)
+
+        self.saveSidecar(path)
+
+    def export(self, path, navigators):
+        """Collects potentially changed data from a list of navigators and
+        stores the data in the raw structure. Then, saves the entire raw data
+        in the .mat file, see :meth:`saveToDisk`.
+
+        :param path: Location of the .mat file.
+
+        :param navigators: List of navigators, one for each channel.
+        """
+
+        self.__collect(navigators)
+
+        self.saveToDisk(path)
+
+    def __collect(self, navigators):
+        """Stores the user labels and the tags of the navigators in the raw
+        structure.
         """
 
         self.userLabels = np.array([
@@ -197,13 +348,58 @@ class MatDataset(Dataset):
                 for navigator in navigators
         ])
 
-        self.saveToDisk(path)
+    def getSidecarPath(path):
+        """Returns the path of the sidecar file that belongs to the .mat file at
+        the given path.
+        """
+
+        return os.path.splitext(path)[0] + MatDataset.sidecarSuffix
+
+    def saveSidecar(self, path):
+        """Writes the sleepy additions, except the filtered data, to the sidecar
+        of the .mat file at the given path. The .mat file itself is not touched.
+
+        :param path: Location of the .mat file.
+        """
+
+        annotations = {
+            key : value for key, value in self.raw.items()
+                if MatDataset.isAnnotation(key)
+        }
+
+        savemat(MatDataset.getSidecarPath(path), {'sleepy' : annotations})
 
     def saveToDisk(self, path):
         """I/O method writing the contents of this dataset to the disk. Override
-        this in a test environment to avoid I/O.
+        this in a test environment to avoid I/O. A sidecar of the .mat file is
+        removed, since it would replace the written additions on load.
 
         :param path: Location of the saved file.
         """
 
         savemat(path, {'data' : self.raw})
+
+        sidecarPath = MatDataset.getSidecarPath(path)
+
+        if os.path.exists(sidecarPath):
+            os.remove(sidecarPath)
+
+def readOnly(array):
+    """Returns a read-only view of an array, which avoids copying the array
+    while protecting it from modifications. The arrays contained in an object
+    array, e.g. the epochs, are replaced by read-only views as well.
+    """
+
+    if array.dtype == object:
+
+        view = np.empty(array.shape, dtype = object)
+
+        for index, element in np.ndenumerate(array):
+            view[index] = readOnly(element) if isinstance(element, np.ndarray) else element
+
+    else:
+        view = array.view()
+
+    view.flags.writeable = False
+
+    return view
@@ -0,0 +1,248 @@
+from sleepy.processing.mat.cache import MatCache, MappedMatDataset
+from sleepy.processing.mat.core import MatDataset
+from sleepy.processing.engine import Engine
+from sleepy.processing.filters import BandPassFilter
+from scipy.io import savemat
+import unittest
+import tempfile
+import numpy as np
+import glob
+import os
+
+class Unpickled:
+    """Creates a directory at the given path once it is unpickled.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (os.mkdir, (self.path,))
+
+class MatCacheTest(unittest.TestCase):
+
+    def writeRecording(path):
+        """Writes a .mat file with three epochs of two channels, the last epoch
+        being shorter than the others.
+        """
+
+        trial = np.empty(3, dtype = object)
+
+        for epoch, length in enumerate([100, 100, 50]):
+            trial[epoch] = np.arange(2 * length, dtype = np.float64).reshape(2, length) + epoch
+
+        savemat(path, { 'data' : {
+            'trial' : trial,
+            'sampleinfo' : np.array([[1, 100], [101, 200], [201, 250]]),
+            'fsample' : 100.
+        }})
+
+    def test_mapped_same_data_as_loaded(self):
+        """The memory-mapped dataset has the same data, epochs and sampling
+        rate as the dataset loaded into memory and its data is read-only.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "recording.mat")
+
+            MatCacheTest.writeRecording(path)
+
+            loaded = MatDataset(MatDataset.load(path), path)
+            mapped = MappedMatDataset(MappedMatDataset.load(path), path)
+
+            self.assertTrue(os.path.isdir(MatCache.getDirectory(path)))
+
+            self.assertEqual(len(mapped.data), 3)
+
+            for mappedEpoch, loadedEpoch in zip(mapped.data, loaded.data):
+
+                self.assertIsInstance(mappedEpoch.base, np.memmap)
+                self.assertTrue(np.array_equal(mappedEpoch, loadedEpoch))
+
+            self.assertTrue(np.array_equal(mapped.epochs, loaded.epochs))
+            self.assertEqual(mapped.samplingRate, loaded.samplingRate)
+
+            with self.assertRaises(ValueError):
+                mapped.data[0] = None
+
+            with self.assertRaises(ValueError):
+                mapped.data[0][0,0] = 0
+
+    def test_cache_reused_and_rebuilt(self):
+        """The cache is read without loading the .mat file again until the
+        .mat file is modified.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "recording.mat")
+
+            MatCacheTest.writeRecording(path)
+
+            MatCache.load(path)
+
+            fieldsPath = os.path.join(MatCache.getDirectory(path), 'fields.mat')
+
+            modified = os.stat(fieldsPath).st_mtime_ns
+
+            os.utime(fieldsPath, ns = (modified - 10 ** 9, modified - 10 ** 9))
+
+            MatCache.load(path)
+
+            self.assertEqual(os.stat(fieldsPath).st_mtime_ns, modified - 10 ** 9)
+
+            status = os.stat(path)
+
+            os.utime(path, ns = (status.st_atime_ns, status.st_mtime_ns + 10 ** 9))
+
+            MatCache.load(path)
+
+            self.assertNotEqual(os.stat(fieldsPath).st_mtime_ns, modified - 10 ** 9)
+
+    def test_corrupt_cache_rebuilt(self):
+        """A cache whose fields are truncated or corrupt is rebuilt instead of
+        failing to load.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "recording.mat")
+
+            MatCacheTest.writeRecording(path)
+
+            fieldsPath = os.path.join(MatCache.getDirectory(path), 'fields.mat')
+
+            MatCache.load(path)
+
+            with open(fieldsPath, 'rb') as f:
+                content = f.read()
+
+            middle = len(content) // 2
+
+            for corrupt in [content[:middle], content[:middle] + bytes(64) + content[middle + 64:], bytes(len(content)), b'']:
+
+                with open(fieldsPath, 'wb') as f:
+                    f.write(corrupt)
+
+                mapped = MappedMatDataset(MappedMatDataset.load(path), path)
+
+                self.assertEqual(len(mapped.data), 3)
+
+                # The rebuilt cache is read again
+                MatCache.read(path, MatCache.getDirectory(path))
+
+    def test_crafted_cache_not_unpickled(self):
+        """Pickled objects in the cache, e.g. of a crafted cache shipped with a
+        recording, are never unpickled but the cache is rebuilt.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "recording.mat")
+
+            marker = os.path.join(directory, "unpickled")
+
+            MatCacheTest.writeRecording(path)
+
+            MatCache.load(path)
+
+            cache = MatCache.getDirectory(path)
+
+            crafted = np.empty(1, dtype = object)
+            crafted[0] = Unpickled(marker)
+
+            np.save(os.path.join(cache, 'trial.npy'), crafted, allow_pickle = True)
+            np.savez(os.path.join(cache, 'fields.npz'), crafted = crafted)
+
+            mapped = MappedMatDataset(MappedMatDataset.load(path), path)
+
+            self.assertEqual(len(mapped.data), 3)
+
+            self.assertFalse(os.path.exists(marker))
+
+    def test_load_without_cache_directory(self):
+        """The .mat file is loaded into memory if the cache cannot be written.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "recording.mat")
+
+            MatCacheTest.writeRecording(path)
+
+            # A file in place of the cache directory prevents the cache
+            open(MatCache.getDirectory(path), 'w').close()
+
+            raw = MatCache.load(path)
+
+            self.assertEqual(len(raw['trial']), 3)
+            self.assertNotIsInstance(raw['trial'][0].base, np.memmap)
+
+    def test_filteredData_cached(self):
+        """The regenerated filtered data is written to the cache on first access
+        and memory-mapped from it afterwards. A different filter is stored
+        separately and replaces the data of the previous filter.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "recording.mat")
+
+            MatCacheTest.writeRecording(path)
+
+            dataset = MatDataset(MatDataset.load(path), path)
+
+            Engine.run(None, BandPassFilter().setParameters({ "order" : "2" }), dataset)
+
+            dataset.saveSidecar(path)
+
+            filteredPaths = []
+
+            for _ in range(2):
+
+                mapped = MappedMatDataset(MappedMatDataset.load(path), path)
+
+                for mappedEpoch, epoch in zip(mapped.filteredData, dataset.filteredData):
+
+                    self.assertIsInstance(mappedEpoch.base, np.memmap)
+                    self.assertTrue(np.allclose(mappedEpoch, epoch))
+
+                filteredPaths.append(mappedEpoch.base.filename)
+
+            self.assertEqual(filteredPaths[0], filteredPaths[1])
+
+            Engine.run(None, BandPassFilter().setParameters({ "order" : "3" }), dataset)
+
+            dataset.saveSidecar(path)
+
+            mapped = MappedMatDataset(MappedMatDataset.load(path), path)
+
+            self.assertNotEqual(mapped.filteredData[0].base.filename, filteredPaths[0])
+
+            self.assertEqual(
+                glob.glob(os.path.join(MatCache.getDirectory(path), 'filtered-*')),
+                [ mapped.filteredData[0].base.filename ]
+            )
+
+    def test_filteredData_not_rebuilt_not_cached(self):
+        """The unfiltered data used if the stored filter cannot be restored is
+        not written to the cache as filtered data.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "recording.mat")
+
+            MatCacheTest.writeRecording(path)
+
+            mapped = MappedMatDataset(MappedMatDataset.load(path), path)
+
+            mapped.provenance = { 'filter' : { 'className' : 'UnknownFilter', 'parameters' : {} } }
+
+            with self.assertWarns(UserWarning):
+                filteredData = mapped.filteredData
+
+            self.assertTrue(all(np.array_equal(filtered, epoch) for filtered, epoch in zip(filteredData, mapped.data)))
+
+            self.assertEqual([ name for name in os.listdir(MatCache.getDirectory(path)) if name.startswith('filtered') ], [])
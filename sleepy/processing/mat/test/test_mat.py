@@ -1,9 +1,14 @@
 
 from sleepy.processing.mat.core import MatDataset
+from sleepy.processing.engine import Engine
+from sleepy.processing.filters import BandPassFilter
 from sleepy.test.core import TestBase
+from scipy.io import loadmat
 import unittest
 from unittest.mock import MagicMock
 import numpy as np
+import tempfile
+import os
 import pdb
 
 class MatDatasetTest(unittest.TestCase):
@@ -54,6 +59,28 @@ class MatDatasetTest(unittest.TestCase):
         self.assertTrue(dataset.epochs is not None)
         self.assertTrue(dataset.data is not None)
 
+    def test_data_read_only(self):
+        """Neither the epochs of the data nor their samples can be modified,
+        also for epochs of different lengths held in an object array.
+        """
+
+        raw = MatDatasetTest.basicRaw()
+
+        trial = np.empty(2, dtype = object)
+        trial[0], trial[1] = np.zeros((2, 10)), np.zeros((2, 5))
+
+        for raw['trial'] in [raw['trial'], trial]:
+
+            dataset = MatDataset(raw, None)
+
+            with self.assertRaises(ValueError):
+                dataset.data[0] = 1
+
+            with self.assertRaises(ValueError):
+                dataset.data[0][...] = 1
+
+            self.assertTrue(np.shares_memory(dataset.data[0], raw['trial'][0]))
+
     def test_empty_userLabels(self):
         """Creating the dataset without further input should create an empty array
         on the attribute userLabels.
@@ -79,8 +106,9 @@ class MatDatasetTest(unittest.TestCase):
 
     def test_save_userLabels_and_tags_are_extracted_correctly(self):
         """Saving the dataset must set the raw data to the correct values from
-        the navigators provided. The tags of the user events are ignored.
-        The standard scenario adds one user event at sample 2.
+        the navigators provided and write them to the sidecar. The tags of the
+        user events are ignored. The standard scenario adds one user event at
+        sample 2.
         """
 
         navigator, events = MatDatasetTest.standardScenario()
@@ -95,6 +123,7 @@ class MatDatasetTest(unittest.TestCase):
 
         dataset = MatDataset(raw, None)
 
+        dataset.saveSidecar = MagicMock(return_value = None)
         dataset.saveToDisk = MagicMock(return_value = None)
 
         dataset.save(path, [navigator, navigator])
@@ -103,7 +132,8 @@ class MatDatasetTest(unittest.TestCase):
 
         self.assertEqual(dataset.tags.tolist(), [[0,0,0],[0,0,0]])
 
-        dataset.saveToDisk.assert_called_with(path)
+        dataset.saveSidecar.assert_called_with(path)
+        dataset.saveToDisk.assert_not_called()
 
     def test_tags_change_of_labels(self):
         """When the labels change and do not fit to the tags anymore, the tags
@@ -144,3 +174,142 @@ class MatDatasetTest(unittest.TestCase):
         dataset = MatDataset(raw, None)
 
         self.assertEqual(dataset.tags.tolist(), [[0,1,0]])
+
+    def test_saveSidecar_annotations_only(self):
+        """Saving the sidecar writes the sleepy additions but neither the data
+        nor the filtered data next to the file, which is left untouched.
+        """
+
+        raw = MatDatasetTest.basicRaw()
+
+        raw['sleepy_labels'] = np.array([[1,2,3],[4,5,6]])
+
+        dataset = MatDataset(raw, None)
+
+        dataset.filteredData = dataset.data * 2
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "file.mat")
+
+            dataset.saveSidecar(path)
+
+            self.assertEqual(os.listdir(directory), ["file.sleepy.mat"])
+
+            sidecar = loadmat(MatDataset.getSidecarPath(path))['sleepy'][0, 0]
+
+        self.assertEqual(set(sidecar.dtype.names), {'sleepy_labels'})
+        self.assertEqual(sidecar['sleepy_labels'].tolist(), [[1,2,3],[4,5,6]])
+
+    def test_sidecar_merged_on_load(self):
+        """Loading a file replaces its sleepy additions by those of its sidecar,
+        including additions that have been removed since, and keeps the data.
+        """
+
+        raw = MatDatasetTest.basicRaw()
+
+        raw['sleepy_labels'] = np.array([[1,2,3]])
+        raw['sleepy_metadata_checkpoint'] = np.array([0, 1])
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "file.mat")
+
+            MatDataset(raw, path).saveToDisk(path)
+
+            dataset = MatDataset(MatDataset.load(path), path)
+
+            dataset.labels = np.array([[4,5,6]])
+            dataset.provenance = { 'filter' : { 'className' : 'BandPassFilter', 'parameters' : { 'order' : 4 } } }
+            dataset.removeCheckpoint()
+
+            dataset.saveSidecar(path)
+
+            loaded = MatDataset(MatDataset.load(path), path)
+
+            recording = MatDataset(MatDataset.loadRecording(path), path)
+
+        self.assertEqual(loaded.labels.tolist(), [4,5,6])
+        self.assertIsNone(loaded.checkpoint)
+        self.assertEqual(loaded.provenance, dataset.provenance)
+        self.assertTrue(np.allclose(np.stack(loaded.data), raw['trial']))
+
+        self.assertEqual(recording.labels.tolist(), [1,2,3])
+        self.assertEqual(recording.checkpoint, (0, 1))
+
+    def test_export_replaces_sidecar(self):
+        """Exporting writes the entire dataset and removes the sidecar of the
+        exported file, which would otherwise replace the exported additions.
+        """
+
+        navigator, _ = MatDatasetTest.standardScenario()
+
+        raw = MatDatasetTest.basicRaw()
+
+        raw['sleepy_labels'] = np.array([[1,2,3]])
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "file.mat")
+
+            dataset = MatDataset(raw, path)
+
+            dataset.save(path, [navigator])
+
+            dataset.export(path, [navigator])
+
+            self.assertEqual(os.listdir(directory), ["file.mat"])
+
+            loaded = MatDataset(MatDataset.load(path), path)
+
+        self.assertEqual(loaded.labels.tolist(), [1,2,3])
+        self.assertEqual(np.ravel(loaded.userLabels).tolist(), [2])
+
+    def test_filteredData_regenerated_not_saved(self):
+        """The filtered data is not saved, but regenerated from the filter
+        stored in the provenance when it is accessed after loading.
+        """
+
+        raw = MatDatasetTest.basicRaw()
+
+        raw['trial'] = np.cumsum(np.random.RandomState(0).normal(size = (5, 2, 300)), axis = -1)
+        raw['fsample'] = 100.
+
+        dataset = MatDataset(raw, None)
+
+        Engine.run(None, BandPassFilter().setParameters({ "order" : "2" }), dataset)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "file.mat")
+
+            dataset.saveToDisk(path)
+
+            self.assertNotIn('sleepy_filteredData', MatDataset.loadRecording(path))
+
+            loaded = MatDataset(MatDataset.load(path), path)
+
+        self.assertEqual(loaded.provenance['filter']['parameters']['order'], 2)
+        self.assertTrue(np.allclose(np.stack(loaded.filteredData), dataset.filteredData))
+
+    def test_filteredData_not_rebuilt_falls_back(self):
+        """If the stored filter cannot be restored, e.g. since a parameter has
+        been removed, the unfiltered data is used and the failure is reported
+        instead of making the dataset unusable.
+        """
+
+        raw = MatDatasetTest.basicRaw()
+
+        raw['fsample'] = 10.
+
+        dataset = MatDataset(raw, None)
+
+        dataset.provenance = { 'filter' : { 'className' : 'BandPassFilter', 'parameters' : { 'removedParam' : 1 } } }
+
+        with self.assertWarns(UserWarning):
+            filteredData = dataset.filteredData
+
+        self.assertTrue(all(np.array_equal(filtered, epoch) for filtered, epoch in zip(filteredData, dataset.data)))
+        self.assertIn("removedParam", dataset.filteredDataError)
+
+        Engine.run(None, None, dataset)
@@ -1,20 +1,74 @@
 
 
-from sleepy.gui.builder import Builder
-from PyQt5.QtWidgets import QWidget
 from sleepy.processing.parameter import ParameterBase
-import pdb
 
 class Processor:
 
     def render(self):
 
+        # Imported here, such that processors can be used without Qt
+        from sleepy.gui.builder import Builder
+
         self.buildTree = ParameterBase.getBuildTree(self)
 
         Builder.setAttributesFromJSON(self.buildTree, self, level = 1)
 
         return self
 
+    def setParameters(self, values = None):
+        """Counterpart of render for using a processor without Qt. Sets each
+        user parameter to its default value or to the value supplied for it,
+        converted to the type of the parameter.
+
+        :param values: Dictionary mapping names of parameters to values, e.g.
+        strings passed on the command line. All parameters keep their default
+        if None.
+
+        :returns: The processor for chaining.
+
+        :raises ValueError: A value cannot be converted or the parameter does
+        not exist.
+        """
+
+        if values is None:
+            values = {}
+
+        self.buildTree = ParameterBase.getBuildTree(self)
+
+        fields = self.buildTree["fields"]
+
+        unknown = set(values) - set(fields)
+
+        if unknown:
+            raise ValueError(
+                "Unknown parameters {}, expected one of {}".format(
+                    ', '.join(sorted(unknown)),
+                    ', '.join(sorted(fields))
+                )
+            )
+
+        for name, descriptor in fields.items():
+
+            value = values.get(name, descriptor["default"])
+
+            setattr(self, name, convertValue(descriptor["fieldType"], value))
+
+        return self
+
+    @property
+    def parameters(self):
+        """Returns the current values of the user parameters as a dictionary,
+        mapping the name of each parameter to its value. Empty if the processor
+        has not been rendered yet.
+        """
+
+        try:
+            fields = self.buildTree["fields"]
+        except AttributeError:
+            return {}
+
+        return { name : getattr(self, name) for name in sorted(fields) }
+
     @property
     def options(self):
 
@@ -22,6 +76,9 @@ class Processor:
             return self.widget
         except AttributeError:
 
+            from sleepy.gui.builder import Builder
+            from PyQt5.QtWidgets import QWidget
+
             self.widget = QWidget()
 
             layout = Builder.build(self.buildTree, self, level = 1)
@@ -30,6 +87,67 @@ class Processor:
 
             return self.widget
 
+    def __getstate__(self):
+        """Leaves out the widget of the options, such that a rendered processor
+        can be sent to worker processes.
+        """
+
+        state = dict(self.__dict__)
+
+        state.pop('widget', None)
+
+        return state
+
+def convertValue(fieldType, value):
+    """Converts a value, e.g. a string, to the type of a parameter. Strings
+    are converted to booleans by their meaning rather than by their length.
+    """
+
+    if fieldType == bool and isinstance(value, str):
+
+        if value.lower() not in ('true', 'false', '1', '0', 'yes', 'no'):
+            raise ValueError("'{}' is not a boolean".format(value))
+
+        return value.lower() in ('true', '1', 'yes')
+
+    return fieldType(value)
+
+def describeProcessor(processor):
+    """Describes a processor by its class and the values of its parameters,
+    such that it can be recreated by :func:`restoreProcessor`.
+    """
+
+    processorClass = type(processor)
+
+    return {
+        'module' : processorClass.__module__,
+        'className' : processorClass.__name__,
+        'parameters' : dict(getattr(processor, 'parameters', {}))
+    }
+
+def restoreProcessor(description):
+    """Recreates a processor from a description created by
+    :func:`describeProcessor`, without Qt. The class is looked up by its name
+    among the supported algorithms and filters only, since descriptions are
+    read from files and must not import arbitrary modules.
+
+    :raises ImportError: The module of the processor cannot be imported.
+
+    :raises ValueError: The processor is not supported or a parameter does
+    not exist anymore.
+    """
+
+    from sleepy.processing.registry import SUPPORTED_ALGORITHMS, SUPPORTED_FILTERS
+
+    className = description.get('className')
+
+    for entry in SUPPORTED_ALGORITHMS + SUPPORTED_FILTERS:
+
+        if entry.className == className:
+            return entry.processorClass().setParameters(description.get('parameters', {}))
+
+    raise ValueError("Unsupported processor '{}'".format(className))
+
 class Algorithm(Processor):
 
     def extract(self, data):
@@ -0,0 +1,110 @@
+import importlib
+
+class ParameterEntry:
+    """Entry of a user parameter of a supported processor. Mirrors the
+    :class:`Parameter` declared by the processor, such that the parameters can
+    be listed without importing the processor.
+    """
+
+    def __init__(self, name, fieldType, default, title):
+        """
+        :param name: The name of the attribute the parameter is set to.
+
+        :param fieldType: The type the values of the parameter are converted to.
+
+        :param default: The default value of the parameter.
+
+        :param title: The description presented to the user.
+        """
+
+        self.name = name
+        self.fieldType = fieldType
+        self.default = default
+        self.title = title
+
+class ProcessorEntry:
+    """Entry of a supported algorithm or filter. Records the name presented to
+    the user, the location of the implementing class and its user parameters,
+    such that the module of a processor, together with its dependencies, is
+    only imported once the processor is selected.
+    """
+
+    def __init__(self, name, module, className, parameters = None):
+        """
+        :param name: The name presented to the user, should match the name
+        attribute of the processor.
+
+        :param module: The module containing the processor class.
+
+        :param className: The name of the processor class within the module.
+
+        :param parameters: List of :class:`ParameterEntry` instances, one for
+        each user parameter of the processor.
+        """
+
+        self.name = name
+        self.module = module
+        self.className = className
+        self.parameters = [] if parameters is None else parameters
+
+    @property
+    def processorClass(self):
+        """Imports the module of the processor and returns its class.
+        """
+
+        return getattr(importlib.import_module(self.module), self.className)
+
+    def create(self):
+        """Creates and renders a new instance of the processor.
+        """
+
+        return self.processorClass().render()
+
+# Algorithms and filters are only imported once they are selected, see
+# ProcessorEntry. The parameters must match the parameters the processors
+# declare, which is checked by the tests of the registry
+SUPPORTED_ALGORITHMS = [
+    ProcessorEntry("Massimini (2004)", 'sleepy.processing.algorithms.massimi', 'Massimi', [
+        ParameterEntry('negativeHeight', float, 40.0, "Required height of negative peak (-μV)"),
+        ParameterEntry('negativeToPositivePeak', float, 70.0, "Negative-To-Positive peak (μV)"),
+        ParameterEntry('separation', float, 0.3, "Separation of zero-crossings (seconds)")
+    ]),
+    #ProcessorEntry("Walkthrough", 'sleepy.processing.algorithms.walkthrough.walkthrough', 'Walkthrough'),
+    ProcessorEntry("Relative Amplitude", 'sleepy.processing.algorithms.relative.relative', 'Relative', [
+        ParameterEntry('durationLow', float, 0.9, "Lower bound for duration interval [sec]"),
+        ParameterEntry('durationHigh', float, 2.0, "Higher bound for duration interval [sec]"),
+        ParameterEntry('scalingAmplitude', float, 2/3, "Scaling factor for SO amplitude"),
+        ParameterEntry('scalingNegPeak', float, 2/3, "Scaling factor for SO negative peak")
+    ]),
+    ProcessorEntry("Percentile Algorithm", 'sleepy.processing.algorithms.percentile.percentile', 'Percentile', [
+        ParameterEntry('durationLow', float, 0.8, "Lower bound for duration interval [sec]"),
+        ParameterEntry('durationHigh', float, 2.0, "Upper bound for duration interval [sec]"),
+        ParameterEntry('percentile', float, 25, "Percentage of potential SOs to keep [%]")
+    ]),
+    ProcessorEntry("BiLSTM", 'sleepy.processing.algorithms.BiLSTM.BiLSTM', 'BiLSTM'),
+    ProcessorEntry("RandomForest", 'sleepy.processing.algorithms.RandomForest.RandomForest', 'RandomForest'),
+    ProcessorEntry("Custom Implementation", 'sleepy.processing.algorithms.custom.custom', 'Custom', [
+        ParameterEntry('durationLow', float, 0.2, "Lower bound for duration interval [sec]"),
+        ParameterEntry('durationHigh', float, 7.0, "Upper bound for duration interval [sec]"),
+        ParameterEntry('firstCrosstoMinDuration', float, 2.0, "Max. duration from first zero crossing to negative wave peak [sec]"),
+        ParameterEntry('minToMaxDuration', float, 2.0, "Max. duration from negative to positive wave peak [sec]"),
+        ParameterEntry('maxToSecondZeroCrossDuration', float, 4.0, "Max. duration from positive wave peak to second zero crossing [sec]"),
+        ParameterEntry('nPosPeaks', int, 5, "Max. number of positive peaks"),
+        ParameterEntry('scalingAmplitude', float, 0.7, "Scaling factor for SO amplitude"),
+        ParameterEntry('scalingNegPeak', float, 0.0, "Scaling factor for SO negative peak"),
+        ParameterEntry('percentile', float, 65, "Percentage of SOs to keep [%]")
+    ]),
+    ProcessorEntry("DTW-1NN", 'sleepy.processing.algorithms.dtw1nn', 'DTW1NN', [
+        ParameterEntry('durationLow', float, 0.8, "Lower bound for duration interval [sec]"),
+        ParameterEntry('durationHigh', float, 3.5, "Upper bound for duration interval [sec]")
+    ])
+]
+
+SUPPORTED_FILTERS = [
+    ProcessorEntry("Bandpass", 'sleepy.processing.filters', 'BandPassFilter', [
+        ParameterEntry('lowCutFrequency', float, 0.1, "Low cut-off frequency in Hz"),
+        ParameterEntry('highCutFrequency', float, 1.25, "High cut-off frequency in Hz"),
+        ParameterEntry('order', int, 2, "Order"),
+        ParameterEntry('continuous', bool, False, "Filter contiguous epochs as one recording")
+    ])
+]
@@ -68,7 +68,7 @@ class Signal:
             nCrossing = self.findClosestNCrossing(peak)
             pCrossing = self.findClosestPCrossing(peak)
 
-            nextPeak = list(filter(lambda p: p > pCrossing, self.positivePeaks))[0]
+            nextPeak = self.positivePeaks[np.searchsorted(self.positivePeaks, pCrossing, side = 'right')]
 
             return Valley(
                 nCrossing,
@@ -81,11 +81,49 @@ class Signal:
         except IndexError:
             pass
 
+    def findValleys(self, peaks):
+        """Batch version of findValley. Resolves the closest zero-crossings
+        and the next positive peak for an entire array of negative peaks at
+        once, using binary search on the sorted zero-crossings and positive
+        peaks.
+
+        :param peaks: Array of negative peaks in samples.
+
+        :returns: A tuple of arrays (peaks, nCrossings, pCrossings, nextPeaks),
+        restricted to the peaks for which a valley exists, i.e. for which
+        findValley does not return None.
+        """
+
+        peaks = np.asarray(peaks, dtype = np.int64)
+
+        cross = self.zeroCrossings
+        positivePeaks = self.positivePeaks
+
+        nIndices = np.searchsorted(cross, peaks, side = 'left') - 1
+        pIndices = np.searchsorted(cross, peaks, side = 'right')
+
+        hasCrossings = (nIndices >= 0) & (pIndices < len(cross))
+
+        peaks = peaks[hasCrossings]
+        nCrossings = cross[nIndices[hasCrossings]]
+        pCrossings = cross[pIndices[hasCrossings]]
+
+        peakIndices = np.searchsorted(positivePeaks, pCrossings, side = 'right')
+
+        hasNextPeak = peakIndices < len(positivePeaks)
+
+        return (
+            peaks[hasNextPeak],
+            nCrossings[hasNextPeak],
+            pCrossings[hasNextPeak],
+            positivePeaks[peakIndices[hasNextPeak]]
+        )
+
     def findClosestPCrossing(self, peak):
 
         cross = self.zeroCrossings
 
-        pCrossing = list(filter(lambda c: c > peak, cross))[0]
+        pCrossing = cross[np.searchsorted(cross, peak, side = 'right')]
 
         return pCrossing
 
@@ -93,20 +131,38 @@ class Signal:
 
         cross = self.zeroCrossings
 
-        nCrossing = list(filter(lambda c: c < peak, cross))[-1]
+        index = np.searchsorted(cross, peak, side = 'left') - 1
+
+        if index < 0:
+            raise IndexError
 
-        return nCrossing
+        return cross[index]
 
     def findWaves(self):
-        try:
+        """Returns the waves between consecutive positive-to-negative
+        zero-crossings as an (N,2) int array of start and stop samples.
+        """
 
-            cross = self.posToNegZeroCrossings
+        cross = self.posToNegZeroCrossings
 
-            waves = []
-            for i in range(len(cross) - 1):
-                waves.append([cross[i],cross[i+1]])
+        return np.column_stack([cross[:-1], cross[1:]])
 
-            return waves
+    def findWavesInDuration(self, durationLow, durationHigh):
+        """Returns the waves whose duration lies within the given closed
+        interval.
 
-        except IndexError:
-            pass
+        :param durationLow: Lower bound of the duration in seconds.
+
+        :param durationHigh: Upper bound of the duration in seconds.
+
+        :returns: An (N,2) int array of start and stop samples.
+        """
+
+        waves = self.findWaves()
+
+        durations = waves[:,1] - waves[:,0]
+
+        isEvent = (durationLow * self.samplingRate <= durations) & \
+            (durations <= durationHigh * self.samplingRate)
+
+        return waves[isEvent]
@@ -0,0 +1,278 @@
+from sleepy.processing.batch import Batch, main
+from sleepy.processing.engine import Engine
+from sleepy.processing.mat.core import MatDataset
+from sleepy.processing.registry import ProcessorEntry, SUPPORTED_ALGORITHMS, SUPPORTED_FILTERS
+from sleepy.processing.algorithms import Massimi
+from scipy.io import savemat
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import unittest
+import tempfile
+import numpy as np
+import io
+import os
+import subprocess
+import sys
+
+# Lists the processors in a fresh interpreter and prints the processor modules
+# and heavy dependencies that have been imported
+LIST_SCRIPT = """
+import sys, io
+from contextlib import redirect_stdout
+from sleepy.processing.batch import main
+
+with redirect_stdout(io.StringIO()):
+    main(['--list'])
+
+print(sorted(
+    name for name in sys.modules
+        if name.startswith(('sleepy.processing.algorithms', 'sleepy.processing.filters')) or name in ('numba', 'dill')
+))
+"""
+
+class MassimiComputingAll(Massimi):
+    """Massimi computing all signals at once, which records the executors it
+    receives.
+    """
+
+    executors = []
+
+    def computeAll(self, signals, executor = None, monitor = None):
+
+        MassimiComputingAll.executors.append(executor)
+
+        return [ self.compute(signal) for signal in signals ]
+
+class BatchTest(unittest.TestCase):
+
+    def writeRecording(path, seed = 0):
+        """Writes a .mat file with two epochs of two channels of a random walk,
+        in the structure that is read by :class:`MatDataset`.
+        """
+
+        random = np.random.RandomState(seed)
+
+        trial = np.empty(2, dtype = object)
+
+        for epoch in range(2):
+            trial[epoch] = np.cumsum(random.normal(size = (2, 3000)), axis = 1) * 5
+
+        raw = {
+            'trial' : trial,
+            'sampleinfo' : np.array([[1, 3000], [3001, 6000]]),
+            'fsample' : 100.
+        }
+
+        savemat(path, { 'data' : raw })
+
+    def standardScenario(directory):
+        """Writes two recordings into the directory and selects Massimi with
+        the bandpass filter.
+        """
+
+        for index in range(2):
+            BatchTest.writeRecording(os.path.join(directory, "night{}.mat".format(index)), index)
+
+        algorithm = (Batch.findEntry(SUPPORTED_ALGORITHMS, "massimi"), { "negativeHeight" : "5" })
+        filter = (Batch.findEntry(SUPPORTED_FILTERS, "bandpass"), {})
+
+        return algorithm, filter
+
+    def test_findFiles(self):
+        """Directories and glob patterns are expanded to the sorted .mat files
+        they contain, without duplicates and without sidecar files.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            for name in ["b.mat", "a.mat", "a.sleepy.mat", "notes.txt"]:
+                open(os.path.join(directory, name), 'w').close()
+
+            paths = Batch.findFiles([directory, os.path.join(directory, "*.mat")])
+
+            self.assertEqual(paths, [
+                os.path.join(directory, "a.mat"),
+                os.path.join(directory, "b.mat")
+            ])
+
+    def test_findEntry(self):
+        """Processors are found by name or class name, ignoring the case.
+        """
+
+        self.assertEqual(Batch.findEntry(SUPPORTED_ALGORITHMS, "Massimini (2004)").className, "Massimi")
+        self.assertEqual(Batch.findEntry(SUPPORTED_FILTERS, "bandpassfilter").className, "BandPassFilter")
+
+        with self.assertRaises(ValueError):
+            Batch.findEntry(SUPPORTED_ALGORITHMS, "unknown")
+
+    def test_parseParameters(self):
+        """Parameters of the form NAME=VALUE are parsed into a dictionary.
+        """
+
+        self.assertEqual(
+            Batch.parseParameters(["order=4", " lowCutFrequency = .5"]),
+            { "order" : "4", "lowCutFrequency" : ".5" }
+        )
+
+        with self.assertRaises(ValueError):
+            Batch.parseParameters(["order"])
+
+    def test_import_without_gui(self):
+        """Importing the batch script neither imports Qt nor matplotlib.
+        """
+
+        output = subprocess.check_output([
+            sys.executable,
+            '-c',
+            "import sys, sleepy.processing.batch; print(sorted({ name.split('.')[0] for name in sys.modules } & {'PyQt5', 'matplotlib'}))"
+        ])
+
+        self.assertEqual(output.decode().strip(), "[]")
+
+    def test_list_without_import(self):
+        """Listing the algorithms and filters imports none of them, together
+        with their dependencies, and lists the parameters with their defaults.
+        """
+
+        output = subprocess.check_output([sys.executable, '-c', LIST_SCRIPT])
+
+        self.assertEqual(output.decode().strip(), "[]")
+
+        printed = io.StringIO()
+
+        with redirect_stdout(printed):
+            self.assertEqual(main(["--list"]), 0)
+
+        self.assertIn("DTW1NN (DTW-1NN)\n    durationHigh=3.5", printed.getvalue())
+        self.assertIn("    order=2  Order", printed.getvalue())
+
+    def test_run_sidecar_same_result_as_engine(self):
+        """Running the batch serially and on a process pool writes the labels
+        computed by the engine into sidecar files next to the recordings and
+        reports defective files instead of stopping.
+        """
+
+        for jobs in [1, 2]:
+
+            with tempfile.TemporaryDirectory() as directory:
+
+                algorithm, filter = BatchTest.standardScenario(directory)
+
+                open(os.path.join(directory, "defective.mat"), 'w').close()
+
+                paths = Batch.findFiles([directory])
+
+                results = Batch.run(paths, algorithm, filter, sidecar = True, jobs = jobs)
+
+                results = { os.path.basename(result['path']) : result for result in results }
+
+                self.assertIsNotNone(results["defective.mat"]['error'])
+
+                for name in ["night0", "night1"]:
+
+                    self.assertIsNone(results[name + ".mat"]['error'])
+
+                    self.assertTrue(os.path.exists(os.path.join(directory, name + ".sleepy.mat")))
+
+                path = os.path.join(directory, "night0.mat")
+
+                self.assertNotIn('sleepy_labels', MatDataset.loadRecording(path))
+
+                dataset = MatDataset(MatDataset.loadRecording(path), path)
+
+                events = Engine.run(
+                    algorithm[0].processorClass().setParameters(algorithm[1]),
+                    filter[0].processorClass().setParameters(filter[1]),
+                    dataset
+                )
+
+                self.assertGreater(results["night0.mat"]['events'], 0)
+                self.assertEqual(results["night0.mat"]['events'], sum(len(channelEvents) for channelEvents in events))
+
+    def test_run_full_after_sidecar(self):
+        """Writing the full file after a sidecar removes the sidecar, such that
+        the newly computed labels are loaded instead of the labels of the
+        sidecar.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            _, filter = BatchTest.standardScenario(directory)
+
+            path = os.path.join(directory, "night0.mat")
+
+            labels = []
+
+            for negativeHeight, sidecar in [("5", True), ("50", False)]:
+
+                algorithm = (Batch.findEntry(SUPPORTED_ALGORITHMS, "massimi"), { "negativeHeight" : negativeHeight })
+
+                results = Batch.run([path], algorithm, filter, sidecar = sidecar, jobs = 1)
+
+                self.assertIsNone(results[0]['error'])
+
+                labels.append(MatDataset(MatDataset.load(path), path).labels)
+
+            self.assertFalse(os.path.exists(MatDataset.getSidecarPath(path)))
+
+            self.assertNotEqual(
+                [ np.ravel(channel).tolist() for channel in labels[0] ],
+                [ np.ravel(channel).tolist() for channel in labels[1] ]
+            )
+
+    def test_run_computeAll_executor_reused(self):
+        """Algorithms computing all signals at once process the files in this
+        process and receive the same process pool for every file.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            algorithm, filter = BatchTest.standardScenario(directory)
+
+            paths = Batch.findFiles([directory])
+
+            expected = Batch.run(paths, algorithm, filter, jobs = 1)
+
+            entry = ProcessorEntry("Massimi computing all", __name__, "MassimiComputingAll")
+
+            MassimiComputingAll.executors = []
+
+            results = Batch.run(paths, (entry, algorithm[1]), filter, jobs = 2)
+
+        executors = MassimiComputingAll.executors
+
+        self.assertEqual(len(executors), 2)
+        self.assertIsInstance(executors[0], ProcessPoolExecutor)
+        self.assertIs(executors[0], executors[1])
+
+        self.assertEqual([ result['path'] for result in results ], paths)
+        self.assertEqual([ result['events'] for result in results ], [ result['events'] for result in expected ])
+
+    def test_main_output_directory(self):
+        """The command line interface writes the processed files into the
+        output directory, prints a line per file and a summary and returns 0.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            BatchTest.standardScenario(directory)
+
+            output = os.path.join(directory, "output")
+
+            printed = io.StringIO()
+
+            with redirect_stdout(printed):
+                status = main([directory, "-a", "massimi", "-p", "negativeHeight=5", "-f", "bandpass", "-o", output, "-j", "1"])
+
+            self.assertEqual(status, 0)
+
+            self.assertEqual(sorted(os.listdir(output)), ["night0.mat", "night1.mat"])
+
+            path = os.path.join(output, "night0.mat")
+
+            self.assertIn('sleepy_labels', MatDataset.load(path))
+
+        lines = printed.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith("2 of 2 files processed, 0 failed"))
@@ -128,3 +128,80 @@ class DatasetTest(unittest.TestCase):
         self.assertEqual(dataset.tags[0].tolist(), list(range(4)))
         self.assertEqual(dataset.tags[1].tolist(), list(range(3)))
         self.assertEqual(dataset.tags[2].tolist(), list(range(6)))
+
+    def test_getEpochIndices_points_and_intervals(self):
+        """Points and intervals are mapped to the epochs that contain them, or
+        their start respectively, regardless of the order of the epochs.
+        """
+
+        dataset = DatasetTest.standardScenario()
+
+        dataset.epochs = dataset.epochs[[3, 0, 4, 2, 1]]
+
+        self.assertEqual(dataset.getEpochIndices(np.array([0, 9, 10, 35, 49])).tolist(), [1, 1, 4, 0, 2])
+        self.assertEqual(dataset.getEpochIndices(np.array([[16], [41]])).tolist(), [4, 2])
+        self.assertEqual(dataset.getEpochIndices(np.array([[12, 14], [28, 31]])).tolist(), [4, 3])
+        self.assertEqual(dataset.getEpochIndices(np.array([])).tolist(), [])
+
+    def test_getEpochIndices_outside_epochs(self):
+        """Labels before, between or after the epochs raise an IndexError.
+        """
+
+        dataset = DatasetTest.standardScenario()
+
+        dataset.epochs = np.array([[0, 9], [20, 29]])
+
+        for label in [-1, 15, 30]:
+
+            with self.assertRaises(IndexError):
+                dataset.getEpochIndices(np.array([5, label]))
+
+    def test_forEachEpoch_groups_in_label_order(self):
+        """The converter is called once per epoch with all labels of the epoch
+        and the results are returned in the order of the labels. The data
+        sources are shared with getDataSource.
+        """
+
+        dataset = DatasetTest.standardScenario()
+
+        dataset.samplingRate = 10
+
+        calls = []
+
+        def converter(labels, dataSource):
+
+            calls.append((labels.tolist(), dataSource.epochInterval.tolist()))
+
+            return [ (label, dataSource) for label in labels[:,0].tolist() ]
+
+        results = dataset.forEachEpoch(np.array([[31, 2, 35, 4, 12]]), converter)
+
+        self.assertEqual(calls, [
+            ([[2], [4]], [0, 9]),
+            ([[12]], [10, 19]),
+            ([[31], [35]], [30, 39])
+        ])
+
+        self.assertEqual([ label for label, _ in results[0] ], [31, 2, 35, 4, 12])
+        self.assertIs(results[0][0][1], dataset.getDataSource(channel = 0, label = 33))
+        self.assertEqual(results[0][0][1].labels, [31, 35, 33])
+
+    def test_forEachEpoch_different_label_lengths(self):
+        """Intervals are grouped by their start, mixing points and intervals
+        raises a ValueError.
+        """
+
+        dataset = DatasetTest.standardScenario()
+
+        dataset.samplingRate = 10
+
+        results = dataset.forEachEpoch(np.array([[[8, 12], [1, 3]]]), lambda labels, dataSource: labels.tolist())
+
+        self.assertEqual(results, [[[8, 12], [1, 3]]])
+
+        labels = np.empty((1, 2), dtype = object)
+        labels[0,0] = np.array([1])
+        labels[0,1] = np.array([12, 14])
+
+        with self.assertRaises(ValueError):
+            dataset.forEachEpoch(labels, lambda labels, dataSource: labels.tolist())
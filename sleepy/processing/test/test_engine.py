@@ -1,8 +1,10 @@
 
-from sleepy.processing.engine import Engine
+from sleepy.processing.engine import Engine, CancellationToken, ComputationCancelled
 from sleepy.processing.dataset import Dataset
+from sleepy.processing.processor import Algorithm
 import unittest
 from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
 import pdb
 
@@ -49,6 +51,95 @@ class MockAlgorithmExtractMulti:
     def filter(self, events, data):
         return events
 
+class MockAlgorithmKeepMask(MockAlgorithmSimple):
+
+    def filter(self, events, data):
+        # Same filter as MockAlgorithmSimple but expressed as a keep-mask
+        return np.array([ e.amplitude <= .05 for e in events ], dtype = bool)
+
+class MockAlgorithmComputeAll(MockAlgorithmExtract):
+
+    def __init__(self):
+        self.calls = 0
+        self.executors = []
+
+    def computeAll(self, threshold, signals, executor = None, monitor = None):
+        # Same computation as MockAlgorithmExtract but for all signals at once
+        self.calls += 1
+        self.executors.append(executor)
+
+        monitor.advance(len(signals))
+
+        return [ self.compute(threshold, signal) for signal in signals ]
+
+class MockAlgorithmComputeAllBatches(MockAlgorithmExtract):
+
+    def __init__(self):
+        self.batches = 0
+
+    def computeAll(self, threshold, signals, executor = None, monitor = None):
+        # Splits each signal into four waves and processes five waves at once
+        share = monitor.share(len(signals), 4 * len(signals))
+
+        for start in range(0, 4 * len(signals), 5):
+
+            self.batches += 1
+
+            share.advance(min(5, 4 * len(signals) - start))
+
+        return [ self.compute(threshold, signal) for signal in signals ]
+
+class MockAlgorithmComputeAllCancel(MockAlgorithmExtract):
+
+    def __init__(self, token):
+        self.token = token
+        self.batches = 0
+
+    def computeAll(self, threshold, signals, executor = None, monitor = None):
+        # Cancels the computation during the first batch of two signals
+        results = []
+
+        for start in range(0, len(signals), 2):
+
+            monitor.check()
+
+            self.batches += 1
+            self.token.cancel()
+
+            results += [ self.compute(threshold, signal) for signal in signals[start:start + 2] ]
+
+            monitor.advance(len(signals[start:start + 2]))
+
+        return results
+
+class MockAlgorithmMinimum:
+
+    def __init__(self):
+        self.signals = []
+
+    def extract(self, data):
+        pass
+
+    def compute(self, signal):
+        # Returns the sample of the minimum and records the signal
+        self.signals.append((len(signal.data), signal.samplingRate))
+
+        return [np.argmin(signal.data)]
+
+    def filter(self, events, data):
+        return events
+
+class MockAlgorithmMinimumAll(MockAlgorithmMinimum):
+
+    def computeAll(self, signals, executor = None, monitor = None):
+        return [ self.compute(signal) for signal in signals ]
+
+class MockAlgorithmNoFilter(Algorithm):
+
+    def compute(self, signal):
+        # Same computation as MockAlgorithmSimple, keeping all events
+        return MockAlgorithmSimple().compute(signal)
+
 class Dummy:
     def __init__(self, entries):
         self.entries = entries
@@ -66,6 +157,38 @@ class MockAlgorithmReturnInterval:
     def filter(self, events, data):
         return events
 
+class MockFilterDouble:
+    """Picklable counterpart of the lambda filters used in the scenarios, such
+    that it can be shipped to a process pool.
+    """
+
+    def filter(self, data, samplingRate):
+        return data * 2
+
+class MockFilterAll(MockFilterDouble):
+
+    def __init__(self):
+        self.shapes = []
+
+    def filterAll(self, data, samplingRate):
+        # Same filter as MockFilterDouble but for an array of epochs at once
+        self.shapes.append(np.shape(data))
+
+        return data * 2
+
+class MockFilterContinuous(MockFilterAll):
+
+    def __init__(self, continuous):
+        self.shapes = []
+        self.runs = []
+        self.continuous = continuous
+
+    def filterContinuous(self, epochs, samplingRate):
+        # Same filter as MockFilterDouble but for a run of contiguous epochs
+        self.runs.append(len(epochs))
+
+        return [ epoch * 2 for epoch in epochs ]
+
 class EngineTest(unittest.TestCase):
 
     def simpleData():
@@ -286,3 +409,360 @@ class EngineTest(unittest.TestCase):
         algorithm, filter, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
 
         Engine.run(algorithm, None, dataset, settings)
+
+    def test_executor_same_result_as_serial(self):
+        """Running the engine on a thread pool or a process pool yields the
+        same labels, in the same channel and epoch order, as the serial
+        execution.
+        """
+
+        algorithm, _, dataset, settings = EngineTest.intervalReturnScenario()
+
+        Engine.run(algorithm, MockFilterDouble(), dataset, settings)
+
+        expected = [ labels.tolist() for labels in dataset.labels ]
+
+        for Executor in [ThreadPoolExecutor, ProcessPoolExecutor]:
+
+            algorithm, _, dataset, settings = EngineTest.intervalReturnScenario()
+
+            with Executor(max_workers = 2) as executor:
+                Engine.run(algorithm, MockFilterDouble(), dataset, settings, executor)
+
+            self.assertEqual([ labels.tolist() for labels in dataset.labels ], expected)
+            self.assertEqual(dataset.filteredData.tolist(), (EngineTest.simpleData()[0] * 2).tolist())
+
+    def test_computeAll_same_result_as_compute(self):
+        """An algorithm implementing computeAll is called once with all signals
+        and yields the same labels as computing each signal separately.
+        """
+
+        algorithm, filter, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+        Engine.run(algorithm, filter, dataset, settings)
+
+        expected = [ labels.tolist() for labels in dataset.labels ]
+
+        _, filter, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+        algorithm = MockAlgorithmComputeAll()
+
+        Engine.run(algorithm, filter, dataset, settings)
+
+        self.assertEqual(algorithm.calls, 1)
+        self.assertEqual([ labels.tolist() for labels in dataset.labels ], expected)
+
+    def test_computeAll_receives_executor(self):
+        """An algorithm implementing computeAll receives the executor handed
+        to the engine, or None without one.
+        """
+
+        for executor in [None, ThreadPoolExecutor(1)]:
+
+            _, filter, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+            algorithm = MockAlgorithmComputeAll()
+
+            Engine.run(algorithm, None, dataset, settings, executor = executor)
+
+            self.assertEqual(algorithm.executors, [executor])
+
+    def test_filter_keep_mask_same_result_as_list(self):
+        """An algorithm returning a boolean keep-mask from its filter method
+        produces the same events and labels as one returning the filtered list.
+        Removed events are also removed from their data sources.
+        """
+
+        algorithm, filter, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
+
+        algorithm = MockAlgorithmKeepMask()
+
+        result = Engine.run(algorithm, filter, dataset, settings)
+
+        self.assertEqual([e.point for e in result[0]], [])
+        self.assertEqual([e.point for e in result[1]], [7])
+        self.assertEqual([e.point for e in result[2]], [3])
+
+        self.assertEqual(dataset.labels[1].tolist(), [7])
+
+        for channel, channelValue in dataset.dataSources.items():
+            for key, dataSource in channelValue.items():
+                for event in dataSource.events:
+
+                    self.assertTrue(channel != 1 or event.point == 7)
+
+                    self.assertTrue(channel != 2 or event.point == 3)
+
+    def test_progress_reported_per_signal(self):
+        """The progress callback receives the number of processed signals, one
+        step per signal and per filter and compute step, up to the total.
+        """
+
+        algorithm, filter, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+        reported = []
+
+        Engine.run(algorithm, filter, dataset, settings, progress = lambda done, total: reported.append((done, total)))
+
+        self.assertEqual(reported, [ (done, 12) for done in range(1, 13) ])
+
+    def test_cancellation_raises(self):
+        """Cancelling the token while computing stops the computation with
+        ComputationCancelled, serially and on a thread pool.
+        """
+
+        for executor in [None, ThreadPoolExecutor(max_workers = 2)]:
+
+            algorithm, filter, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+            token = CancellationToken()
+
+            reported = []
+
+            def progress(done, total):
+                reported.append(done)
+                token.cancel()
+
+            with self.assertRaises(ComputationCancelled):
+                Engine.run(algorithm, filter, dataset, settings, executor, progress = progress, token = token)
+
+            self.assertEqual(reported, [1])
+
+            if executor is not None:
+                executor.shutdown()
+
+    def test_computeAll_cancelled_between_batches(self):
+        """An algorithm implementing computeAll stops between its batches once
+        the token has been cancelled.
+        """
+
+        _, _, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+        token = CancellationToken()
+
+        algorithm = MockAlgorithmComputeAllCancel(token)
+
+        with self.assertRaises(ComputationCancelled):
+            Engine.run(algorithm, None, dataset, settings, token = token)
+
+        self.assertEqual(algorithm.batches, 1)
+
+    def test_computeAll_progress_moves_between_batches(self):
+        """An algorithm implementing computeAll advances the progress in shares
+        of its batches while it runs, up to one step per signal.
+        """
+
+        _, filter, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+        algorithm = MockAlgorithmComputeAllBatches()
+
+        reported = []
+
+        Engine.run(algorithm, filter, dataset, settings, progress = lambda done, total: reported.append((done, total, algorithm.batches)))
+
+        self.assertEqual(reported[6:], [ (7, 12, 1), (8, 12, 2), (9, 12, 3), (11, 12, 4), (12, 12, 5) ])
+
+    def test_filterAll_same_result_as_filter(self):
+        """A filter implementing filterAll is called once with all epochs if
+        they have the same length, once per epoch otherwise, and yields the
+        same filtered data and labels as filtering each signal separately.
+        """
+
+        algorithm, _, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+        Engine.run(algorithm, MockFilterDouble(), dataset, settings)
+
+        expected = [ labels.tolist() for labels in dataset.labels ]
+
+        algorithm, _, dataset, settings = EngineTest.extractScenario(lambda x, y: x*2)
+
+        filter = MockFilterAll()
+
+        Engine.run(algorithm, filter, dataset, settings)
+
+        self.assertEqual(filter.shapes, [(2, 3, 4)])
+        self.assertEqual(dataset.filteredData.tolist(), (EngineTest.simpleData()[0] * 2).tolist())
+        self.assertEqual([ labels.tolist() for labels in dataset.labels ], expected)
+
+        data = np.empty(2, dtype = object)
+        data[0] = np.ones((3, 4))
+        data[1] = np.ones((3, 6))
+
+        dataset.data = data
+
+        filter = MockFilterAll()
+
+        Engine.run(None, filter, dataset, settings)
+
+        self.assertEqual(filter.shapes, [(1, 3, 4), (1, 3, 6)])
+        self.assertEqual(dataset.filteredData[1].tolist(), (data[1] * 2).tolist())
+
+    def test_filterContinuous_contiguous_epochs(self):
+        """A filter in continuous mode receives each run of contiguous epochs
+        at once and yields the same filtered data, otherwise filterAll is used.
+        """
+
+        _, _, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
+
+        filter = MockFilterContinuous(False)
+
+        Engine.run(None, filter, dataset, settings)
+
+        self.assertEqual(filter.runs, [])
+        self.assertEqual(filter.shapes, [(2, 3, 4)])
+
+        for epochs, runs in [ ([[0, 3], [4, 7]], [2]), ([[0, 3], [10, 13]], [1, 1]) ]:
+
+            dataset.epochs = np.array(epochs)
+
+            filter = MockFilterContinuous(True)
+
+            Engine.run(None, filter, dataset, settings)
+
+            self.assertEqual(filter.runs, runs)
+            self.assertEqual(dataset.filteredData.tolist(), (EngineTest.simpleData()[0] * 2).tolist())
+
+    def test_detectionRate_labels_mapped_to_native_samples(self):
+        """With a detection rate, the algorithm receives the data decimated by
+        the corresponding factor and its labels are mapped back to samples of
+        the dataset, close to the labels computed at the native rate.
+        """
+
+        seconds = np.arange(1000) / 100
+
+        dataset = Dataset()
+        dataset.data = np.array([
+            [ np.cos(2 * np.pi * 0.2 * (seconds - shift)) for shift in [1.2, 2.9] ]
+                for _ in range(2)
+        ])
+        dataset.epochs = np.array([[0, 999], [1000, 1999]])
+        dataset.samplingRate = 100
+
+        Engine.run(MockAlgorithmMinimum(), None, dataset)
+
+        expected = np.array([ labels.tolist() for labels in dataset.labels ])
+
+        for Algorithm in [MockAlgorithmMinimum, MockAlgorithmMinimumAll]:
+
+            algorithm = Algorithm()
+
+            Engine.run(algorithm, None, dataset, detectionRate = 20)
+
+            self.assertEqual(algorithm.signals, [(200, 20)] * 4)
+
+            labels = np.array([ labels.tolist() for labels in dataset.labels ])
+
+            self.assertLessEqual(np.abs(labels - expected).max(), 5)
+
+        algorithm = MockAlgorithmMinimum()
+
+        Engine.run(algorithm, None, dataset, detectionRate = 100)
+
+        self.assertEqual(algorithm.signals, [(1000, 100)] * 4)
+
+    def test_provenance_records_executed_processors(self):
+        """The classes and parameters of the executed filter and algorithm are
+        recorded in the dataset. Running only the filter keeps the entry of the
+        algorithm that computed the labels.
+        """
+
+        algorithm, _, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
+
+        Engine.run(algorithm, MockFilterDouble(), dataset, settings, detectionRate = 5)
+
+        self.assertEqual(dataset.provenance['algorithm']['className'], 'MockAlgorithmSimple')
+        self.assertEqual(dataset.provenance['filter']['className'], 'MockFilterDouble')
+        self.assertEqual(dataset.provenance['filter']['parameters'], {})
+        self.assertEqual(dataset.provenance['detectionRate'], 5)
+
+        Engine.run(None, MockFilterAll(), dataset, settings)
+
+        self.assertEqual(dataset.provenance['algorithm']['className'], 'MockAlgorithmSimple')
+        self.assertEqual(dataset.provenance['filter']['className'], 'MockFilterAll')
+
+    def test_events_grouped_by_epoch(self):
+        """Events are created in the order of the labels, share the data source
+        of their epoch with the other events of the epoch and fall back to
+        single labels if points and intervals are mixed in a channel.
+        """
+
+        _, _, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
+
+        dataset.labels = np.array([np.array([6, 1, 5]), np.array([], dtype = int)], dtype = object)
+
+        events = Engine.run(None, None, dataset, settings)
+
+        self.assertEqual([ e.point for e in events[0] ], [6, 1, 5])
+        self.assertEqual(events[1], [])
+
+        self.assertIs(events[0][0].dataSource, events[0][2].dataSource)
+        self.assertEqual(events[0][0].dataSource.events, [events[0][0], events[0][2]])
+        self.assertEqual(events[0][1].dataSource.epochInterval.tolist(), [0, 3])
+
+        _, _, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
+
+        labels = np.empty((1, 2), dtype = object)
+        labels[0,0] = np.array([1])
+        labels[0,1] = np.array([4, 6])
+
+        dataset.labels = labels
+
+        events = Engine.run(None, None, dataset, settings)
+
+        self.assertEqual([ type(e).__name__ for e in events[0] ], ['PointEvent', 'IntervalEvent'])
+
+    def test_events_mixed_channel_registered_once(self):
+        """If points and intervals are mixed in one channel only, the labels
+        and events of the other channels are registered at their data sources
+        only once.
+        """
+
+        _, _, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
+
+        labels = np.empty((2, 2), dtype = object)
+        labels[0,0] = 5
+        labels[0,1] = 6
+        labels[1,0] = np.array([1])
+        labels[1,1] = np.array([4, 6])
+
+        dataset.labels = labels
+
+        events = Engine.run(None, None, dataset, settings)
+
+        dataSource = events[0][0].dataSource
+
+        self.assertEqual([ int(label) for label in dataSource.labels ], [5, 6])
+        self.assertEqual(dataSource.events, list(events[0]))
+
+        self.assertEqual([ type(e).__name__ for e in events[1] ], ['PointEvent', 'IntervalEvent'])
+
+    def test_lazy_same_result_as_events(self):
+        """Lazy events have the labels, points and tags of the created events.
+        Events created for the filter step are released and no events are
+        created before the first access if the algorithm keeps all events.
+        """
+
+        for algorithm in [MockAlgorithmSimple(), MockAlgorithmNoFilter()]:
+
+            results = []
+
+            for lazy in [False, True]:
+
+                _, filter, dataset, settings = EngineTest.simpleScenario(lambda x, y: x*2)
+
+                dataset.tags = np.array([np.array([]), np.array([0, 1]), np.array([1])])
+
+                events = Engine.run(algorithm, filter, dataset, settings, lazy = lazy)
+
+                self.assertEqual(dataset.dataSources == {}, lazy)
+
+                results.append([
+                    ( [ e.point for e in channelEvents ], [ e.tagged for e in channelEvents ] )
+                        for channelEvents in events
+                ])
+
+                labels = dataset.labels
+
+            self.assertEqual(results[0], results[1])
+
+            self.assertEqual(events[1].labels.tolist(), labels[1].tolist())
@@ -0,0 +1,81 @@
+from sleepy.processing.features import EventFeatures
+from sleepy.gui.tagging.model.event import IntervalEvent, PointEvent
+from sleepy.gui.tagging.model import DataSource
+from sleepy.test.core import TestBase
+import unittest
+import numpy as np
+
+class EventFeaturesTest(unittest.TestCase):
+
+    def standardScenario():
+        """Creates interval and point events on two data sources whose filtered
+        data is a random signal. The interval events overlap and the last one
+        ends at the end of its epoch.
+        """
+
+        settings = TestBase.getSettings()
+        settings.plotFiltered = True
+
+        random = np.random.RandomState(0)
+
+        first = DataSource(np.zeros(50), random.normal(size = 50), np.array([0, 49]))
+        second = DataSource(np.zeros(50), random.normal(size = 50), np.array([50, 99]))
+
+        events = np.array([
+            IntervalEvent(3, 20, first, settings),
+            IntervalEvent(10, 30, first, settings),
+            IntervalEvent(55, 70, second, settings),
+            IntervalEvent(60, 100, second, settings)
+        ])
+
+        return EventFeatures(events, [0, 0, 1, 1], [0, 0, 1, 1]), events, settings
+
+    def test_voltages_match_events(self):
+        """The vectorized voltages are equal to the voltages computed by each
+        event on the filtered data.
+        """
+
+        features, events, _ = EventFeaturesTest.standardScenario()
+
+        self.assertEqual(features.minVoltage.tolist(), [ e.minVoltage for e in events ])
+        self.assertEqual(features.maxVoltage.tolist(), [ e.maxVoltage for e in events ])
+        self.assertEqual(
+            features.amplitude.tolist(),
+            [ e.maxVoltage - e.minVoltage for e in events ]
+        )
+
+    def test_start_stop_duration(self):
+        """Start, stop and duration are taken from the labels of the events.
+        """
+
+        features, _, _ = EventFeaturesTest.standardScenario()
+
+        self.assertEqual(features.start.tolist(), [3, 10, 55, 60])
+        self.assertEqual(features.stop.tolist(), [20, 30, 70, 100])
+        self.assertEqual(features.duration.tolist(), [17, 20, 15, 40])
+
+    def test_point_events(self):
+        """Point events reduce to the filtered value at their sample.
+        """
+
+        settings = TestBase.getSettings()
+
+        dataSource = TestBase.getDataSource(filter = 2)
+
+        events = np.array([ PointEvent(point, dataSource, settings) for point in [4, 9] ])
+
+        features = EventFeatures(events, [0, 0], [0, 0])
+
+        self.assertEqual(features.minVoltage.tolist(), [2, 4.5])
+        self.assertEqual(features.maxVoltage.tolist(), [2, 4.5])
+        self.assertEqual(features.duration.tolist(), [0, 0])
+
+    def test_behaves_like_events(self):
+        """Length, iteration and indexing fall back to the events.
+        """
+
+        features, events, _ = EventFeaturesTest.standardScenario()
+
+        self.assertEqual(len(features), 4)
+        self.assertEqual(list(features), list(events))
+        self.assertEqual(features[2], events[2])
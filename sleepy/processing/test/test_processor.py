@@ -0,0 +1,125 @@
+from sleepy.processing.processor import Algorithm, describeProcessor, restoreProcessor
+from sleepy.processing.parameter import Parameter
+from sleepy.processing.filters import BandPassFilter
+from unittest.mock import patch
+import unittest
+import pickle
+import json
+
+class MockAlgorithm(Algorithm):
+
+    def __init__(self):
+
+        self.name = "Mock"
+
+        self.threshold = Parameter(
+            title = "Threshold",
+            fieldType = float,
+            default = 1.5
+        )
+
+        self.enabled = Parameter(
+            title = "Enabled",
+            fieldType = bool,
+            default = True
+        )
+
+class ProcessorTest(unittest.TestCase):
+
+    def test_parameters_not_rendered(self):
+        """A processor that has not been rendered has no parameters.
+        """
+
+        self.assertEqual(MockAlgorithm().parameters, {})
+
+    def test_parameters_rendered(self):
+        """The parameters of a rendered processor reflect the current values.
+        """
+
+        algorithm = MockAlgorithm().render()
+
+        self.assertEqual(algorithm.parameters, { "enabled" : True, "threshold" : 1.5 })
+
+        algorithm.threshold = 2.0
+
+        self.assertEqual(algorithm.parameters, { "enabled" : True, "threshold" : 2.0 })
+
+    def test_setParameters_defaults_and_values(self):
+        """Setting parameters without rendering uses the defaults and converts
+        supplied values to the type of the parameter.
+        """
+
+        self.assertEqual(MockAlgorithm().setParameters().parameters, { "enabled" : True, "threshold" : 1.5 })
+        self.assertEqual(MockAlgorithm().setParameters(None).parameters, { "enabled" : True, "threshold" : 1.5 })
+
+        algorithm = MockAlgorithm().setParameters({ "threshold" : "2", "enabled" : "False" })
+
+        self.assertEqual(algorithm.threshold, 2.0)
+        self.assertIs(algorithm.enabled, False)
+
+    def test_setParameters_boolean_strings(self):
+        """Strings are converted to booleans by their meaning, e.g. from the
+        command line, and strings without a meaning raise a ValueError.
+        """
+
+        for value, expected in [("false", False), ("0", False), ("No", False), ("TRUE", True), ("1", True), ("yes", True)]:
+            self.assertIs(MockAlgorithm().setParameters({ "enabled" : value }).enabled, expected)
+
+        self.assertIs(MockAlgorithm().setParameters({ "enabled" : False }).enabled, False)
+
+        with self.assertRaises(ValueError):
+            MockAlgorithm().setParameters({ "enabled" : "maybe" })
+
+    def test_setParameters_unknown(self):
+        """Setting a parameter that does not exist raises a ValueError.
+        """
+
+        with self.assertRaises(ValueError):
+            MockAlgorithm().setParameters({ "thresold" : "2" })
+
+    def test_pickle_without_widget(self):
+        """A processor whose options have been shown can be pickled, leaving
+        out the widget.
+        """
+
+        processor = MockAlgorithm().setParameters({ "threshold" : "2.5" })
+
+        processor.widget = lambda: None
+
+        restored = pickle.loads(pickle.dumps(processor))
+
+        self.assertEqual(restored.parameters, processor.parameters)
+        self.assertFalse(hasattr(restored, 'widget'))
+        self.assertTrue(hasattr(processor, 'widget'))
+
+    def test_describe_and_restore(self):
+        """A processor restored from its description has the same class and
+        parameter values, also if the description went through JSON.
+        """
+
+        description = describeProcessor(MockAlgorithm().setParameters({ "threshold" : "2" }))
+
+        self.assertEqual(description["className"], "MockAlgorithm")
+        self.assertEqual(description["parameters"], { "enabled" : True, "threshold" : 2.0 })
+
+        description = json.loads(json.dumps(describeProcessor(BandPassFilter().setParameters({ "order" : "2" }))))
+
+        filter = restoreProcessor(description)
+
+        self.assertIsInstance(filter, BandPassFilter)
+        self.assertEqual(filter.parameters, BandPassFilter().setParameters({ "order" : "2" }).parameters)
+
+    def test_restore_unsupported(self):
+        """Only supported processors are restored, whatever module the
+        description names.
+        """
+
+        with patch('os.getcwd') as getcwd:
+
+            with self.assertRaises(ValueError):
+                restoreProcessor({ "module" : "os", "className" : "getcwd", "parameters" : {} })
+
+            getcwd.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            restoreProcessor({ "module" : "sleepy.processing.test.test_processor", "className" : "MockAlgorithm", "parameters" : {} })
@@ -0,0 +1,33 @@
+from sleepy.processing.registry import SUPPORTED_ALGORITHMS, SUPPORTED_FILTERS
+import unittest
+
+class RegistryTest(unittest.TestCase):
+
+    def test_supported_entries_match_processors(self):
+        """Every supported entry refers to an existing processor class whose
+        name matches the name of the entry.
+        """
+
+        for entry in SUPPORTED_ALGORITHMS + SUPPORTED_FILTERS:
+
+            self.assertEqual(entry.processorClass().name, entry.name)
+
+    def test_supported_parameters_match_processors(self):
+        """The parameters recorded by every supported entry match the name,
+        type, default and title of the parameters the processor declares.
+        """
+
+        for entry in SUPPORTED_ALGORITHMS + SUPPORTED_FILTERS:
+
+            fields = entry.processorClass().setParameters().buildTree["fields"]
+
+            self.assertEqual(
+                sorted(
+                    (parameter.name, parameter.fieldType, parameter.default, parameter.title)
+                        for parameter in entry.parameters
+                ),
+                sorted(
+                    (name, descriptor["fieldType"], descriptor["default"], descriptor["title"])
+                        for name, descriptor in fields.items()
+                )
+            )
@@ -0,0 +1,73 @@
+from sleepy.processing.signal import Signal
+from sleepy.test.data import TestSignal
+import unittest
+import numpy as np
+
+class SignalTest(unittest.TestCase):
+
+    def randomSignal(seed = 0):
+        """Creates a signal from the slow-wave like test data.
+        """
+
+        np.random.seed(seed)
+
+        _, y = TestSignal.generate(size = 5, numberOfSamples = 300, scale = 2)
+
+        return Signal(y, 100)
+
+    def test_findValleys_matches_findValley(self):
+        """Resolving the valleys of all negative peaks at once yields the same
+        valleys as resolving them one by one. Peaks without a valley are
+        dropped.
+        """
+
+        for seed in range(5):
+
+            signal = SignalTest.randomSignal(seed)
+
+            negativePeaks = signal.getNegativePeaks(0)
+
+            valleys = [ signal.findValley(peak) for peak in negativePeaks ]
+
+            expected = [
+                [ peak, v.nCrossing, v.pCrossing, v.nextPeak ]
+                    for peak, v in zip(negativePeaks, valleys) if v is not None
+            ]
+
+            result = np.column_stack(signal.findValleys(negativePeaks)).tolist()
+
+            self.assertEqual(result, expected)
+
+    def test_findValleys_no_valley(self):
+        """Peaks before the first or after the last zero-crossing have no valley.
+        """
+
+        signal = Signal(np.array([-1, -2, -1, 1, 2, 1, -1, -2, -1]), 10)
+
+        peaks, nCrossings, pCrossings, nextPeaks = signal.findValleys([1, 7])
+
+        self.assertEqual(peaks.tolist(), [])
+
+        self.assertEqual(signal.findValley(1), None)
+        self.assertEqual(signal.findValley(7), None)
+
+    def test_findWaves_array(self):
+        """Waves are returned as an (N,2) array of consecutive
+        positive-to-negative zero-crossings.
+        """
+
+        signal = Signal(np.array([1, -1, -1, 1, 1, -1, 1, -1]), 10)
+
+        self.assertEqual(signal.findWaves().tolist(), [[0, 4], [4, 6]])
+
+        self.assertEqual(Signal(np.array([1, -1]), 10).findWaves().shape, (0, 2))
+
+    def test_findWavesInDuration(self):
+        """Only waves whose duration lies in the closed interval are kept.
+        """
+
+        signal = Signal(np.array([1, -1, -1, 1, 1, -1, 1, -1]), 10)
+
+        self.assertEqual(signal.findWavesInDuration(.2, .4).tolist(), [[0, 4], [4, 6]])
+        self.assertEqual(signal.findWavesInDuration(.3, .4).tolist(), [[0, 4]])
+        self.assertEqual(signal.findWavesInDuration(.5, .6).tolist(), [])
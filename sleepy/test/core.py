@@ -58,6 +58,7 @@ class TestBase:
 
         dataset = Dataset(None, path)
         dataset.save = MagicMock()
+        dataset.export = MagicMock()
 
         # Is usually a property but cannot be mocked properly. As long as it
         # exists as an attribute, everything's fine.
@@ -0,0 +1,4 @@
+import sys
+from sleepy.processing.batch import main
+
+sys.exit(main())
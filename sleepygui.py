@@ -4,5 +4,8 @@ if sys.version_info[1] > 7:
 
 from sleepy.gui.core import Gui
 
-gui = Gui()
-gui.run()
+# Guarded, since the worker processes of the preprocessing import this module
+if __name__ == '__main__':
+
+    gui = Gui()
+    gui.run()